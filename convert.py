@@ -1,144 +1,163 @@
-#==============================================================================
-#
-#  Copyright (C) 2016 Fabian Schoenfeld
-#
-#  This file is part of the ratlab software. It is free software; you can
-#  redistribute it and/or modify it under the terms of the GNU General Public
-#  License as published by the Free Software Foundation; either version 3, or
-#  (at your option) any later version.
-#
-#  This library is distributed in the hope that it will be useful, but WITHOUT
-#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
-#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
-#  more details.
-#
-#  You should have received a copy of the GNU General Public License along with
-#  a special exception for linking and compiling against the pe library, the
-#  so-called "runtime exception"; see the file COPYING. If not, see:
-#  http://www.gnu.org/licenses/
-#
-#==============================================================================
-
-
-#====================================================================[ Imports ]
-
-# system
-import os
-import sys
-import struct
-
-# math
-import math
-import numpy  as np
-
-# python image library
-from PIL import Image
-from PIL import ImageDraw
-
-
-#====================================================================[ Convert ]
-
-def convert( data_folder, data_file ):
-
-    # datafile
-    datafile = open( data_file, 'wb' )
-
-    # input file sequence
-    img_sequence = os.listdir( data_folder )
-    img_sequence.sort()
-
-    # data header
-    frame = Image.open( (data_folder + img_sequence[0]) )
-
-    color_dim = None
-    if frame.mode == 'RGBA' or frame.mode == 'RGB':
-        print('Color mode is RGB.')
-        color_dim = 3
-    elif frame.mode == 'L':
-        print('Color mode is greyscale.')
-        color_dim = 1
-    else:
-        print('Error! Unknown color mode \'%s\'!' % frame.mode)
-        return False
-
-    header = struct.pack( 'iiii', len(img_sequence), # how many frames in the sequence
-                                  frame.size[0],     # width of a single frame
-                                  frame.size[1],     # height of a single frame
-                                  color_dim )        # color dimension (greyscale/RGB)
-    datafile.write( header )
-
-    # file info
-    space_req  = float(frame.size[0]*frame.size[1]*len(img_sequence)) / (1024.0*1024.0)
-    space_req *= color_dim
-    print('Writing data to file \'%s\'. Expected size: %.1f megabytes.' % (data_file, space_req))      # color values are only stored as characters
-
-    # data loop
-    cnt = 0.0
-    for filename in img_sequence:
-
-        try:
-            frame_file = Image.open( (data_folder + filename) )
-            frame_data = frame_file.load()
-        except:
-            print('\nfailed', filename)
-            sys.exit()
-
-        for y in range(0, frame_file.size[1]):
-            for x in range(0, frame_file.size[0]):
-                if color_dim == 3:
-                    datafile.write( struct.pack('c',bytes([frame_data[x,y][0]])))
-                    datafile.write( struct.pack('c',bytes([frame_data[x,y][1]])))
-                    datafile.write( struct.pack('c',bytes([frame_data[x,y][2]])))
-                else:
-                    datafile.write( struct.pack('c',bytes([frame_data[x,y]])))
-
-        # progress
-        cnt += 1.0
-        done = int( cnt/len(img_sequence)*50.0 )
-        sys.stdout.write( '\r' + '[' + '='*done + '-'*(50-done) + ']~[' + '%.2f' % (cnt/len(img_sequence)*100.0) + '%]' )
-        sys.stdout.flush()
-
-    print('\nAll done.')
-
-
-#=======================================================================[ Main ]
-
-def main():
-    
-    # check command line arguments
-    if len(sys.argv) > 1:
-        print('Warning: convert.py does not accept any command line options!')
-
-    if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
-        printHelp()
-        sys.exit()
-
-    # convert simulation data
-    if os.path.isdir('./current_experiment/sequence/') == True:
-        convert( './current_experiment/sequence/', 
-                 './current_experiment/sequence_data' )
-
-    # convert generic training data if available
-    if os.path.isdir('./current_experiment/sequence_generic/') == True:
-        convert( './current_experiment/sequence_generic/', 
-                 './current_experiment/sequence_data_generic' )
-
-#-----------------------------------------------------------------------[ Help ]
-
-def printHelp():
-	print('================================================================================')
-	print('RatLab convert help                                                             ')
-	print('--------------------------------------------------------------------------------')
-	print('This program reads an image sequence located in ./sequence and produces a data  ')
-	print('file that is formatted for immediate use with an SFA hierachy. The image data is')
-	print('not formatted in any special way, but simply strictly written to file: Each line')
-	print('contains the color information of a single frame.')
-	print('The data is preceded by a header consisting of the following integer values:')
-	print('  (1) frames: how many images there are in the full sequence')
-	print('  (2) width:  the width in pixels of a single frame')
-	print('  (3) height: the height in pixels of a single frame')
-	print('  (4) color:  the color dimension (i.e., 1 for greyscale, and 3 for RGB color)\n')
-	print('================================================================================')
-
-main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
-
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+#====================================================================[ Imports ]
+
+# system
+import os
+import sys
+import struct
+
+# math
+import math
+import numpy  as np
+
+# python image library
+from PIL import Image
+from PIL import ImageDraw
+
+# utilities / own
+sys.path.append( './util' )
+import frames
+import sequence
+
+
+#====================================================================[ Convert ]
+
+def convert( data_folder, data_file ):
+
+    # datafile
+    datafile = open( data_file, 'wb' )
+
+    # input file sequence (ordered by frame number via the sequence index)
+    img_sequence = frames.FrameSequence( data_folder )
+    if len(img_sequence) == 0:
+        print('Error! No frames found in folder \'%s\'!' % data_folder)
+        return False
+
+    # data header
+    frame = Image.open( img_sequence.framePath(0) )
+
+    color_dim = None
+    if frame.mode == 'RGBA' or frame.mode == 'RGB':
+        print('Color mode is RGB.')
+        color_dim = 3
+    elif frame.mode == 'L':
+        print('Color mode is greyscale.')
+        color_dim = 1
+    else:
+        print('Error! Unknown color mode \'%s\'!' % frame.mode)
+        return False
+
+    sequence.writeHeader( datafile, len(img_sequence), # how many frames in the sequence
+                                    frame.size[0],     # width of a single frame
+                                    frame.size[1],     # height of a single frame
+                                    color_dim )        # color dimension (greyscale/RGB)
+
+    # file info
+    space_req  = float(frame.size[0]*frame.size[1]*len(img_sequence)) / (1024.0*1024.0)
+    space_req *= color_dim
+    print('Writing data to file \'%s\'. Expected size: %.1f megabytes.' % (data_file, space_req))      # color values are only stored as characters
+
+    # data loop
+    cnt = 0.0
+    for filename in img_sequence:
+
+        try:
+            frame_file = Image.open( filename )
+            frame_file = frame_file.convert( 'RGB' if color_dim == 3 else 'L' )
+        except:
+            print('\nfailed', filename)
+            sys.exit()
+
+        # pixel data row by row, color channels interleaved
+        datafile.write( np.asarray(frame_file, dtype=np.uint8).tobytes() )
+
+        # progress
+        cnt += 1.0
+        done = int( cnt/len(img_sequence)*50.0 )
+        sys.stdout.write( '\r' + '[' + '='*done + '-'*(50-done) + ']~[' + '%.2f' % (cnt/len(img_sequence)*100.0) + '%]' )
+        sys.stdout.flush()
+
+    datafile.close()
+    print('\nAll done.')
+
+
+#=======================================================================[ Main ]
+
+def main():
+    
+    # check command line arguments
+    if len(sys.argv) > 1:
+        print('Warning: convert.py does not accept any command line options!')
+
+    if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
+        printHelp()
+        sys.exit()
+
+    # convert simulation data
+    if os.path.isdir('./current_experiment/sequence/') == True:
+        convert( './current_experiment/sequence/', 
+                 './current_experiment/sequence_data' )
+
+    # convert generic training data if available, unless tools/snip.py wrote
+    # a crop set of it (which is read directly and must not be overwritten)
+    if os.path.isdir('./current_experiment/sequence_generic/') == True:
+        if os.path.isfile('./current_experiment/sequence_data_generic') and \
+           sequence.isCropSet('./current_experiment/sequence_data_generic'):
+            print('Warning: \'./current_experiment/sequence_data_generic\' is a crop set written by')
+            print('         tools/snip.py; the folder \'sequence_generic\' is not converted.')
+        else:
+            convert( './current_experiment/sequence_generic/', 
+                     './current_experiment/sequence_data_generic' )
+
+#-----------------------------------------------------------------------[ Help ]
+
+def printHelp():
+	print('================================================================================')
+	print('RatLab convert help                                                             ')
+	print('--------------------------------------------------------------------------------')
+	print('This program reads an image sequence located in ./sequence and produces a data  ')
+	print('file that is formatted for immediate use with an SFA hierachy. Frames are read')
+	print('in the order given by the sequence \'index\' file (folders without an index are')
+	print('ordered by the frame numbers in their file names). The image data is not')
+	print('formatted in any special way, but simply strictly written to file: Each line')
+	print('contains the color information of a single frame.')
+	print('The data is preceded by a (version 2) header, which starts with the magic')
+	print('string \'RATLABSQ\' and a version number, and holds the following values:')
+	print('  (1) frames: how many images there are in the full sequence')
+	print('  (2) width:  the width in pixels of a single frame')
+	print('  (3) height: the height in pixels of a single frame')
+	print('  (4) color:  the color dimension (i.e., 1 for greyscale, and 3 for RGB color)')
+	print('  (5) the type of a single value, the channel order (\'L\' or \'RGB\'), the')
+	print('      pixel layout (\'HWC\'), the number of bytes per frame, and the offset')
+	print('      of the first frame within the file (the frame data starts page aligned).')
+	print('All header values are stored little endian. See util/sequence.py for details;')
+	print('files using the old header of four plain integers can still be read.\n')
+	print('Images in ./sequence_generic are converted to the generic training data file')
+	print('\'sequence_data_generic\' the same way. Generic data prepared by tools/snip.py')
+	print('needs no conversion: snip writes that file as a crop set, which is left as it')
+	print('is (the folder is skipped with a warning).\n')
+	print('================================================================================')
+
+main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
+
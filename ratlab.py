@@ -26,12 +26,14 @@
 import os
 import sys
 import time
+import signal
 #import pickle
 import _pickle as cpickle
 
 # math
 import math
 import numpy
+import random as rnd
 
 # python image library
 from PIL import Image as img
@@ -46,6 +48,9 @@ sys.path.append( './util' )
 from util.setup import *
 import world
 import ratbot
+import frames
+import trajectory
+import stream
 import opengl_text as text
 
 
@@ -65,7 +70,10 @@ class LocalControl( Freezeable ):
 		# config: no change during runtime
 		self.config = EmptyOptionContainer()	# config
 		self.config.record        = False
+		self.config.record_text   = False
 		self.config.limit         = None
+		self.config.checkpoint    = None
+		self.config.stream        = False
 		self.config.run_wallcheck = False
 		self.config.freeze()
 
@@ -83,6 +91,8 @@ class LocalControl( Freezeable ):
 		self.modules.world    = None
 		self.modules.rat      = None
 		self.modules.datafile = None
+		self.modules.sequence = None
+		self.modules.sequence_color = None
 		self.modules.freeze()
 		
 		# state: set and used only by the program
@@ -91,6 +101,7 @@ class LocalControl( Freezeable ):
 		self.state.last_view      = None
 		self.state.shot_count     = 0
 		self.state.starting_time  = None
+		self.state.terminate      = False
 		self.state.freeze()
 		
 		self.setup = Setup()					# global control
@@ -98,6 +109,48 @@ class LocalControl( Freezeable ):
 
 ctrl = LocalControl()
 
+#defines
+def_CHECKPOINT = './current_experiment/exp_checkpoint'
+
+
+#=================================================================[ checkpoint ]
+
+def __writeCheckpoint__():
+	# bring recorded data on disk up to date
+	ctrl.modules.datafile.flush()
+	ctrl.modules.sequence.writeIndex()
+	if ctrl.modules.sequence_color != None:
+		ctrl.modules.sequence_color.writeIndex()
+	# simulation state after the last completed step
+	state = {}
+	state['argv']         = [ a for a in sys.argv[1:] if a != 'resume' ]
+	state['step']         = ctrl.state.step
+	state['rat']          = ctrl.modules.rat.getState()
+	state['random']       = rnd.getstate()
+	state['numpy_random'] = numpy.random.get_state()
+	state['frames']       = ctrl.modules.sequence.frames
+	state['frames_color'] = ctrl.modules.sequence_color.frames if ctrl.modules.sequence_color != None else None
+	state['trajectory']   = ctrl.modules.datafile.count
+	# replace the previous checkpoint atomically
+	f = open( def_CHECKPOINT+'.tmp', 'wb' )
+	cpickle.dump( state, f )
+	f.close()
+	os.replace( def_CHECKPOINT+'.tmp', def_CHECKPOINT )
+
+def __readCheckpoint__():
+	try:
+		f = open( def_CHECKPOINT, 'rb' )
+		state = cpickle.load( f )
+		f.close()
+	except:
+		print('Error! No valid checkpoint found at \'%s\'.' % def_CHECKPOINT)
+		os._exit(1)
+	return state
+
+def __terminate__( signum, frame ):
+	# finish the current step before shutting down (see __display__)
+	ctrl.state.terminate = True
+
 
 #===================================================================[ callback ]
 
@@ -110,7 +163,13 @@ def __keyboardPress__( key, x, y ):
 	elif ord(key) == 27:
 		print('- User abort -')
 		if ctrl.config.record: 
+			if ctrl.config.stream == False:
+				__writeCheckpoint__()
+				print('Checkpoint written to \'%s\'; use option \'resume\' to continue.' % def_CHECKPOINT)
 			ctrl.modules.datafile.close()	
+			ctrl.modules.sequence.close()
+			if ctrl.modules.sequence_color != None:
+				ctrl.modules.sequence_color.close()
 		os._exit(1)
 
 def __keyboardSpecialPress__( key, x, y ):
@@ -312,23 +371,39 @@ def __display__():
 
 		# save current rat view to the image sequence
 		if ctrl.setup.rat.color == 'RGB':
-			ctrl.state.last_view.save( './current_experiment/sequence/frame_'+str(ctrl.state.step).zfill(5)+'.png' )
+			ctrl.modules.sequence.save( ctrl.state.last_view, ctrl.state.step )
 		elif ctrl.setup.rat.color == 'greyscale':
 			last_view_grayscale = ctrl.state.last_view.convert( 'L' )
-			last_view_grayscale.save( './current_experiment/sequence/frame_'+str(ctrl.state.step).zfill(5)+'.png' )
+			ctrl.modules.sequence.save( last_view_grayscale, ctrl.state.step )
 		elif ctrl.setup.rat.color == 'duplex':
-			ctrl.state.last_view.save( './current_experiment/sequence_color/frame_'+str(ctrl.state.step).zfill(5)+'.png' )
+			ctrl.modules.sequence_color.save( ctrl.state.last_view, ctrl.state.step )
 			last_view_grayscale = ctrl.state.last_view.convert( 'L' )
-			last_view_grayscale.save( './current_experiment/sequence/frame_'+str(ctrl.state.step).zfill(5)+'.png' )
+			ctrl.modules.sequence.save( last_view_grayscale, ctrl.state.step )
 
 		# collect movement data
-		ctrl.modules.datafile.write( str(ctrl.state.step) + ' ' +
-							  str(rat_state[0][0]) + ' ' + str(rat_state[0][1]) + ' ' +
-							  str(rat_state[1][0]) + ' ' + str(rat_state[1][1]) + '\n')
+		heading = math.atan2( rat_state[1][1], rat_state[1][0] ) * ctrl.setup.constants.RAD2DEG
+		ctrl.modules.datafile.append( ctrl.state.step, rat_state[0], rat_state[1], heading%360.0 )
 
 	# simulation step counter
 	ctrl.state.step += 1
 
+	# periodic checkpoint
+	if ctrl.config.checkpoint != None and ctrl.state.step % ctrl.config.checkpoint == 0:
+		__writeCheckpoint__()
+
+	# termination request (e.g., by a batch queue): stop after a completed step
+	if ctrl.state.terminate == True:
+		print('\n- Terminated -')
+		if ctrl.config.record:
+			if ctrl.config.stream == False:
+				__writeCheckpoint__()
+				print('Checkpoint written to \'%s\'; use option \'resume\' to continue.' % def_CHECKPOINT)
+			ctrl.modules.datafile.close()
+			ctrl.modules.sequence.close()
+			if ctrl.modules.sequence_color != None:
+				ctrl.modules.sequence_color.close()
+		os._exit(1)
+
 	# runtime limit
 	if ctrl.config.limit != None:
 
@@ -346,12 +421,21 @@ def __display__():
 			print(' - all done.\nExperimental data saved to folder \'./current_experiment\':')
 			print('   Final simulation state:  \'exp_finish.png\'.')
 			print('   Experiment parameters:   \'exp_setup\'.')
-			print('   Image sequence:          \'/sequence\'')
+			if ctrl.config.stream:
+				print('   Image sequence:          streamed to train.py (\'sequence_data\').')
+			else:
+				print('   Image sequence:          \'/sequence\'')
 			if ctrl.setup.rat.color == 'duplex':
 				print('   Duplex color sequence:   \'/sequence_color\'.')
 			if ctrl.config.record: 
 				ctrl.modules.datafile.close()
-				print('   Rat trajectory:          \'exp_trajectory.txt\'.')
+				ctrl.modules.sequence.close()
+				if ctrl.modules.sequence_color != None:
+					ctrl.modules.sequence_color.close()
+				print('   Rat trajectory:          \'exp_trajectory.npy\'.')
+				if ctrl.config.record_text:
+					trajectory.exportText( './current_experiment/exp_trajectory.npy', './current_experiment/exp_trajectory.txt' )
+					print('   Rat trajectory (text):   \'exp_trajectory.txt\'.')
 
 			print('Runtime: %dsec / %dmin' % (time.time()-ctrl.state.starting_time, (time.time()-ctrl.state.starting_time)/60.0))
 
@@ -384,6 +468,13 @@ def main():
 		try:	os.mkdir('./current_experiment/sequence')
 		except: return
 
+	# continue an interrupted recording: restore its command line
+	checkpoint = None
+	if 'resume' in sys.argv:
+		checkpoint = __readCheckpoint__()
+		sys.argv   = sys.argv[:1] + checkpoint['argv'] + ['resume']
+		print('Resuming recording at step %d.' % checkpoint['step'])
+
 	if 'duplex' in sys.argv:
 		if( os.path.isdir('./current_experiment/sequence_color') == False ):
 			try:	os.mkdir('./current_experiment/sequence_color')
@@ -395,7 +486,14 @@ def main():
 		# recording
 		if arg == 'record':  
 			ctrl.config.record = True
-			ctrl.modules.datafile = open( './current_experiment/exp_trajectory.txt', 'w' )
+			ctrl.modules.datafile = trajectory.TrajectoryLog( './current_experiment/exp_trajectory.npy',
+			                                                  count = checkpoint['trajectory'] if checkpoint != None else None )
+		elif arg == 'checkpoint':
+			ctrl.config.checkpoint = int( sys.argv[i+1] )
+		elif arg == 'stream':
+			ctrl.config.stream = True
+		elif arg == 'trajectory_txt':
+			ctrl.config.record_text = True
 		elif arg == 'limit':   
 			ctrl.config.limit = int( sys.argv[i+1] )
 			ctrl.options.show_overview = False
@@ -458,6 +556,40 @@ def main():
 			ctrl.setup.rat.bias  /= math.sqrt( ctrl.setup.rat.bias[0]**2 + ctrl.setup.rat.bias[1]**2 )
 			ctrl.setup.rat.bias_s = float(sys.argv[i+3])
 
+	# frames streamed to a concurrently running training instead of an image sequence
+	if ctrl.config.stream:
+		if ctrl.config.record == False:
+			print('Warning! Frames are only streamed when recording; option \'stream\' is ignored.')
+			ctrl.config.stream = False
+		elif ctrl.setup.rat.color == 'duplex' or checkpoint != None:
+			print('Error! Option \'stream\' can not be combined with options \'duplex\' and \'resume\'.')
+			os._exit(1)
+		elif ctrl.config.checkpoint != None:
+			print('Warning! Checkpoints are not written when streaming; option \'checkpoint\' is ignored.')
+			ctrl.config.checkpoint = None
+
+	# image sequence(s) to record into
+	if ctrl.config.stream:
+		ctrl.modules.sequence = stream.FrameRing( shape=( int(ctrl.setup.rat.fov[0]), int(ctrl.setup.rat.fov[1]),
+		                                                  3 if ctrl.setup.rat.color == 'RGB' else 1 ) )
+		print('Streaming frames via shared memory buffer \'%s\' (%d frames) to train.py.' % (stream.def_NAME,ctrl.modules.sequence.capacity()))
+	elif ctrl.config.record and checkpoint == None:
+		ctrl.modules.sequence = frames.FrameSequence( './current_experiment/sequence', write=True )
+		if ctrl.setup.rat.color == 'duplex':
+			ctrl.modules.sequence_color = frames.FrameSequence( './current_experiment/sequence_color', write=True )
+	elif ctrl.config.record:
+		ctrl.modules.sequence = frames.FrameSequence( './current_experiment/sequence' )
+		ctrl.modules.sequence.truncate( checkpoint['frames'] )
+		if ctrl.setup.rat.color == 'duplex':
+			ctrl.modules.sequence_color = frames.FrameSequence( './current_experiment/sequence_color' )
+			ctrl.modules.sequence_color.truncate( checkpoint['frames_color'] )
+
+	# checkpoints require a recording to refer to
+	if ctrl.config.checkpoint != None and ctrl.config.record == False:
+		print('Warning! Checkpoints are only written when recording; option \'checkpoint\' is ignored.')
+		ctrl.config.checkpoint = None
+	signal.signal( signal.SIGTERM, __terminate__ )
+
 	# store setup parameters for later reconstruction
 	if ctrl.setup.rat.color != 'duplex':
 		ctrl.setup.toFile('./current_experiment/exp_setup')
@@ -482,6 +614,13 @@ def main():
 	# place rat at random initial position (rat chooses path[0] if path is given)
 	ctrl.modules.rat = ratbot.RatBot( ctrl.modules.world.randomPosition(), ctrl )
 
+	# continue exactly where the checkpoint left off
+	if checkpoint != None:
+		ctrl.modules.rat.setState( checkpoint['rat'] )
+		rnd.setstate( checkpoint['random'] )
+		numpy.random.set_state( checkpoint['numpy_random'] )
+		ctrl.state.step = checkpoint['step']
+
 	# start main loop
 	ctrl.state.starting_time = time.time()
 	glutMainLoop()
@@ -499,7 +638,9 @@ def printHelp():
 	print('experiment in a series of .png images.')
 	print('When finished, a folder \'./current_experiment\' is created, which contains all')
 	print('created data so far:\n')
-	print('- A subfolder \'/sequence\' which stores a recorded image sequence')
+	print('- A subfolder \'/sequence\' which stores a recorded image sequence. The frames')
+	print('  are split into numbered shard subfolders of 10000 frames each, and an')
+	print('  \'index\' file keeps track of the total number of frames.')
 	print('- A screenshot titled \'exp_finish.png\', depicting the final state of the')
 	print('  experiment (i.e., the complete path as run by the simulated rat).')
 	print('- A file titled \'exp_setup\', which holds all the parameters defining the')
@@ -507,8 +648,10 @@ def printHelp():
 	print('  modifications such as a directional bias).')
 	print('- An optional folder called \'sequence_color\', in case the experiment was')
 	print('  recorded both in a color image sequence as well as a greyscale one.')
-	print('- An optional file titled \'exp_trajectory.txt\', storing the exact sequence of')
-	print('  locations visited by the simulated rat over the course of the experiment\n')
+	print('- An optional file titled \'exp_trajectory.npy\', storing the exact sequence of')
+	print('  locations visited by the simulated rat over the course of the experiment. It')
+	print('  holds a structured NumPy array with the fields step, x, y, vx, vy, and angle')
+	print('  (heading in degrees) and may be memory-mapped via numpy.load(f,mmap_mode=\'r\').\n')
 	print('Note that ratlab.py provides merely the initial data producing experiment. To')
 	print('further evaluate the generated data, the convert.py program is used to create a')
 	print('single datafile from the original image sequence. This file is then used by')
@@ -532,8 +675,29 @@ def printHelp():
 	print('            Once finished, a screenshot of the final state of the simulation is')
 	print('            stored as \'final.png\'\n')
 	print('record      Save a screenshot during every frame. The numbered image files are')
-	print('            stored in the ./sequence folder.')
+	print('            stored in shard subfolders of the ./sequence folder.')
 	print('            [Default: False]\n')
+	print('stream      When recording, pass every frame to a concurrently running training')
+	print('            (\'python train.py stream\') via a ring buffer in shared memory')
+	print('            instead of storing it as an image. The training trains its first')
+	print('            phase while the rat runs and writes the \'sequence_data\' file on')
+	print('            the way, i.e., no image sequence and no convert.py run are needed.')
+	print('            The simulation waits whenever the buffer is full, and at its end')
+	print('            until the training has taken all frames. Not available together')
+	print('            with duplex, checkpoint, or resume.\n')
+	print('trajectory_txt')
+	print('            When recording, additionally export the rat\'s trajectory as a text')
+	print('            file \'exp_trajectory.txt\' (one step per line) once the simulation')
+	print('            is finished.\n')
+	print('checkpoint <n>')
+	print('            When recording, store the complete simulation state every <n> steps')
+	print('            in the file \'exp_checkpoint\' (rat path and velocity, random number')
+	print('            generator states, step counter, and recorded data so far). A')
+	print('            checkpoint is also written when the program is quit via ESC or')
+	print('            terminated by a SIGTERM signal (e.g., by a batch queue).\n')
+	print('resume      Continue an interrupted recording from its last checkpoint. All')
+	print('            other options are taken from the checkpoint, and the recording')
+	print('            continues exactly as the uninterrupted run would have.\n')
 	print('grey        By default, recorded image sequences are stored in color/RGB format.')
 	print('            Setting this flag will result in greyscale sequences instead.\n')
 	print('duplex      Setting this flag will lead to two separate images being stored for')
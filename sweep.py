@@ -0,0 +1,302 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+#====================================================================[ Imports ]
+
+# system
+import os
+import sys
+import time
+import resource
+import itertools
+import traceback
+import queue
+import multiprocessing
+
+# worker processes share the cores: the BLAS threads of each process are
+# limited accordingly (has to happen before numpy is loaded)
+def_PROCESSES = os.cpu_count()
+for i, arg in enumerate(sys.argv):
+	if arg == 'processes': def_PROCESSES = int(sys.argv[i+1])
+for var in [ 'OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS' ]:
+	os.environ.setdefault( var, str(max(1,os.cpu_count()//def_PROCESSES)) )
+
+# math
+import numpy
+import mdp
+
+# utilities / own
+sys.path.append( './util' )
+import train
+import estimate
+
+#defines
+def_FOLDER = './current_experiment/sweep'
+
+
+#==================================================================[ Utilities ]
+
+class Configuration():
+	"""
+	Training parameters of a single network of the sweep.
+	"""
+	def __init__( self, frames, batch_size, noise, ICA ):
+		self.frames     = frames
+		self.batch_size = batch_size
+		self.noise      = noise
+		self.ICA        = ICA
+		self.memory     = None	# estimated peak memory of the training itself (bytes)
+		self.data       = None	# page cache share of the data set (bytes)
+
+	def name( self, color ):
+		name  = 'network_x' + str(self.frames)
+		name += '_color' if color else '_greyscale'
+		if self.batch_size != None: name += '_b' + str(self.batch_size)
+		if self.noise:              name += '_noise'
+		if self.ICA:                name += '_ICA'
+		return name
+
+def preload( datafile ):
+	# read the whole (memory-mapped) data set once, so it is held in the page
+	# cache from which all worker processes map the same physical pages
+	for (start, stop) in train.getReusableBatchRanges( datafile, 1000 ):
+		numpy.asarray( datafile.read(start,stop) ).max()
+
+def estimateMemory( network, config ):
+	# peak memory of all training stages of the network (see util/estimate.py);
+	# the data set itself is held in the page cache shared by all processes
+	batch = config.batch_size if config.batch_size != None else config.frames
+	peak  = 0
+	for (k, per_frame, fixed) in estimate.stageMemory( network ):
+		peak = max( peak, fixed + per_frame*(batch+1) )
+	return peak
+
+def sharedMemory( configs ):
+	# memory of a number of configurations trained at the same time: the page
+	# cache of the data set is shared, i.e., counted once for the largest share
+	return sum( [c.memory for c in configs] ) + max( [c.data for c in configs] + [0] )
+
+
+#===================================================================[ Training ]
+
+def __trainConfig__( network, config, data_files, fold_fields, color, results ):
+	# runs in its own process: train one configuration (its network already
+	# holds the ICA node, if any), store the network, and report time, peak
+	# memory, and result
+	name   = config.name( color )
+	frames = train.openTrainingData( data_files ).frames
+	log    = open( os.path.join(def_FOLDER,name+'.log'), 'w' )
+	ping   = time.time()
+	sys.stdout = log
+	sys.stderr = log
+	try:
+		train.trainNetwork( network, config.batch_size, False, config.frames if config.frames < frames else None, False, data_files,
+		                    fold_fields=fold_fields )
+		network.save( os.path.join(def_FOLDER,name+'.tsn') )
+		result = 'stored'
+	except SystemExit:
+		result = 'failed (see log)'
+	except Exception as e:
+		traceback.print_exc()
+		result = 'failed: %s' % e.__class__.__name__
+	peak = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss*1024
+	log.close()
+	results.put( (name, time.time()-ping, peak, result) )
+
+def runSweep( networks, configs, data_files, processes, memory_cap, fold_fields, color ):
+	"""
+	Train all configurations in worker processes. A configuration is started
+	as soon as a process is free and its estimated memory fits into the cap
+	next to the configurations already running (a configuration exceeding the
+	cap on its own is started once no other is running). The page cache of
+	the data set is shared by all processes and counted once.
+	networks  : Untrained network of every configuration.
+	configs   : List of Configuration objects.
+	data_files: Sequence data files (None for the default file).
+	processes : Max. no. of worker processes.
+	memory_cap: Memory cap in bytes, or None.
+	Returns a dictionary mapping configuration names to the tuple (time, peak
+	memory, result).
+	"""
+	results = multiprocessing.Queue()
+	pending = list( range(len(configs)) )
+	running = {}
+	summary = {}
+	while len(pending) > 0 or len(running) > 0:
+		# start all configurations that fit
+		for i in list( pending ):
+			if len(running) >= processes:
+				break
+			if memory_cap != None and len(running) > 0 and sharedMemory( [configs[j] for j in running]+[configs[i]] ) > memory_cap:
+				continue
+			p = multiprocessing.Process( target=__trainConfig__,
+			                             args=(networks[i],configs[i],data_files,fold_fields,color,results) )
+			p.start()
+			running[i] = p
+			pending.remove( i )
+			print('Started %s (%d running).' % (configs[i].name(color),len(running)))
+		# wait for the next configuration to finish (or its process to die,
+		# e.g., when killed for running out of memory)
+		try:
+			name, duration, peak, result = results.get( timeout=5 )
+		except queue.Empty:
+			for i in list( running ):
+				if running[i].exitcode != None and configs[i].name(color) not in summary:
+					summary[configs[i].name(color)] = ( 0, 0, 'failed: process exit code %d' % running[i].exitcode )
+					del running[i]
+			continue
+		summary[name] = ( duration, peak, result )
+		for i in list( running ):
+			if configs[i].name(color) == name:
+				running[i].join()
+				del running[i]
+		print('Finished %s after %dsec: %s.' % (name,duration,result))
+	return summary
+
+
+#=======================================================================[ Main ]
+
+def main():
+
+	# check command line arguments
+	if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
+		printHelp()
+		sys.exit()
+
+	#-----------------------------------------------------------[ Sweep Values ]
+
+	data_files  = None
+	frames      = [ None ]
+	batch_sizes = [ None ]
+	noise       = [ False ]
+	ICA         = [ False ]
+	memory_cap  = None
+	fold_fields = 'fold_fields' in sys.argv
+	for i, arg in enumerate(sys.argv):
+		if arg == 'data':       data_files  = sys.argv[i+1].split(',')
+		if arg == 'frames':     frames      = [ int(n) for n in sys.argv[i+1].split(',') ]
+		if arg == 'batch_size': batch_sizes = [ int(n) for n in sys.argv[i+1].split(',') ]
+		if arg == 'noise':      noise       = [ n == '1' for n in sys.argv[i+1].split(',') ]
+		if arg == 'ICA':        ICA         = [ n == '1' for n in sys.argv[i+1].split(',') ]
+		if arg == 'memory_cap': memory_cap  = int(sys.argv[i+1])*estimate.def_MB
+
+	#-------------------------------------------------------------[ Data Set ]
+
+	ping     = time.time()
+	datafile = train.openTrainingData( data_files )
+	preload( datafile )
+	print('Data set of %d frames loaded once in %dsec and shared by all worker processes.' % (datafile.frames,time.time()-ping))
+	frames = [ n if n != None and n < datafile.frames else datafile.frames for n in frames ]
+
+	use_wide_fov = True if datafile.width==320  else False
+	use_color    = True if datafile.channels==3 else False
+
+	#-------------------------------------------------------[ Configurations ]
+
+	configs  = []
+	networks = []
+	for (n, b, z, ica) in itertools.product( frames, batch_sizes, noise, ICA ):
+		config = Configuration( n, b, z, ica )
+		if config.name( use_color ) in [ c.name(use_color) for c in configs ]:
+			print('Warning! %s is given more than once (e.g., via frame counts beyond the data set) and is trained once.' % config.name(use_color))
+			continue
+		network = train.initNetwork( use_wide_fov, use_color, z )
+		if ica:
+			network.append( mdp.nodes.CuBICANode( input_dim=network[-1].output_dim, dtype='float32' ) )
+		config.memory = estimateMemory( network, config )
+		config.data   = config.frames*datafile.frameDim()
+		configs.append( config )
+		networks.append( network )
+
+	print('Sweep of %d configurations using %d worker processes%s.' % \
+	      (len(configs), def_PROCESSES, ' within %d MB' % (memory_cap//estimate.def_MB) if memory_cap != None else ''))
+	for config in configs:
+		if memory_cap != None and sharedMemory( [config] ) > memory_cap:
+			print('Warning! %s is estimated to need %d MB on its own and will be trained alone.' % \
+			      (config.name(use_color),sharedMemory([config])//estimate.def_MB))
+
+	if not os.path.isdir( def_FOLDER ):
+		os.makedirs( def_FOLDER )
+
+	#-----------------------------------------------------------------[ Sweep ]
+
+	ping    = time.time()
+	summary = runSweep( networks, configs, data_files, def_PROCESSES, memory_cap, fold_fields, use_color )
+
+	#---------------------------------------------------------------[ Summary ]
+
+	lines = [ '%-44s %7s %6s %5s %3s %8s %9s %8s  %s' % ('network','frames','batch','noise','ICA','est [MB]','peak [MB]','time [s]','result') ]
+	for config in configs:
+		duration, peak, result = summary[ config.name(use_color) ]
+		lines.append( '%-44s %7d %6s %5s %3s %8d %9d %8d  %s' % (config.name(use_color), config.frames,
+		              config.batch_size if config.batch_size != None else '-', 'yes' if config.noise else 'no',
+		              'yes' if config.ICA else 'no', sharedMemory([config])//estimate.def_MB, peak//estimate.def_MB, duration, result) )
+	lines.append( 'Complete sweep time: %dsec / %dmin' % (time.time()-ping, (time.time()-ping)/60.0) )
+
+	f = open( os.path.join(def_FOLDER,'sweep_summary.txt'), 'w' )
+	f.write( '\n'.join(lines)+'\n' )
+	f.close()
+	print( '\n'.join(lines) )
+	print('Networks, logs, and summary stored in folder \'%s\'.' % def_FOLDER)
+
+#-----------------------------------------------------------------------[ Help ]
+
+def printHelp():
+	print('================================================================================')
+	print('RatLab training sweep help                                                      ')
+	print('--------------------------------------------------------------------------------')
+	print('This program trains a number of SFA networks with different training parameters')
+	print('on the same sequence data, one network per combination of the given values.')
+	print('The data set is read once and shared by all worker processes via memory')
+	print('mapping, i.e., it is held in memory only once. Every network is trained as by')
+	print('train.py and stored, together with a log of its training, in the folder')
+	print('\'./current_experiment/sweep\', which also receives a summary table of all')
+	print('networks (estimated and peak memory, training time, and result).\n')
+	print('--------------------------------------------------------[ Command Line Options ]\n')
+	print('frames <n>,<n>,...')
+	print('          Train with the first <n> frames of the data set. [Default: all]\n')
+	print('batch_size <count>,<count>,...')
+	print('          Batch sizes to train with. [Default: all frames at once]\n')
+	print('noise <0|1>,...')
+	print('          Train without (0) and/or with (1) noise nodes. [Default: 0]\n')
+	print('ICA <0|1>,...')
+	print('          Train without (0) and/or with (1) top level ICA node. [Default: 0]\n')
+	print('data <file>,<file>,...')
+	print('          Train with the given sequence data files (see train.py).\n')
+	print('processes <n>')
+	print('          Max. no. of networks trained at the same time. The BLAS threads of')
+	print('          each process are limited to an equal share of the cores, unless set')
+	print('          via OPENBLAS_NUM_THREADS etc. [Default: no. of cores]\n')
+	print('memory_cap <MB>')
+	print('          Start a network only if the estimated memory of all running networks')
+	print('          stays within <MB> megabytes (see train.py memory_budget). The data')
+	print('          set is counted once, as it is shared by all networks. A network')
+	print('          exceeding the cap on its own is trained alone.\n')
+	print('fold_fields')
+	print('          Used for all networks (see train.py).\n')
+	print('--------------------------------------------------------------------[ Examples ]\n')
+	print('Compare batch sizes with and without noise nodes, four networks at a time:')
+	print('     $ python sweep.py batch_size 500,1000 noise 0,1 processes 4')
+	print('================================================================================')
+
+if __name__ == '__main__':
+	main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
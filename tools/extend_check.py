@@ -0,0 +1,45 @@
+#Checks that extending a network with distributed training ('train.py file <name> extend shards <n>') yields the same SFA statistics as the default extend.
+#Run from the ratlab folder with a network trained via keep_stats: python tools/extend_check.py <network.tsn> [shards] [further train.py options]
+
+import os
+import sys
+import pickle
+import subprocess
+
+import numpy
+
+if len(sys.argv) < 2:
+	print('Usage: python tools/extend_check.py <network.tsn> [shards] [further train.py options]')
+	sys.exit()
+
+network = sys.argv[1]
+shards  = sys.argv[2] if len(sys.argv) > 2 else '2'
+options = sys.argv[3:]
+result  = './current_experiment/' + network[:len(network)-4] + '_extended'
+
+def extend( extra ):
+	# run train.py and keep the statistics of the extended network
+	subprocess.check_call( [ sys.executable, os.path.join(os.path.dirname(sys.argv[0]),'..','train.py'), 'file', network, 'extend' ] + options + extra,
+	                       stdout=subprocess.DEVNULL )
+	f = open( result+'.stats', 'rb' )
+	stats = pickle.load( f )
+	f.close()
+	os.remove( result+'.stats' )
+	os.remove( result+'.tsn' )
+	return stats
+
+default = extend( [] )
+sharded = extend( [ 'shards', shards ] )
+
+same = default['frames'] == sharded['frames'] and sorted( default['nodes'] ) == sorted( sharded['nodes'] )
+print( '%-6s %-5s %10s %16s %10s' % ('node','sums','tlen','tlen (%s shards)' % shards,'max. diff') )
+for i in sorted( default['nodes'] ):
+	if i not in sharded['nodes']:
+		continue
+	for name, a, b in zip( ['cov','dcov'], default['nodes'][i], sharded['nodes'][i] ):
+		diff = max( numpy.abs(a['cov_mtx']-b['cov_mtx']).max(), numpy.abs(a['avg']-b['avg']).max() ) / max( numpy.abs(a['cov_mtx']).max(), 1e-30 )
+		print( '%-6d %-5s %10d %16d %10.2e' % (i,name,a['tlen'],b['tlen'],diff) )
+		same = same and a['tlen'] == b['tlen'] and diff < 1e-5
+print( 'frames: %d (default), %d (%s shards)' % (default['frames'],sharded['frames'],shards) )
+print( 'Statistics match.' if same else 'Error! Statistics differ.' )
+sys.exit( 0 if same else 1 )
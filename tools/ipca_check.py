@@ -0,0 +1,53 @@
+#Compares the eigenvalues of the incremental PCA (util/ipca.py, 'train.py pca_dim') with a batch PCANode, for a flat and a decaying spectrum.
+#Run from the ratlab folder: python tools/ipca_check.py [oversample] [input dim] [output dim]
+
+import sys
+
+import numpy
+import mdp
+import mdp.parallel
+
+sys.path.append( './util' )
+import ipca
+
+oversample = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+input_dim  = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+output_dim = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+samples    = 20000
+tolerance  = 1e-8	# kept components: all
+
+rng = numpy.random.RandomState( 0 )
+
+def spectrumData( variances ):
+	# samples with the given variances along random orthogonal directions
+	q, r = numpy.linalg.qr( rng.randn(input_dim,input_dim) )
+	return numpy.dot( rng.randn(samples,input_dim)*numpy.sqrt(variances), q.T ) + 5.0
+
+def incremental( x, oversample, copies ):
+	# train forked copies on parts of the data, then join them (as parallel workers do)
+	node = ipca.IncrementalPCANode( input_dim, output_dim, 'float64', oversample )
+	with mdp.extension( 'parallel' ):
+		forks = [ node.fork() for i in range(copies) ]
+		for fork, part in zip( forks, numpy.array_split(x,copies) ):
+			fork.train( part )
+			node.join( fork )
+	node.stop_training()
+	return node
+
+same = True
+print( '%-9s %10s %6s %14s %16s' % ('spectrum','oversample','copies','max. rel. err.','explained var.') )
+for name, variances in [ ('flat',     1.0+0.1*rng.rand(input_dim)),
+                         ('decaying', 1.0/numpy.arange(1,input_dim+1)) ]:
+	x = spectrumData( variances )
+	batch = mdp.nodes.PCANode( input_dim=input_dim, output_dim=output_dim, dtype='float64' )
+	batch.train( x )
+	batch.stop_training()
+	for k in [ None, oversample ]:
+		for copies in [ 1, 4 ]:
+			node = incremental( x, k, copies )
+			err  = numpy.abs( node.d-batch.d ).max() / batch.d.max()
+			print( '%-9s %10s %6d %14.2e %8.4f/%.4f' % (name,'all' if k == None else k,copies,err,node.explained_variance,batch.explained_variance) )
+			if k == None:
+				same = same and err < tolerance
+print( 'Exact incremental PCA matches the batch PCA (%.0e).' % tolerance if same else 'Error! Exact incremental PCA differs from the batch PCA.' )
+sys.exit( 0 if same else 1 )
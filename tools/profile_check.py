@@ -0,0 +1,57 @@
+#Checks that the profile of a training run ('train.py profile') lists every node of the trained network, inner nodes included: trainable nodes with their stop_training calls, and all nodes below the top node with their execute calls.
+#Run from the ratlab folder: python tools/profile_check.py [further train.py options, e.g., frames 1000 batch_size 500 fold_fields]
+
+import os
+import sys
+import time
+import json
+import pickle
+import subprocess
+
+import mdp
+
+folder  = './current_experiment/'
+options = sys.argv[1:]
+
+def labels( node, label ):
+	# nodes with their labels as used by the profile (see util/profiler.py), inner nodes included
+	found = [ (node,label) ]
+	if isinstance( node, mdp.hinet.CloneLayer ):
+		found += labels( node.node, label+'.0' )
+	elif isinstance( node, mdp.hinet.Layer ):
+		for i, n in enumerate( node.nodes ):
+			found += labels( n, label+'.%d' % i )
+	elif isinstance( node, mdp.hinet.FlowNode ):
+		for i, n in enumerate( node._flow ):
+			found += labels( n, label+'.%d' % i )
+	return found
+
+# train with profiling and pick up the network stored by the run
+ping = time.time()
+subprocess.check_call( [ sys.executable, os.path.join(os.path.dirname(sys.argv[0]),'..','train.py'), 'profile' ] + options,
+                       stdout=subprocess.DEVNULL )
+stored = [ f for f in os.listdir(folder) if f.endswith('.tsn') and os.path.getmtime(folder+f) >= int(ping) ]
+if len(stored) != 1:
+	print('Error! Expected a single network stored by the run, found %d.' % len(stored))
+	sys.exit( 1 )
+network = pickle.load( open(folder+stored[0],'rb') )
+os.remove( folder+stored[0] )
+
+f = open( folder+'train_profile.json', 'r' )
+entries = json.load( f )
+f.close()
+
+# calls every node has to show: the training of trainable nodes is finished, and all
+# nodes below the top node are executed to train the nodes above
+listed   = set( [ (e['node'],e['call']) for e in entries ] )
+expected = []
+for k, node in enumerate( network ):
+	for (n, label) in labels( node, str(k) ):
+		if n.is_trainable():     expected.append( (label,'stop_training') )
+		if k < len(network)-1:   expected.append( (label,'execute') )
+missing = [ e for e in expected if e not in listed ]
+print( 'Profiled node calls: %d of %d.' % (len(expected)-len(missing),len(expected)) )
+if len(missing) > 0:
+	print( 'Error! Node calls missing from the profile: %s' % ', '.join([ '%s %s' % m for m in missing ]) )
+	sys.exit( 1 )
+print( 'All network nodes are profiled.' )
@@ -1,183 +1,245 @@
-
-
-#=====================================================================[ Header ]
-
-# system
-import os
-import sys
-import time
-import types
-
-# math
-import numpy
-import math
-
-# graphics
-import Image
-import ImageDraw
-
-#-----------------------------------------------------------------[ Crop Areas ]
-
-DEF_CROP_WIDE_DEFAULT = DEF_CROP_NARROW_DEFAULT = DEF_CROP_WIDEx2_UPPER = \
-DEF_CROP_WIDEx2_LOWER = DEF_CROP_NARROWx2_UPPER = DEF_CROP_NARROWx2_LOWER = \
-DEF_CROP_WIDEx3_UPPER = DEF_CROP_WIDEx3_CENTER = DEF_CROP_WIDEx3_LOWER = \
-DEF_CROP_NARROWx3_UPPER = DEF_CROP_NARROWx3_CENTER = DEF_CROP_NARROWx3_LOWER = None
-
-def setGlobals( frame_dim ):
-
-	### print ('Frame size for next folder:', frame_dim)
-
-	global DEF_CROP_WIDE_DEFAULT;    DEF_CROP_WIDE_DEFAULT    = ( frame_dim[0]/2-160, frame_dim[1]/2-20, frame_dim[0]/2+160, frame_dim[1]/2+20 )
-	global DEF_CROP_NARROW_DEFAULT;  DEF_CROP_NARROW_DEFAULT  = ( frame_dim[0]/2- 27, frame_dim[1]/2-17, frame_dim[0]/2+ 28, frame_dim[1]/2+18 )
-
-	global DEF_CROP_WIDEx2_UPPER;    DEF_CROP_WIDEx2_UPPER    = ( frame_dim[0]/2-160, frame_dim[1]/2-40, frame_dim[0]/2+160, frame_dim[1]/2 )
-	global DEF_CROP_WIDEx2_LOWER;    DEF_CROP_WIDEx2_LOWER    = ( frame_dim[0]/2-160, frame_dim[1]/2, frame_dim[0]/2+160, frame_dim[1]/2+40 )
-
-	global DEF_CROP_NARROWx2_UPPER;  DEF_CROP_NARROWx2_UPPER  = ( frame_dim[0]/2-27, frame_dim[1]/2-35, frame_dim[0]/2+28, frame_dim[1]/2 )
-	global DEF_CROP_NARROWx2_LOWER;  DEF_CROP_NARROWx2_LOWER  = ( frame_dim[0]/2-27, frame_dim[1]/2, frame_dim[0]/2+28, frame_dim[1]/2+35 )
-
-	global DEF_CROP_WIDEx3_UPPER;    DEF_CROP_WIDEx3_UPPER    = ( frame_dim[0]/2-160, frame_dim[1]/2-60, frame_dim[0]/2+160, frame_dim[1]/2-20 )
-	global DEF_CROP_WIDEx3_CENTER;   DEF_CROP_WIDEx3_CENTER   = ( frame_dim[0]/2-160, frame_dim[1]/2-20, frame_dim[0]/2+160, frame_dim[1]/2+20 )
-	global DEF_CROP_WIDEx3_LOWER;    DEF_CROP_WIDEx3_LOWER    = ( frame_dim[0]/2-160, frame_dim[1]/2+20, frame_dim[0]/2+160, frame_dim[1]/2+60 )
-
-	global DEF_CROP_NARROWx3_UPPER;  DEF_CROP_NARROWx3_UPPER  = ( frame_dim[0]/2-27, frame_dim[1]/2-52, frame_dim[0]/2+28, frame_dim[1]/2-17 )
-	global DEF_CROP_NARROWx3_CENTER; DEF_CROP_NARROWx3_CENTER = ( frame_dim[0]/2-27, frame_dim[1]/2-17, frame_dim[0]/2+28, frame_dim[1]/2+18 )
-	global DEF_CROP_NARROWx3_LOWER;  DEF_CROP_NARROWx3_LOWER  = ( frame_dim[0]/2-27, frame_dim[1]/2+18, frame_dim[0]/2+28, frame_dim[1]/2+53 )
-
-
-#=======================================================================[ Main ]
-
-def main():
-
-	# halp
-	if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
-		printHelp()
-		sys.exit()
-
-	# setup
-	sequence_folder = './sequence_generic/'
-	frame_folders   = []
-	frame_grab      = 'wide'
-	multiplier      = 1
-	data_cap        = None
-
-	if os.path.isdir(sequence_folder) == False:
-		try:    os.mkdir(sequence_folder)
-		except: print('Missing destination folder!', sys.exit())
-
-	# parameter
-	for i, arg in enumerate( sys.argv ):
-		if i == 0: continue
-		elif arg == 'x2': multiplier = 2
-		elif arg == 'x3': multiplier = 3
-		elif arg == 'narrow_frame_grab': frame_grab = 'narrow'
-		elif arg == 'cap': data_cap = int(sys.argv[i+1]); break 
-		else: frame_folders.append( arg )
-
-	print('Frame grab:', frame_grab)
-	print('List of folders:', frame_folders)
-
-	frame_count = 0
-	for folder in frame_folders: frame_count += len(os.listdir(folder))
-	print('No. of frames in all folders:', frame_count)
-
-	if multiplier != 1: print('Frame data multiplier: x%d' % multiplier)
-	if data_cap: print('Data cap (%d/%d)' % (data_cap, frame_count*multiplier))
-
-	# extracting frame data
-	count = 0
-	stahp = False
-
-	for n in range(multiplier):
-		for source_folder in frame_folders:
-
-			img_sequence = os.listdir( source_folder )
-			img_sequence.sort()
-
-			setGlobals( Image.open(str(source_folder+'/'+img_sequence[0])).size )
-			
-			for source_frame in img_sequence:
-				try:
-					frame = Image.open( str(source_folder+'/'+source_frame) )
-				except:
-					print('\nWarning! Skipping inaccessible file', str(source_folder+'/'+source_frame))
-					continue
-
-				if frame_grab == 'wide':
-					if multiplier == 1:
-						frame.crop( DEF_CROP_WIDE_DEFAULT ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-					if multiplier == 2:
-						if n==0: frame.crop( DEF_CROP_WIDEx2_UPPER ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-						if n==1: frame.crop( DEF_CROP_WIDEx2_LOWER ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-					if multiplier == 3:
-						if n==0: frame.crop( DEF_CROP_WIDEx3_UPPER  ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-						if n==1: frame.crop( DEF_CROP_WIDEx3_CENTER ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-						if n==2: frame.crop( DEF_CROP_WIDEx3_LOWER  ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-
-				if frame_grab == 'narrow':
-					if multiplier == 1:
-						frame.crop( DEF_CROP_NARROW_DEFAULT ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-					if multiplier == 2:
-						if n==0: frame.crop( DEF_CROP_NARROWx2_UPPER ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-						if n==1: frame.crop( DEF_CROP_NARROWx2_LOWER ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-					if multiplier == 3:
-						if n==0: frame.crop( DEF_CROP_NARROWx3_UPPER  ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-						if n==1: frame.crop( DEF_CROP_NARROWx3_CENTER ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-						if n==2: frame.crop( DEF_CROP_NARROWx3_LOWER  ).save( sequence_folder+'frame_'+str(count).zfill(5)+'.png' )
-
-				count += 1
-
-				# housekeeping					
-				done = int(count/float(frame_count*multiplier if not data_cap else data_cap)*50.0)
-				sys.stdout.write( '\r' + '[' + '='*done + '-'*(50-done) + ']~[' + '%.2f' % (count/float(frame_count*multiplier if not data_cap else data_cap)*100.0) + '%]' )
-				sys.stdout.flush()
-
-				if data_cap and count == data_cap:
-					print('\nData cap reached.')
-					stahp = True
-					break
-
-			if stahp: break
-		if stahp: break
-	print('')
-
-	# check for cap reached
-	if count < data_cap:
-		print('Warning: Set data cap was not reached (%d/%d).' % (count, data_cap))
-
-#-----------------------------------------------------------------------[ Help ]
-
-def printHelp():
-	print('================================================================================')
-	print('Snipping Tool Help                                                              ')
-	print('--------------------------------------------------------------------------------')
-	print('This program goes through a number of provided folders, assumed to be filled')
-	print('images. From those the center area is cut out and stored in a destination folder')
-	print('for further use as generic training material for ratlab.\n')
-	print('--------------------------------------------------------[ Command Line Options ]\n')
-	print('<list of folders>')
-	print('          Each parameter not listed below is assumed to name a folder filled')
-	print('          with images to extract image data from.\n')
-	print('narrow_frame_grab')
-	print('          By default, the center area (320x40) of each source image is extracted')
-	print('          and stored in the destination folder \'sequence_generic\'. If this')
-	print('          parameter is set, however, the extracted area is changed to a more')
-	print('          narrow window of 55x35 pixels. Both sets of dimensions correspond to')
-	print('          the two possible input data formats expected by the ratlab pipeline.\n')
-	print('cap <limit>')
-	print('          This parameter allows to set a limit for the number of extraced')
-	print('          frames.')
-	print('          NOTE: This parameter is set last, i.e., later parameters will be')
-	print('          ignored!\n')
-	print('x2        If this parameter is set, two rectangular areas are extracted from')
-	print('          each frame.')
-	print('x3        If this parameter is set, three rectangular areas are extracted from')
-	print('          each frame.\n')
-	print('--------------------------------------------------------------------[ Examples ]\n')
-	print('Extract center areas of all the images listed in two test folders:')
-	print('     $ python snip.py test_folder_1 test_folder_2')
-	print('Extract twice the data, but no more than 100k frame grabs:')
-	print('     $ python snip.py test_folder_1 test_folder_2 x2 cap 100000')
-	print('================================================================================')
-
-main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
+
+
+#=====================================================================[ Header ]
+
+# system
+import os
+import sys
+
+# math
+import numpy
+
+# graphics
+from PIL import Image
+
+# utilities / own
+sys.path.append( './util' )
+import sequence
+
+#defines
+DEF_CROP_FILE    = './current_experiment/sequence_data_generic'    # crop set used by 'train.py generic'
+DEF_CACHE_FOLDER = './current_experiment/sequence_generic_cache/'  # decoded source images (option 'cache')
+
+#-----------------------------------------------------------------[ Crop Areas ]
+
+# crop boxes (left, upper, right, lower) relative to the center of a frame, one
+# box per pass over all frames
+DEF_CROPS = { ('wide',   1): [ (-160,-20,160, 20) ],
+              ('wide',   2): [ (-160,-40,160,  0), (-160,  0,160, 40) ],
+              ('wide',   3): [ (-160,-60,160,-20), (-160,-20,160, 20), (-160, 20,160, 60) ],
+              ('narrow', 1): [ ( -27,-17, 28, 18) ],
+              ('narrow', 2): [ ( -27,-35, 28,  0), ( -27,  0, 28, 35) ],
+              ('narrow', 3): [ ( -27,-52, 28,-17), ( -27,-17, 28, 18), ( -27, 18, 28, 53) ] }
+
+
+#====================================================================[ Sources ]
+
+def scanFolder( folder, channels, cache_file=None, limit=None ):
+	"""
+	List the accessible images of a folder along with their sizes. Images are
+	only decoded if a cache file is given, in which case they are stored in it
+	as a sequence data file; images differing in size from the first one are
+	skipped then.
+	folder    : Folder filled with images.
+	channels  : Color dimension of the crops (1 for greyscale, 3 for RGB).
+	cache_file: Sequence data file to decode the images into, or None.
+	limit     : Max. no. of images to list.
+	Returns the list of image file names and an array of their sizes (one
+	(width, height) pair per image).
+	"""
+	img_sequence = os.listdir( folder )
+	img_sequence.sort()
+	if limit != None:
+		img_sequence = img_sequence[:limit]
+
+	images = []
+	sizes  = []
+	cache  = None
+	for source_frame in img_sequence:
+		try:
+			frame = Image.open( os.path.join(folder,source_frame) )
+			if cache_file != None:
+				if cache == None:
+					cache = open( cache_file, 'wb' )
+					sequence.writeHeader( cache, 0, frame.size[0], frame.size[1], channels )
+				elif frame.size != tuple( sizes[0] ):
+					print('\nWarning! Skipping file of deviating size', os.path.join(folder,source_frame))
+					continue
+				cache.write( numpy.asarray(frame.convert('RGB' if channels == 3 else 'L'),dtype=numpy.uint8).tobytes() )
+		except:
+			print('\nWarning! Skipping inaccessible file', os.path.join(folder,source_frame))
+			continue
+		images.append( source_frame )
+		sizes.append( frame.size )
+
+		# housekeeping
+		done = int(len(images)/float(len(img_sequence))*50.0)
+		sys.stdout.write( '\r' + '[' + '='*done + '-'*(50-done) + ']~[' + '%.2f' % (len(images)/float(len(img_sequence))*100.0) + '%]' )
+		sys.stdout.flush()
+	print('')
+
+	if cache != None:
+		sequence.writeHeader( cache, len(images), sizes[0][0], sizes[0][1], channels )
+		cache.close()
+	return images, numpy.array( sizes, dtype=numpy.int64 ).reshape( -1, 2 )
+
+
+#=======================================================================[ Main ]
+
+def main():
+
+	# halp
+	if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
+		printHelp()
+		sys.exit()
+
+	# setup
+	frame_folders = []
+	frame_grab    = 'wide'
+	multiplier    = 1
+	data_cap      = None
+	cache         = False
+
+	# parameter
+	for i, arg in enumerate( sys.argv ):
+		if i == 0: continue
+		elif arg == 'x2': multiplier = 2
+		elif arg == 'x3': multiplier = 3
+		elif arg == 'narrow_frame_grab': frame_grab = 'narrow'
+		elif arg == 'cache': cache = True
+		elif arg == 'cap': data_cap = int(sys.argv[i+1]); break
+		else: frame_folders.append( arg )
+
+	if len(frame_folders) == 0:
+		print('Error! No folders to extract image data from.')
+		sys.exit()
+	if os.path.isdir( os.path.dirname(DEF_CROP_FILE) ) == False:
+		print('Error! Missing destination folder \'%s\'!' % os.path.dirname(DEF_CROP_FILE))
+		sys.exit()
+	if cache and os.path.isdir(DEF_CACHE_FOLDER) == False:
+		os.mkdir( DEF_CACHE_FOLDER )
+
+	print('Frame grab:', frame_grab)
+	print('List of folders:', frame_folders)
+
+	# color mode of the first image
+	try:
+		first = sorted( os.listdir(frame_folders[0]) )[0]
+		mode  = Image.open( os.path.join(frame_folders[0],first) ).mode
+	except:
+		print('Error! No accessible image in folder \'%s\'!' % frame_folders[0])
+		sys.exit()
+	if mode == 'RGBA' or mode == 'RGB':
+		print('Color mode is RGB.')
+		channels = 3
+	elif mode == 'L':
+		print('Color mode is greyscale.')
+		channels = 1
+	else:
+		print('Error! Unknown color mode \'%s\'!' % mode)
+		sys.exit()
+
+	# sources: folders of images or their decoded caches; with a data cap, only
+	# the frames needed for the first pass are listed
+	sources = []
+	sizes   = []
+	for folder in frame_folders:
+		limit = data_cap-sum( [len(s) for s in sizes] ) if data_cap else None
+		if limit != None and limit <= 0:
+			break
+		print('Reading folder \'%s\'%s.' % (folder,' into cache' if cache else ''))
+		cache_file = DEF_CACHE_FOLDER+'source_'+str(len(sources)).zfill(3) if cache else None
+		images, frame_sizes = scanFolder( folder, channels, cache_file, limit )
+		if len(images) == 0:
+			print('Warning! No accessible images in folder \'%s\'.' % folder)
+			continue
+		if cache:
+			sources.append( { 'data': os.path.relpath(cache_file,os.path.dirname(DEF_CROP_FILE)) } )
+		else:
+			sources.append( { 'folder': os.path.relpath(folder,os.path.dirname(DEF_CROP_FILE)), 'images': images } )
+		sizes.append( frame_sizes )
+
+	frame_count = sum( [len(s) for s in sizes] )
+	print('No. of frames in all folders:', frame_count)
+	if frame_count == 0:
+		print('Error! No frames found in the given folders!')
+		sys.exit()
+
+	if multiplier != 1: print('Frame data multiplier: x%d' % multiplier)
+	if data_cap: print('Data cap (%d/%d)' % (data_cap, frame_count*multiplier))
+
+	# crop definitions, pass by pass over all frames
+	boxes  = DEF_CROPS[(frame_grab,multiplier)]
+	width  = boxes[0][2]-boxes[0][0]
+	height = boxes[0][3]-boxes[0][1]
+	crops  = []
+	for box in boxes:
+		for k, frame_sizes in enumerate( sizes ):
+			left  = frame_sizes[:,0]//2+box[0]
+			top   = frame_sizes[:,1]//2+box[1]
+			valid = (left >= 0) & (top >= 0) & (left+width <= frame_sizes[:,0]) & (top+height <= frame_sizes[:,1])
+			c = numpy.zeros( valid.sum(), dtype=sequence.def_CROP_RECORD )
+			c['source'] = k
+			c['frame']  = numpy.nonzero( valid )[0]
+			c['left']   = left[valid]
+			c['top']    = top[valid]
+			crops.append( c )
+	crops = numpy.concatenate( crops )
+
+	if len(crops) < frame_count*len(boxes):
+		print('Warning! Skipped %d crops reaching beyond their frames.' % (frame_count*len(boxes)-len(crops)))
+	if data_cap and len(crops) >= data_cap:
+		print('Data cap reached.')
+		crops = crops[:data_cap]
+	elif data_cap:
+		print('Warning: Set data cap was not reached (%d/%d).' % (len(crops), data_cap))
+
+	sequence.writeCropSet( DEF_CROP_FILE, sources, crops, width, height, channels )
+	print('Wrote %d crop definitions (%dx%d) to \'%s\'.' % (len(crops), width, height, DEF_CROP_FILE))
+
+#-----------------------------------------------------------------------[ Help ]
+
+def printHelp():
+	print('================================================================================')
+	print('Snipping Tool Help                                                              ')
+	print('--------------------------------------------------------------------------------')
+	print('This program goes through a number of provided folders, assumed to be filled')
+	print('images. From those the center area is cut out for further use as generic')
+	print('training material for ratlab. The cut out areas are not stored as images;')
+	print('instead, the program writes the crop set \'current_experiment/')
+	print('sequence_data_generic\', which lists the source image and the crop box of')
+	print('every frame. The training (train.py generic) cuts out the frames batch by')
+	print('batch while it reads them, so no data converter run is needed. Run the')
+	print('program from the ratlab folder; the source images must stay in place.\n')
+	print('--------------------------------------------------------[ Command Line Options ]\n')
+	print('<list of folders>')
+	print('          Each parameter not listed below is assumed to name a folder filled')
+	print('          with images to extract image data from.\n')
+	print('narrow_frame_grab')
+	print('          By default, the center area (320x40) of each source image is extracted.')
+	print('          If this parameter is set, however, the extracted area is changed to a')
+	print('          more narrow window of 55x35 pixels. Both sets of dimensions correspond')
+	print('          to the two possible input data formats expected by the ratlab')
+	print('          pipeline.\n')
+	print('cap <limit>')
+	print('          This parameter allows to set a limit for the number of extraced')
+	print('          frames.')
+	print('          NOTE: This parameter is set last, i.e., later parameters will be')
+	print('          ignored!\n')
+	print('x2        If this parameter is set, two rectangular areas are extracted from')
+	print('          each frame.')
+	print('x3        If this parameter is set, three rectangular areas are extracted from')
+	print('          each frame.\n')
+	print('cache     Decode the source images once into sequence data files (one per')
+	print('          folder, stored in \'current_experiment/sequence_generic_cache\'),')
+	print('          and cut the frames out of those during training instead of decoding')
+	print('          the images again for every crop. Requires all images of a folder to')
+	print('          be of the same size; the source images are no longer needed.\n')
+	print('--------------------------------------------------------------------[ Examples ]\n')
+	print('Extract center areas of all the images listed in two test folders:')
+	print('     $ python tools/snip.py test_folder_1 test_folder_2')
+	print('Extract twice the data, but no more than 100k frame grabs:')
+	print('     $ python tools/snip.py test_folder_1 test_folder_2 x2 cap 100000')
+	print('================================================================================')
+
+main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
@@ -0,0 +1,53 @@
+#Checks that the networks of a frame sweep ('train.py frames_sweep <n>,<n>,...') equal the networks of separate runs on each frame count.
+#Run from the ratlab folder: python tools/sweep_check.py [batch size] [frame counts] [further train.py options]
+
+import os
+import sys
+import time
+import pickle
+import subprocess
+
+import numpy
+
+sys.path.append( './util' )
+import sequence
+
+# by default, the frame counts end within a batch, at a batch boundary, and one
+# frame past a batch boundary (where a single trailing frame joins the batch before)
+batch_size = sys.argv[1] if len(sys.argv) > 1 else '500'
+counts     = sys.argv[2] if len(sys.argv) > 2 else ','.join( [ str(n) for n in [ 2*int(batch_size)+1, int(2.5*int(batch_size)), 3*int(batch_size), 3*int(batch_size)+1 ] ] )
+options    = sys.argv[3:]
+folder     = './current_experiment/'
+
+def train( extra ):
+	# run train.py and collect the networks it stored, by frame count
+	ping = time.time()
+	subprocess.check_call( [ sys.executable, os.path.join(os.path.dirname(sys.argv[0]),'..','train.py'), 'batch_size', batch_size ] + options + extra,
+	                       stdout=subprocess.DEVNULL )
+	networks = {}
+	for f in os.listdir( folder ):
+		if f.startswith( 'network_x' ) and f.endswith( '.tsn' ) and os.path.getmtime( folder+f ) >= int(ping):
+			n = int( f[9:].split('_')[0].split('.')[0] )
+			networks[n] = pickle.load( open(folder+f,'rb') )
+			os.remove( folder+f )
+	return networks
+
+sweep = train( [ 'frames_sweep', counts ] )
+data  = sequence.SequenceSet( [ folder+f for f in ( options[options.index('data')+1].split(',') if 'data' in options else ['sequence_data'] ) ] )
+x     = numpy.array( data.read(0,min(data.frames,2000)), dtype=numpy.float32 )
+
+same = True
+print( '%8s %12s' % ('frames','max. diff') )
+for n in sorted( [ int(c) for c in counts.split(',') ] ):
+	single = train( [ 'frames', str(n) ] )
+	if n not in sweep or n not in single:
+		print( '%8d %12s' % (n,'missing') )
+		same = False
+		continue
+	a = sweep[n].execute( x )
+	b = single[n].execute( x )
+	diff = numpy.abs( a-b ).max() / max( numpy.abs(b).max(), 1e-30 )
+	print( '%8d %12.2e' % (n,diff) )
+	same = same and diff < 1e-4
+print( 'Networks match.' if same else 'Error! Networks differ.' )
+sys.exit( 0 if same else 1 )
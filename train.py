@@ -1,434 +1,1053 @@
-#==============================================================================
-#
-#  Copyright (C) 2016 Fabian Schoenfeld
-#
-#  This file is part of the ratlab software. It is free software; you can
-#  redistribute it and/or modify it under the terms of the GNU General Public
-#  License as published by the Free Software Foundation; either version 3, or
-#  (at your option) any later version.
-#
-#  This library is distributed in the hope that it will be useful, but WITHOUT
-#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
-#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
-#  more details.
-#
-#  You should have received a copy of the GNU General Public License along with
-#  a special exception for linking and compiling against the pe library, the
-#  so-called "runtime exception"; see the file COPYING. If not, see:
-#  http://www.gnu.org/licenses/
-#
-#==============================================================================
-
-
-#====================================================================[ Imports ]
-
-# system
-import os
-import sys
-import time
-import struct
-import pickle
-
-# math
-import numpy
-import math
-import mdp
-
-print('Running MDP version', mdp.__version__)# , mdp.config.has_mdp, 'from', mdp.__file__
-
-# utilities / own
-sys.path.append( './util' )
-from util.setup import *
-
-
-#==================================================================[ Utilities ]
-
-# grab data slice from fully loaded data set
-class getReusableDataSlicer():
-	def __init__( self, data, batch_size ):
-		self.data = data
-		self.batch_size = batch_size
-	def __iter__( self ):
-		for i in range( int(self.data.shape[0]/self.batch_size) ):
-			yield self.data[ i*self.batch_size:(i+1)*self.batch_size, ]
-
-def printNetworkState( network ):
-	# color/greyscale, wide/narrow?
-	print('\tNetwork (%d layers) accepts' % len(network), ('COLOR' if network[0].in_channel_dim==3 else 'GREYSCALE'))
-	print('images with a', ('WIDE' if network[0].in_channels_xy[0]==320 else 'NARROW'), 'FOV angle.')
-	# trained?
-	print('\tLower SFA layer 01: ', ('NOT trained.' if network[1].is_training() else 'IS trained.'))
-	print('\tLower SFA layer 02: ', ('NOT trained.' if network[3].is_training() else 'IS trained.'))
-	print('\tHigh lvl SFA layer: ', ('NOT trained.' if network[4].is_training() else 'IS trained.'))
-	if len(network)==6:
-		print('\tHigh lvl ICA layer: ', ('NOT trained.' if network[5].is_training() else 'IS trained.'))
-	else:
-		print('\t(Network does not have an ICA layer)')
-
-
-#=======================================================[ SFA Network Training ]
-
-def initNetwork( wide_fov=True, color=True, noise=False ):
-
-	# wide angle setup
-	if wide_fov:
-		raw_data_dim_x           =320
-		raw_data_dim_y           = 40
-
-		sfa_dim_red_factor       = 32	# output dimension of sfa nodes used for dimensionality reduction
-
-		sfa_lower_layer_nodes_x  = 63	# 63x9=567 -> no. output channels of the raw switchboard
-		sfa_lower_layer_nodes_y  =  9
-		sfa_lower_layer_field_x  = 10	# 10x8x1=80 -> dimension of a single output channel of raw switchboard
-		sfa_lower_layer_field_y  =  8
-		sfa_lower_layer_node_out = 32	# output dimension of a single node of sfa clone layer A
-
-		sfa_upper_layer_nodes_x  =  8	# 8x2=10 -> no. output channels of the sfa switchboard
-		sfa_upper_layer_nodes_y  =  2
-		sfa_upper_layer_field_x  = 14	# 14x6x16=1344 -> dimensions of a single output channel of the sfa switchboard
-		sfa_upper_layer_field_y  =  6
-		sfa_upper_layer_node_out = 32	# output dimension of a single node of sfa clone layer B
-
-		sfa_top_node_out		 = 32	# output dimension of the single SFA node atop the hierarchy
-
-	# narrow angle setup
-	else:
-		raw_data_dim_x           = 55
-		raw_data_dim_y           = 35
-
-		sfa_dim_red_factor       = 32	# output dimension of sfa nodes used for dimensionality reduction
-
-		sfa_lower_layer_nodes_x  = 10
-		sfa_lower_layer_nodes_y  =  6
-		sfa_lower_layer_field_x  = 10
-		sfa_lower_layer_field_y  = 10
-		sfa_lower_layer_node_out = 32	# output dimension of a single node of sfa clone layer A
-
-		sfa_upper_layer_nodes_x  =  4
-		sfa_upper_layer_nodes_y  =  4
-		sfa_upper_layer_field_x  =  4
-		sfa_upper_layer_field_y  =  2
-		sfa_upper_layer_node_out = 32	# output dimension of a single node of sfa clone layer B
-
-		sfa_top_node_out		 = 32	# output dimension of the single SFA node atop the hierarchy
-
-	#--------------------------------------------------------[ Lower SFA Layer ]
-
-	# raw data switchboard
-	raw_switchboard = mdp.hinet.Rectangular2dSwitchboard( in_channels_xy    = (raw_data_dim_x,raw_data_dim_y),
-														  field_channels_xy = (sfa_lower_layer_field_x,sfa_lower_layer_field_y),
-														  field_spacing_xy  = (sfa_lower_layer_field_x//2,sfa_lower_layer_field_y//2),
-														  in_channel_dim    = 3 if color else 1 )
-	# processing over-node for lower sfa layer
-	sfa_node_A = mdp.nodes.SFANode               ( input_dim=raw_switchboard.out_channel_dim, output_dim=sfa_dim_red_factor, dtype='float32' )
-	exp_node   = mdp.nodes.QuadraticExpansionNode( input_dim=sfa_dim_red_factor )
-	noise_node = mdp.nodes.NoiseNode             ( input_dim=exp_node.output_dim, output_dim=exp_node.output_dim, noise_args=(0,numpy.sqrt(0.05)) )
-	sfa_node_B = mdp.nodes.SFANode               ( input_dim=exp_node.output_dim, output_dim=sfa_lower_layer_node_out, dtype='float32' )
-
-	if noise:
-		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_A, exp_node, noise_node, sfa_node_B ]) )
-		print('Using noisy nodes.')
-	else:
-		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_A, exp_node, sfa_node_B ]) )
-
-	# lower clone layer
-	sfa_lower_layer = mdp.hinet.CloneLayer( sfa_over_node, n_nodes=raw_switchboard.output_channels )
-
-	#--------------------------------------------------------[ Upper SFA Layer ]
-	
-	# sfa data relay switchboard
-	sfa_switchboard = mdp.hinet.Rectangular2dSwitchboard( in_channels_xy    = (sfa_lower_layer_nodes_x,sfa_lower_layer_nodes_y),
-														  field_channels_xy = (sfa_upper_layer_field_x, sfa_upper_layer_field_y),
-														  field_spacing_xy  = (sfa_upper_layer_field_x//2,sfa_upper_layer_field_y//2),
-														  in_channel_dim    = sfa_lower_layer_node_out )
-	# processing over-node for upper sfa layer 
-	sfa_node_X = mdp.nodes.SFANode				 ( input_dim=sfa_switchboard.out_channel_dim, output_dim=sfa_dim_red_factor, dtype='float32' )
-	exp_node   = mdp.nodes.QuadraticExpansionNode( input_dim=sfa_dim_red_factor )
-	noise_node = mdp.nodes.NoiseNode             ( input_dim=exp_node.output_dim, output_dim=exp_node.output_dim, noise_args=(0,numpy.sqrt(0.05)) )
-	sfa_node_Y = mdp.nodes.SFANode				 ( input_dim=exp_node.output_dim, output_dim=sfa_upper_layer_node_out, dtype='float32' )
-
-	if noise:
-		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_X, exp_node, noise_node, sfa_node_Y ]) )
-	else:
-		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_X, exp_node, sfa_node_Y ]) )
-
-	# upper clone layer
-	sfa_upper_layer = mdp.hinet.CloneLayer( sfa_over_node, n_nodes=sfa_switchboard.output_channels )
-	
-	#-----------------------------------------------------------[ Top Layer(s) ]
-
-	# final sfa master node
-	sfa_node_U = mdp.nodes.SFANode				 ( input_dim=sfa_upper_layer.output_dim, output_dim=sfa_dim_red_factor, dtype='float32' )
-	exp_node   = mdp.nodes.QuadraticExpansionNode( input_dim=sfa_dim_red_factor )
-	noise_node = mdp.nodes.NoiseNode             ( input_dim=exp_node.output_dim, output_dim=exp_node.output_dim, noise_args=(0,numpy.sqrt(0.05)) )
-	sfa_node_V = mdp.nodes.SFANode				 ( input_dim=exp_node.output_dim, output_dim=sfa_top_node_out, dtype='float32' )
-
-	if noise:
-		sfa_over_node = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_U, exp_node, noise_node, sfa_node_V ]) )	
-	else:
-		sfa_over_node = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_U, exp_node, sfa_node_V ]) )
-
-	sfa_network = mdp.Flow([ raw_switchboard,
-							 sfa_lower_layer,
-							 sfa_switchboard,
-							 sfa_upper_layer,
-							 sfa_over_node  ])
-	return sfa_network
-
-def trainNetwork( network, batch_size=None, add_ICA_layer=False, frame_override=None, generic=False ):
-	
-	# report training parameters
-	if add_ICA_layer: print('Adding additional top level ICA node.')
-	if generic:       print('Training using generic sequence data.')
-
-	# data file
-	try:
-		if generic: datafile = open( './current_experiment/sequence_data_generic', 'rb' )
-		else:       datafile = open( './current_experiment/sequence_data', 'rb' )
-	except:
-		print('Error! Required data file could not be opened. Make sure the file')
-		print('       was generated via the SFA data converter.')
-		sys.exit()
-
-	# data header
-	frames       = struct.unpack( 'i', datafile.read(4) )[0]	# no. of image frames
-	frame_dim_x  = struct.unpack( 'i', datafile.read(4) )[0]	# width (in px) of a single frame
-	frame_dim_y  = struct.unpack( 'i', datafile.read(4) )[0]	# height of a single frame
-	raw_data_dim = struct.unpack( 'i', datafile.read(4) )[0]	# color dimension (greyscale/RGB)
-
-	# manual frame override?
-	if frame_override != None:
-		if frame_override < frames: 
-			frames = frame_override
-			print('Frame override: training with', frames, 'frames only.')
-		else:
-			print('Warning! Given frame override value is invalid and will be ignored.')
-
-	# valid batch size?
-	if batch_size == None:
-		batch_size = frames
-	if frames%batch_size != 0:
-		print('Error! batch_size does not divide the given frame count evenly!')
-		sys.exit()
-
-	# color mode
-	if raw_data_dim == 1: print('Color mode is greyscale.')
-	if raw_data_dim == 3: print('Color mode is RGB color.')
-	if raw_data_dim != 1 and raw_data_dim != 3:
-		print('Error! Unknown color mode: ', raw_data_dim)
-		return None
-
-	#------------------------------------------------[ Add Sparse Coding Layer ]
-
-	if add_ICA_layer:
-		if len(network) == 6: 
-			print('Warning! Top ICA layer already part of the network.')
-		else:
-			top_lvl  = network[ len(network)-1 ]
-			ica_node = mdp.nodes.CuBICANode( input_dim=top_lvl.output_dim, dtype='float32' )
-			network.append( ica_node )
-
-	#---------------------------------------------------------------[ Get Data ]
-
-	print('Reading training data:', frames, 'frames of', frame_dim_x, 'x', frame_dim_y, 'px images.')
-
-	# read data into memory map
-	ping = time.time()
-	data = numpy.memmap( 'data_memmap', dtype=numpy.float32, mode='w+', shape=(frames,frame_dim_x*frame_dim_y*raw_data_dim) )
-
-	cnt = 0.0
-	for frame in range(0, frames):
-		for channel in range(0, frame_dim_x*frame_dim_y*raw_data_dim):
-			data[frame,channel] = ord( struct.unpack('c',datafile.read(1))[0] )
-
-		cnt += 1
-		done = int(cnt/frames*50.0)
-		sys.stdout.write( '\r' + '[READ][' + '='*done + '-'*(50-done) + ']~[' + '%.2f' % (cnt/frames*100.0) + '%]' )
-		sys.stdout.flush()
-	print('~[%dsec/%dmin]' % (time.time()-ping, (time.time()-ping)/60.0))
-
-	# flush data to disk and reopen memmap in readonly mode
-	del data
-	data = numpy.memmap( 'data_memmap', dtype=numpy.float32, mode='r', shape=(frames,frame_dim_x*frame_dim_y*raw_data_dim) )
-
-	#-------------------------------------------------------[ Network Training ]
-
-	# batch processing
-	if batch_size == frames:
-		print('Single file processing: using full data set for single training phase.')
-	else:
-		print('Batch processing: training %d batches holding %d frames each.' % ( int(data.shape[0]/batch_size), batch_size ))
-
-	ping = time.time()
-
-	# training set data slicers
-	training_set = []
-	for i in range(4 if generic else len(network)):
-		training_set.append( getReusableDataSlicer(data,batch_size) )
-
-	# default training
-	if not generic: network.train( training_set )
-
-	# low level training
-	else:
-		lower_layers = mdp.Flow([ network[0],
-								  network[1],
-								  network[2],
-								  network[3] ])
-		lower_layers.train( training_set )
-
-	print('Complete network training time: %dsec / %dmin' % (time.time()-ping, (time.time()-ping)/60.0))
-	
-	# clean up data by nulling the only reference made
-	data = None
-
-	return network
-
-
-#=======================================================================[ Main ]
-
-def main():
-
-	# check command line arguments
-	if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
-		printHelp()
-		sys.exit()
-
-	#--------------------------------------------------------------[ Data Info ]
-
-	try:
-		if 'generic' in sys.argv: 
-			datafile = open( './current_experiment/sequence_data_generic', 'rb' )
-		else:
-			datafile = open( './current_experiment/sequence_data', 'rb' )
-	except:
-		print('Error! Required data file could not be opened. Make sure the file')
-		print('       was generated via the SFA data converter.')
-		sys.exit()
-
-	frames       = struct.unpack( 'i', datafile.read(4) )[0]	# no. of image frames
-	frame_dim_x  = struct.unpack( 'i', datafile.read(4) )[0]	# width (in px) of a single frame
-	frame_dim_y  = struct.unpack( 'i', datafile.read(4) )[0]	# height of a single frame
-	raw_data_dim = struct.unpack( 'i', datafile.read(4) )[0]	# color dimension (greyscale/RGB)
-
-	#----------------------------------------------------[ Training Parameters ]
-
-	use_wide_fov = True if frame_dim_x==320 else False
-	use_color    = True if raw_data_dim==3  else False
-
-	generic        = 'generic' in sys.argv
-	noisy_nodes    = ('noise' in sys.argv)
-	add_ICA        =  ('ICA' in sys.argv)
-
-	batch_size     = None
-	frame_override = None
-	tsn_file       = None
-	for i, arg in enumerate(sys.argv):
-		if arg == 'batch_size': batch_size     = int(sys.argv[i+1])
-		if arg == 'frames':     frame_override = int(sys.argv[i+1])
-		if arg == 'file':       tsn_file       = sys.argv[i+1]
-
-	#---------------------------------------------------------[ Set Up Network ]
-
-	if 'file' in sys.argv:
-		# filename shortcut?
-		if tsn_file == '-':
-			for f in os.listdir( './current_experiment' ):
-				if '.tsn' in f: tsn_file = f
-		if tsn_file == '-':
-			print('Error! No .tsn file was found in folder \'./current_experiment\'.')
-		# open file
-		try:
-			print('Loading network from file \'%s\'' % tsn_file)
-			network = open( './current_experiment/'+tsn_file, 'r' )
-		except:
-			print('Error opening SFA network file.')
-			sys.exit()
-		# extract network
-		network    = pickle.load( network )
-		if add_ICA:
-			tsn_file  = tsn_file[:len(tsn_file)-4]
-			tsn_file += '_ICA.tsn'
-
-	# initialize new network
-	else:
-		network = initNetwork( wide_fov = use_wide_fov,
-							   color    = use_color,
-							   noise    = noisy_nodes )
-
-	print('Network state before training:')
-	printNetworkState( network )
-
-	#---------------------------------------------------------------[ Training ]
-
-	trainNetwork( network, batch_size, add_ICA, frame_override, generic )
-
-	print('\nNetwork state after training:')
-	printNetworkState( network )
-
-	#--------------------------------------------------------[ Save and Return ]
-
-	filename = tsn_file
-
-	if filename == None:
-		filename = 'network_x' + ( str(frame_override) if frame_override != None else str(frames) )
-		if generic:       filename += '_generic'
-		if use_color:     filename += '_color'
-		else:             filename += '_greyscale'
-		if noisy_nodes:   filename += '_noise'
-		if add_ICA:       filename += '_ICA'
-		filename += '.tsn'
-	
-	network.save( ('./current_experiment/'+filename) )
-	print('Trained SFA network stored to file \'./current_experiment/%s\'' % filename)
-
-#-----------------------------------------------------------------------[ Help ]
-
-def printHelp():
-	print('================================================================================')
-	print('RatLab training help                                                            ')
-	print('--------------------------------------------------------------------------------')
-	print('This program trains a SFA hierarchy network and stores the trained network as a')
-	print('.tsn file (Trained Sfa Network) to disk under the default name:')
-	print('  \'network_xSTEPS_MODE.tsn\'')
-	print('Where STEPS denotes the number of input samples the network was trained with,')
-	print('and MODE is either \'color\' or \'greyscale\' to indicate which kind of input')
-	print('data the network expects when used for sampling. These parameters are read ')
-	print('directly from the input data, which this program assumes to be found within an')
-	print('existing \'sequence_data\' file that was previously generated by convert.py.\n')
-	print('--------------------------------------------------------[ Command Line Options ]\n')
-	print('batch_size <count>')
-	print('          If specified, the network will be trained with batches of data instead')
-	print('          of using all available data at once. Note that <count> has to evenly')
-	print('          divide the number of frames being used to train the network!\n')
-	print('frames <n>')
-	print('          If specified, the network will be trained with <n> frames only, even if')
-	print('          the sequence data file contains additional frames. This can be used to')
-	print('          record <x> frames and train various networks with <x-y> frames to see')
-	print('          the difference made by the additional <y> frames.\n')
-	print('ICA       This optional parameter tells the network to add an additional layer of')
-	print('          sparse coding (implemented via an ICA node) at the top of the network.\n')
-	print('noise     This optional parameter tells the network to inlude additional nodes')
-	print('          that add random noise to the processed data. This may help in case')
-	print('          the trainig phase crashes due to singular matrices. (Note: this may')
-	print('          also be helped by training with more data, i.e., moretime steps.) If')
-	print('          no custom file name is provided, the default filename is extended by')
-	print('          a \'_noise\' tag.\n')
-	print('---------------------------------------------------[ Advanced Training Options ]\n')
-	print('generic   (...)\n')
-	print('add_ICA <file>')
-	print('          If this parameter is set, no new network is being trained. Instead')
-	print('          <file> is expected to be the name of a .tsn file that contains a')
-	print('          network which already has been trained beforehand but does not yet')
-	print('          include an additional ICA layer. The network will be extended by an')
-	print('          additional ICA node which is then trained as usual. The resulting')
-	print('          network will be stored in a new file using the original name plus an')
-	print('          additional \'_ICA\' suffix.')
-	print('          NOTE: The filename can be replaced by a simple \'-\' in which case the')
-	print('          first found .tsn file in the \'current_experiment\' folder will be used.\n')
-	print('--------------------------------------------------------------------[ Examples ]\n')
-	print('Train the network with an additional sparse coding step and store it as \'data.tsn\'')
-	print('     $ python train.py sparse file data.tsn')
-	print('================================================================================')
-
-main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+#====================================================================[ Imports ]
+
+# system
+import os
+import sys
+import time
+import signal
+import struct
+import pickle
+import collections
+import concurrent.futures
+
+# math
+import numpy
+import math
+import mdp
+
+print('Running MDP version', mdp.__version__)# , mdp.config.has_mdp, 'from', mdp.__file__
+
+# utilities / own
+sys.path.append( './util' )
+from util.setup import *
+import sequence
+import parallel_training
+import layerwise
+import estimate
+import clone_layer
+import sfa_statistics
+import frame_sweep
+import distributed
+import ipca
+import architecture
+import profiler
+import stream
+
+#defines
+def_DISTRIBUTED = './current_experiment/distributed'    # shared folder of distributed training
+def_PROFILE     = './current_experiment/train_profile'  # base name of the profiling report files
+
+
+#==================================================================[ Utilities ]
+
+# grab data slice from the memory-mapped (uint8) data set; each batch is converted
+# to float32 only when handed out, and batches never cross segment borders. The
+# last batch of a segment may be smaller; a single trailing frame (which has no
+# temporal derivative) is added to the preceding batch instead. The first <skip>
+# batches are left out (used to resume training from a checkpoint).
+class getReusableDataSlicer():
+	def __init__( self, data, batch_size ):
+		self.data = data
+		self.batch_size = batch_size
+		self.skip = 0
+	def batches( self ):
+		n = 0
+		for (start, stop) in self.data.segments:
+			batch_size = self.batch_size if self.batch_size != None else stop-start
+			bounds = list( range(start,stop,batch_size) ) + [stop]
+			if len(bounds) > 2 and bounds[-1]-bounds[-2] == 1:
+				del bounds[-2]
+			for i in range( len(bounds)-1 ):
+				if n >= self.skip:
+					yield ( bounds[i], bounds[i+1] )
+				n += 1
+	def __iter__( self ):
+		for (start, stop) in self.batches():
+			yield self.data.read( start, stop ).astype( numpy.float32 )
+
+# prefetching data slicer: background threads read and convert (and optionally
+# transform) the next <depth> batches while the network trains on the current one
+class getPrefetchingDataSlicer( getReusableDataSlicer ):
+	def __init__( self, data, batch_size, depth=2, transform=None ):
+		getReusableDataSlicer.__init__( self, data, batch_size )
+		self.depth = depth
+		self.transform = transform
+	def __load__( self, start, stop ):
+		batch = self.data.read( start, stop ).astype( numpy.float32 )
+		return self.transform( batch ) if self.transform != None else batch
+	def __iter__( self ):
+		pool    = concurrent.futures.ThreadPoolExecutor( max_workers=self.depth )
+		pending = collections.deque()
+		try:
+			for (start, stop) in self.batches():
+				pending.append( pool.submit(self.__load__,start,stop) )
+				if len(pending) > self.depth:
+					yield pending.popleft().result()
+			while len(pending) > 0:
+				yield pending.popleft().result()
+		finally:
+			for f in pending: f.cancel()
+			pool.shutdown( wait=True )
+
+# batch boundaries only; used by worker processes that read the data themselves
+class getReusableBatchRanges( getReusableDataSlicer ):
+	def __iter__( self ):
+		return self.batches()
+
+# open training data: a single sequence data file or a virtual set of several files,
+# RGB data possibly presented as greyscale or a subset of its channels (view)
+def openTrainingData( data_files=None, generic=False, view=None ):
+	if data_files == None:
+		data_files = [ 'sequence_data_generic' if generic else 'sequence_data' ]
+	try:
+		return sequence.SequenceSet( [ './current_experiment/'+f for f in data_files ], view )
+	except IOError as e:
+		print('Error!', e)
+		sys.exit()
+	except:
+		print('Error! Required data file could not be opened. Make sure the file')
+		print('       was generated via the SFA data converter.')
+		sys.exit()
+
+def printNetworkState( network ):
+	# color/greyscale, wide/narrow?
+	print('\tNetwork (%d layers) accepts' % len(network), ('COLOR' if network[0].in_channel_dim==3 else 'GREYSCALE'))
+	print('images with a', ('WIDE' if network[0].in_channels_xy[0]==320 else 'NARROW'), 'FOV angle.')
+	# trained?
+	print('\tLower SFA layer 01: ', ('NOT trained.' if network[1].is_training() else 'IS trained.'))
+	print('\tLower SFA layer 02: ', ('NOT trained.' if network[3].is_training() else 'IS trained.'))
+	print('\tHigh lvl SFA layer: ', ('NOT trained.' if network[4].is_training() else 'IS trained.'))
+	if len(network)==6:
+		print('\tHigh lvl ICA layer: ', ('NOT trained.' if network[5].is_training() else 'IS trained.'))
+	else:
+		print('\t(Network does not have an ICA layer)')
+
+def networkSlowness( nodes, data, batch_ranges ):
+	# delta value (mean squared time derivative over variance) of every output
+	# signal of the given nodes; derivatives are taken within batches
+	n, s1, s2, d2, m = 0, 0.0, 0.0, 0.0, 0
+	for (start, stop) in batch_ranges:
+		y   = layerwise.execute( nodes, layerwise.readBatch(data,start,stop) ).astype( numpy.float64 )
+		n  += y.shape[0]
+		s1 += y.sum( axis=0 )
+		s2 += (y*y).sum( axis=0 )
+		d2 += (numpy.diff(y,axis=0)**2).sum( axis=0 )
+		m  += y.shape[0]-1
+	return (d2/m) / (s2/n-(s1/n)**2)
+
+def printEstimate( nodes, frames, batch_size=None ):
+	# cost of every training phase still to come (see util/estimate.py):
+	# flops per frame, covariance size, peak memory per batch, and the time
+	# projected from the flop rates of a short calibration on random data
+	batch  = batch_size if batch_size != None else frames
+	memory = dict( [ (k, fixed+per_frame*(batch+1)) for (k, per_frame, fixed) in estimate.stageMemory(nodes) ] )
+	stages = estimate.stageFlops( nodes )
+	rates  = estimate.calibrate( stages )
+	total  = 0.0
+	print('Estimated cost of training with %d frames in batches of %d frames:' % (frames,batch))
+	print('%4s %-24s %6s %11s %13s %11s %9s %8s' % ('node','trained (inner) node','fields','covariance','execute below','train','peak','time'))
+	print('%4s %-24s %6s %11s %13s %11s %9s %8s' % ('','','','','[MFLOP/fr]','[MFLOP/fr]','[MB]','[s]'))
+	for (k, leaf, rows, execute, train, solve), rate in zip( stages, rates ):
+		seconds = ( frames*(execute+train) + solve )/rate
+		total  += seconds
+		print('%4d %-24s %6d %11s %13.2f %11.2f %9d %8d' % (k, leaf.__class__.__name__, rows, '%dx%d' % (leaf.input_dim,leaf.input_dim),
+		      execute/1e6, train/1e6, memory[k]/estimate.def_MB, seconds))
+	print('Projected training time: %dsec / %dmin' % (total, total/60.0))
+
+
+#=================================================================[ Checkpoint ]
+
+def_CHECKPOINT = './current_experiment/train_checkpoint'
+
+# set via SIGTERM: training stops after the current batch (see trainStaged)
+terminate = False
+
+def __writeCheckpoint__( network, node, batch, stats=None ):
+	# network state including the partial statistics of the node being trained,
+	# and the number of batches trained in its current training phase
+	state = {}
+	state['argv']    = [ a for a in sys.argv[1:] if a != 'resume' ]
+	state['network'] = network
+	state['node']    = node
+	state['batch']   = batch
+	state['stats']   = stats
+	# replace the previous checkpoint atomically
+	f = open( def_CHECKPOINT+'.tmp', 'wb' )
+	pickle.dump( state, f, protocol=pickle.HIGHEST_PROTOCOL )
+	f.close()
+	os.replace( def_CHECKPOINT+'.tmp', def_CHECKPOINT )
+
+def __readCheckpoint__():
+	try:
+		f = open( def_CHECKPOINT, 'rb' )
+		state = pickle.load( f )
+		f.close()
+	except:
+		print('Error! No valid checkpoint found at \'%s\'.' % def_CHECKPOINT)
+		sys.exit()
+	return state
+
+def __terminate__( signum, frame ):
+	global terminate
+	terminate = True
+
+def trainStaged( network, nodes, training_set, every=None, cursor=(0,0), stats=None ):
+	"""
+	Train the given nodes one training phase at a time (as mdp.Flow.train
+	does). If requested, a checkpoint is written every <every> batches,
+	before every phase is closed, and after it was closed.
+	network     : Complete network, stored in the checkpoints.
+	nodes       : Nodes to train, i.e., the network or its lower part.
+	training_set: One reusable data slicer per node.
+	every       : No. of batches between two checkpoints within a phase, or
+	              None for no checkpoints.
+	cursor      : (node, batch) to continue from, as stored in a checkpoint.
+	stats       : Statistics object recording the SFA statistics of every
+	              phase before it is closed (see util/sfa_statistics.py).
+	"""
+	first, skip = cursor
+	for k in range( first, len(nodes) ):
+		node = nodes[k]
+		while node.is_training():
+			ping  = time.time()
+			batch = skip
+			training_set[k].skip, skip = skip, 0
+			for x in training_set[k]:
+				for n in nodes[:k]:
+					x = n.execute( x )
+				node.train( x )
+				batch += 1
+				if every != None and (terminate or batch % every == 0):
+					__writeCheckpoint__( network, k, batch, stats )
+				if every != None and terminate:
+					print('Training terminated; checkpoint written to \'%s\', use option \'resume\' to continue.' % def_CHECKPOINT)
+					sys.exit()
+			training_set[k].skip = 0
+			# closing a phase (i.e., solving the eigenproblems) may fail late
+			if every != None:
+				__writeCheckpoint__( network, k, batch, stats )
+			if stats != None:
+				stats.collect( node )
+			node.stop_training()
+			if every != None:
+				__writeCheckpoint__( network, k, 0, stats )
+			print('Trained network node %d (%s): %dsec' % (k, node.__class__.__name__, time.time()-ping))
+
+
+#=======================================================[ SFA Network Training ]
+
+def initNetwork( wide_fov=True, color=True, noise=False, pca_dim=None, arch=None, pca_oversample=ipca.def_OVERSAMPLE ):
+
+	# architecture: built-in wide or narrow angle setup, or as given
+	if arch == None:
+		arch = architecture.Architecture( wide_fov )
+
+	raw_data_dim_x           = arch.raw_data_dim_x
+	raw_data_dim_y           = arch.raw_data_dim_y
+
+	sfa_dim_red_factor       = arch.sfa_dim_red_factor	# output dimension of sfa nodes used for dimensionality reduction
+
+	sfa_lower_layer_field_x  = arch.sfa_lower_layer_field_x
+	sfa_lower_layer_field_y  = arch.sfa_lower_layer_field_y
+	sfa_lower_layer_node_out = arch.sfa_lower_layer_node_out	# output dimension of a single node of sfa clone layer A
+
+	sfa_upper_layer_field_x  = arch.sfa_upper_layer_field_x
+	sfa_upper_layer_field_y  = arch.sfa_upper_layer_field_y
+	sfa_upper_layer_node_out = arch.sfa_upper_layer_node_out	# output dimension of a single node of sfa clone layer B
+
+	sfa_top_node_out		 = arch.sfa_top_node_out		# output dimension of the single SFA node atop the hierarchy
+
+	#--------------------------------------------------------[ Lower SFA Layer ]
+
+	# raw data switchboard
+	raw_switchboard = mdp.hinet.Rectangular2dSwitchboard( in_channels_xy    = (raw_data_dim_x,raw_data_dim_y),
+														  field_channels_xy = (sfa_lower_layer_field_x,sfa_lower_layer_field_y),
+														  field_spacing_xy  = (arch.sfa_lower_layer_spacing_x,arch.sfa_lower_layer_spacing_y),
+														  in_channel_dim    = 3 if color else 1 )
+	# optional incremental PCA reducing every receptive field ahead of the first sfa node
+	pre_nodes = []
+	if pca_dim != None:
+		pre_nodes = [ ipca.IncrementalPCANode( input_dim=raw_switchboard.out_channel_dim, output_dim=pca_dim, dtype='float32', oversample=pca_oversample ) ]
+		print('Using an incremental PCA reducing every receptive field from %d to %d dimensions.' % (raw_switchboard.out_channel_dim,pca_dim))
+
+	# processing over-node for lower sfa layer
+	sfa_node_A = mdp.nodes.SFANode               ( input_dim=pca_dim if pca_dim != None else raw_switchboard.out_channel_dim, output_dim=sfa_dim_red_factor, dtype='float32' )
+	exp_node   = mdp.nodes.QuadraticExpansionNode( input_dim=sfa_dim_red_factor )
+	noise_node = mdp.nodes.NoiseNode             ( input_dim=exp_node.output_dim, output_dim=exp_node.output_dim, noise_args=(0,numpy.sqrt(0.05)) )
+	sfa_node_B = mdp.nodes.SFANode               ( input_dim=exp_node.output_dim, output_dim=sfa_lower_layer_node_out, dtype='float32' )
+
+	if noise:
+		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow(pre_nodes + [ sfa_node_A, exp_node, noise_node, sfa_node_B ]) )
+		print('Using noisy nodes.')
+	else:
+		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow(pre_nodes + [ sfa_node_A, exp_node, sfa_node_B ]) )
+
+	# lower clone layer
+	sfa_lower_layer = mdp.hinet.CloneLayer( sfa_over_node, n_nodes=raw_switchboard.output_channels )
+
+	#--------------------------------------------------------[ Upper SFA Layer ]
+	
+	# sfa data relay switchboard
+	sfa_switchboard = mdp.hinet.Rectangular2dSwitchboard( in_channels_xy    = raw_switchboard.out_channels_xy,
+														  field_channels_xy = (sfa_upper_layer_field_x, sfa_upper_layer_field_y),
+														  field_spacing_xy  = (arch.sfa_upper_layer_spacing_x,arch.sfa_upper_layer_spacing_y),
+														  in_channel_dim    = sfa_lower_layer_node_out )
+	# processing over-node for upper sfa layer 
+	sfa_node_X = mdp.nodes.SFANode				 ( input_dim=sfa_switchboard.out_channel_dim, output_dim=sfa_dim_red_factor, dtype='float32' )
+	exp_node   = mdp.nodes.QuadraticExpansionNode( input_dim=sfa_dim_red_factor )
+	noise_node = mdp.nodes.NoiseNode             ( input_dim=exp_node.output_dim, output_dim=exp_node.output_dim, noise_args=(0,numpy.sqrt(0.05)) )
+	sfa_node_Y = mdp.nodes.SFANode				 ( input_dim=exp_node.output_dim, output_dim=sfa_upper_layer_node_out, dtype='float32' )
+
+	if noise:
+		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_X, exp_node, noise_node, sfa_node_Y ]) )
+	else:
+		sfa_over_node  = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_X, exp_node, sfa_node_Y ]) )
+
+	# upper clone layer
+	sfa_upper_layer = mdp.hinet.CloneLayer( sfa_over_node, n_nodes=sfa_switchboard.output_channels )
+	
+	#-----------------------------------------------------------[ Top Layer(s) ]
+
+	# final sfa master node
+	sfa_node_U = mdp.nodes.SFANode				 ( input_dim=sfa_upper_layer.output_dim, output_dim=sfa_dim_red_factor, dtype='float32' )
+	exp_node   = mdp.nodes.QuadraticExpansionNode( input_dim=sfa_dim_red_factor )
+	noise_node = mdp.nodes.NoiseNode             ( input_dim=exp_node.output_dim, output_dim=exp_node.output_dim, noise_args=(0,numpy.sqrt(0.05)) )
+	sfa_node_V = mdp.nodes.SFANode				 ( input_dim=exp_node.output_dim, output_dim=sfa_top_node_out, dtype='float32' )
+
+	if noise:
+		sfa_over_node = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_U, exp_node, noise_node, sfa_node_V ]) )	
+	else:
+		sfa_over_node = mdp.hinet.FlowNode( mdp.Flow([ sfa_node_U, exp_node, sfa_node_V ]) )
+
+	sfa_network = mdp.Flow([ raw_switchboard,
+							 sfa_lower_layer,
+							 sfa_switchboard,
+							 sfa_upper_layer,
+							 sfa_over_node  ])
+	return sfa_network
+
+def trainNetwork( network, batch_size=None, add_ICA_layer=False, frame_override=None, generic=False, data_files=None, prefetch=0, workers=1, layer_wise=False, keep_cache=False, memory_budget=None, fold_fields=False, checkpoint=None, resume=None, stats=None, extend=False, frames_sweep=None, shards=None, remote_workers=False, field_subsample=None, view=None ):
+	
+	# report training parameters
+	if add_ICA_layer: print('Adding additional top level ICA node.')
+	if generic:       print('Training using generic sequence data.')
+
+	# data file(s)
+	datafile = openTrainingData( data_files, generic, view )
+	if len(datafile.files) > 1:
+		print('Training using %d data files as one data set (%s).' % (len(datafile.files), ', '.join(data_files)))
+
+	# data header
+	frames       = datafile.frames		# no. of image frames
+	frame_dim_x  = datafile.width		# width (in px) of a single frame
+	frame_dim_y  = datafile.height		# height of a single frame
+	raw_data_dim = datafile.channels	# color dimension (greyscale/RGB)
+
+	# one network per frame count: train with the largest one
+	if frames_sweep != None:
+		if max(frames_sweep) > frames:
+			print('Error! The frame sweep exceeds the %d available frames.' % frames)
+			sys.exit()
+		frame_override = max( frames_sweep ) if max( frames_sweep ) < frames else None
+		print('Frame sweep: training networks for %s frames in a single run.' % ', '.join([str(n) for n in frames_sweep]))
+
+	# manual frame override?
+	if frame_override != None:
+		if frame_override < frames: 
+			frames = frame_override
+			datafile.limit( frames )
+			print('Frame override: training with', frames, 'frames only.')
+		else:
+			print('Warning! Given frame override value is invalid and will be ignored.')
+
+	# color mode
+	if datafile.view == 'L': print('Training with the greyscale view of the RGB data.')
+	elif datafile.view != None: print('Training with the \'%s\' channel view of the RGB data.' % datafile.view)
+	if raw_data_dim == 1: print('Color mode is greyscale.')
+	if raw_data_dim == 3: print('Color mode is RGB color.')
+	if raw_data_dim != 1 and raw_data_dim != 3:
+		print('Error! Unknown color mode: ', raw_data_dim)
+		return None
+
+	#------------------------------------------------[ Add Sparse Coding Layer ]
+
+	if add_ICA_layer and resume == None:
+		if len(network) == 6: 
+			print('Warning! Top ICA layer already part of the network.')
+		else:
+			top_lvl  = network[ len(network)-1 ]
+			ica_node = mdp.nodes.CuBICANode( input_dim=top_lvl.output_dim, dtype='float32' )
+			network.append( ica_node )
+
+	#--------------------------------------------------------[ Extend Training ]
+
+	# the final SFA node continues from its stored statistics (unless resumed
+	# from a checkpoint, which already holds the continued node)
+	if extend and resume == None:
+		print('Extending the training of %d frames with %d new frames.' % (stats.frames, frames))
+		if stats.reopen() == None:
+			print('Error! The statistics file does not hold the final SFA node of the network.')
+			sys.exit()
+		if network[-1].is_training() == False:
+			print('Warning! The top ICA node is kept as it is.')
+
+	#---------------------------------------------------------------[ Get Data ]
+
+	# the data file is memory-mapped: frames are read from disk on demand and
+	# converted batch by batch (see getReusableDataSlicer)
+	print('Training data:', frames, 'frames of', frame_dim_x, 'x', frame_dim_y, 'px images (memory-mapped).')
+
+	#----------------------------------------------------------[ Memory Budget ]
+
+	if memory_budget != None:
+		stages = estimate.stageMemory( network[0:4] if generic else network )
+		budget = memory_budget*estimate.def_MB
+		for (k, per_frame, fixed) in stages:
+			print('Estimated memory for training node %d (%s): %.1f MB + %.2f MB per frame.' % \
+			      (k, network[k].__class__.__name__, fixed/estimate.def_MB, per_frame/estimate.def_MB))
+		size = estimate.batchSize( stages, budget, workers, 0 if workers > 1 or layer_wise else prefetch,
+		                           frame_dim_x*frame_dim_y*raw_data_dim )
+		if size == None:
+			print('Warning! No node left to train; memory_budget is ignored.')
+		elif size < 2:
+			print('Error! The memory budget of %d MB is too small to train the network.' % memory_budget)
+			sys.exit()
+		elif batch_size == None or size < batch_size:
+			batch_size = size
+			print('Memory budget of %d MB: using batches of %d frames.' % (memory_budget,batch_size))
+
+	#-------------------------------------------------------[ Network Training ]
+
+	# frame sweeps train all networks in the same process
+	if frames_sweep != None:
+		if workers > 1:
+			print('Warning! Option workers is not supported by frame sweeps and will be ignored.')
+			workers = 1
+		if checkpoint != None or stats != None:
+			print('Warning! Options checkpoint and keep_stats are not supported by frame sweeps and will be ignored.')
+			checkpoint, stats = None, None
+
+	# distributed training replaces the local training modes
+	if shards != None:
+		if layer_wise or workers > 1 or checkpoint != None or frames_sweep != None:
+			print('Warning! Options layerwise, workers, checkpoint, and frames_sweep are not supported by distributed training and will be ignored.')
+			layer_wise, workers, checkpoint, frames_sweep = False, 1, None, None
+
+	# statistics are recorded by the staged training loop only
+	if stats != None and shards == None and (layer_wise or workers > 1):
+		print('Warning! Options keep_stats and extend require the default training; options layerwise and workers are ignored.')
+		layer_wise, workers = False, 1
+
+	# batch processing
+	n_batches = len( list( getReusableBatchRanges(datafile,batch_size) ) )
+	if n_batches == 1:
+		print('Single file processing: using full data set for single training phase.')
+	elif batch_size == None:
+		print('Batch processing: training %d batches (one per data file).' % n_batches)
+	else:
+		print('Batch processing: training %d batches holding up to %d frames each.' % ( n_batches, batch_size ))
+
+	if shards != None:
+		print('Distributed training with %d shards via folder \'%s\'%s.' % \
+		      (shards, def_DISTRIBUTED, '' if remote_workers else ' (local worker processes)'))
+	elif layer_wise:
+		print('Layer-wise training using cached layer outputs.')
+	elif workers > 1:
+		print('Parallel training using %d worker processes.' % workers)
+	elif prefetch > 0:
+		print('Prefetching up to %d batches in the background.' % prefetch)
+
+	# checkpoints are written by the staged training loop only
+	if checkpoint != None and (layer_wise or workers > 1):
+		print('Warning! Checkpoints are not supported by layer-wise or parallel training; option \'checkpoint\' is ignored.')
+		checkpoint = None
+	if checkpoint != None:
+		print('Writing a checkpoint every %d batches and after every training phase.' % checkpoint)
+		signal.signal( signal.SIGTERM, __terminate__ )
+
+	# clone layers train their shared node on all receptive fields of a batch at
+	# once (the lower clone layer possibly on a random subset of its fields)
+	if fold_fields or field_subsample != None:
+		if workers > 1:
+			print('Warning! fold_fields and field_subsample are not supported by parallel training and will be ignored.')
+			fold_fields, field_subsample = False, None
+		if field_subsample != None:
+			print('Training the lower clone layer on %.1f%% of its receptive fields per batch.' % (100.0*field_subsample))
+			clone_layer.install( [network[1]], field_subsample )
+		if fold_fields:
+			print('Training clone layers on all receptive fields at once.')
+			clone_layer.install( network )
+
+	ping = time.time()
+
+	# training set data slicers
+	training_set = []
+	for i in range(4 if generic else len(network)):
+		if layer_wise or workers > 1 or frames_sweep != None or shards != None: training_set.append( getReusableBatchRanges(datafile,batch_size) )
+		elif prefetch > 0:            training_set.append( getPrefetchingDataSlicer(datafile,batch_size,prefetch) )
+		else:                         training_set.append( getReusableDataSlicer(datafile,batch_size) )
+
+	# frame sweep: one network per frame count, sharing the first training phase
+	if frames_sweep != None:
+		networks = frame_sweep.trainSweep( network, len(training_set), datafile, lambda d: getReusableBatchRanges(d,batch_size), frames_sweep,
+		                                   layer_wise, './current_experiment/cache', keep_cache )
+
+	# distributed training: workers train shards of the data, statistics are joined per phase
+	elif shards != None:
+		distributed.trainDistributed( network[0:len(training_set)], datafile, training_set[0], shards,
+		                              def_DISTRIBUTED, not remote_workers, stats )
+		if stats != None: stats.frames += frames
+
+	# layer-wise training: each node is trained from the cached output of the nodes below
+	elif layer_wise:
+		layerwise.trainLayerwise( network[0:len(training_set)], datafile, training_set[0],
+		                          './current_experiment/cache', keep_cache )
+
+	# parallel training: worker processes read their batches from the data file(s)
+	elif workers > 1:
+		parallel_training.trainParallel( network[0:len(training_set)], training_set,
+		                                 [ os.path.abspath(f.filename) for f in datafile.files ], workers, view )
+
+	# staged training with checkpoints and/or recorded SFA statistics
+	elif checkpoint != None or stats != None:
+		trainStaged( network, network[0:len(training_set)], training_set, checkpoint,
+		             resume if resume != None else (0,0), stats )
+		if stats != None: stats.frames += frames
+
+	# default training
+	elif not generic: network.train( training_set )
+
+	# low level training
+	else:
+		lower_layers = mdp.Flow([ network[0],
+								  network[1],
+								  network[2],
+								  network[3] ])
+		lower_layers.train( training_set )
+
+	for net in ( networks.values() if frames_sweep != None else [network] ):
+		if fold_fields or field_subsample != None:
+			clone_layer.uninstall( net )
+
+	print('Complete network training time: %dsec / %dmin' % (time.time()-ping, (time.time()-ping)/60.0))
+
+	# pre-reduction of the lower layer fields
+	lower = network[1].node._flow[0]
+	if frames_sweep == None and isinstance( lower, mdp.nodes.PCANode ) and lower.explained_variance != None:
+		print('Incremental PCA: %d of %d dimensions per receptive field keep %.2f%% of the variance.' % \
+		      (lower.output_dim, lower.input_dim, 100.0*lower.explained_variance))
+
+	# quality of a network trained on subsampled fields
+	if field_subsample != None and frames_sweep == None:
+		delta = networkSlowness( network[0:len(training_set)], datafile, getReusableBatchRanges(datafile,batch_size) )
+		print('Slowness of the trained network (delta values of the output signals):')
+		print('\tfirst five: %s, mean: %.5f' % (' '.join(['%.5f' % d for d in delta[:5]]), delta.mean()))
+	
+	# clean up data by nulling the only reference made
+	datafile = None
+
+	# frame sweep: all networks by frame count
+	if frames_sweep != None:
+		return networks
+	return network
+
+
+#=======================================================================[ Main ]
+
+def main():
+
+	# check command line arguments
+	if '-h' in sys.argv or 'h' in sys.argv or '--help' in sys.argv or 'help' in sys.argv:
+		printHelp()
+		sys.exit()
+
+	# worker of a distributed training: network, data, and batches are taken from the shared folder
+	if 'shard' in sys.argv:
+		distributed.runWorker( def_DISTRIBUTED, int(sys.argv[sys.argv.index('shard')+1]) )
+		sys.exit()
+
+	# continue from checkpoint: all other options are taken from the checkpoint
+	state = None
+	if 'resume' in sys.argv:
+		state    = __readCheckpoint__()
+		sys.argv = sys.argv[:1] + state['argv'] + ['resume']
+		print('Resuming training at network node %d after %d batches.' % (state['node'],state['batch']))
+
+	#--------------------------------------------------------------[ Data Info ]
+
+	data_files = None
+	view       = None
+	for i, arg in enumerate(sys.argv):
+		if arg == 'data': data_files = sys.argv[i+1].split(',')
+		if arg == 'view': view       = sys.argv[i+1]
+
+	# online training: the frame format is taken from the simulator's stream,
+	# the data file is written while the first phase is trained
+	ring = None
+	if 'stream' in sys.argv:
+		for option in [ 'file', 'extend', 'resume', 'frames', 'frames_sweep', 'generic', 'estimate' ]:
+			if option in sys.argv:
+				print('Error! Option \'stream\' can not be combined with option \'%s\'.' % option)
+				sys.exit()
+		if data_files != None and len(data_files) > 1:
+			print('Error! Option \'stream\' writes a single data file.')
+			sys.exit()
+		ring = stream.attach()
+		frames = None
+		frame_dim_x, frame_dim_y, raw_data_dim = ring.shape()
+		print('Training online from the frames streamed by the simulator (%dx%d px).' % (frame_dim_x,frame_dim_y))
+		if view != None and view != 'RGB':
+			try:
+				if raw_data_dim != 3: raise ValueError( 'Views (\'%s\') require RGB frames.' % view )
+				raw_data_dim = sequence.viewChannels( view )
+			except ValueError as e:
+				print('Error!', e)
+				sys.exit()
+	else:
+		datafile = openTrainingData( data_files, 'generic' in sys.argv, view )
+
+		frames       = datafile.frames		# no. of image frames
+		frame_dim_x  = datafile.width		# width (in px) of a single frame
+		frame_dim_y  = datafile.height		# height of a single frame
+		raw_data_dim = datafile.channels	# color dimension (greyscale/RGB)
+
+	#----------------------------------------------------[ Training Parameters ]
+
+	use_wide_fov = True if frame_dim_x==320 else False
+	use_color    = True if raw_data_dim==3  else False
+
+	if raw_data_dim != 1 and raw_data_dim != 3:
+		print('Error! Networks are built for greyscale or RGB frames, not for %d color channels.' % raw_data_dim)
+		sys.exit()
+
+	generic        = 'generic' in sys.argv
+	noisy_nodes    = ('noise' in sys.argv)
+	pca_dim        = None
+	pca_oversample = ipca.def_OVERSAMPLE
+	add_ICA        =  ('ICA' in sys.argv)
+
+	batch_size     = None
+	frame_override = None
+	tsn_file       = None
+	prefetch       = 0
+	workers        = 1
+	layer_wise     = 'layerwise'  in sys.argv
+	keep_cache     = 'keep_cache' in sys.argv
+	memory_budget  = None
+	fold_fields    = 'fold_fields' in sys.argv
+	checkpoint     = None
+	keep_stats     = 'keep_stats' in sys.argv
+	extend         = 'extend' in sys.argv
+	frames_sweep   = None
+	shards         = None
+	remote_workers = 'remote_workers' in sys.argv
+	field_subsample = None
+	arch_file      = None
+	for i, arg in enumerate(sys.argv):
+		if arg == 'batch_size': batch_size     = int(sys.argv[i+1])
+		if arg == 'frames':     frame_override = int(sys.argv[i+1])
+		if arg == 'file':       tsn_file       = sys.argv[i+1]
+		if arg == 'prefetch':   prefetch       = int(sys.argv[i+1])
+		if arg == 'workers':    workers        = int(sys.argv[i+1])
+		if arg == 'memory_budget': memory_budget = int(sys.argv[i+1])
+		if arg == 'checkpoint': checkpoint     = int(sys.argv[i+1])
+		if arg == 'frames_sweep': frames_sweep = sorted( [ int(n) for n in sys.argv[i+1].split(',') ] )
+		if arg == 'shards':     shards         = int(sys.argv[i+1])
+		if arg == 'field_subsample': field_subsample = float(sys.argv[i+1])
+		if arg == 'pca_dim':    pca_dim        = int(sys.argv[i+1])
+		if arg == 'pca_oversample': pca_oversample = int(sys.argv[i+1])
+		if arg == 'arch':       arch_file      = sys.argv[i+1]
+
+	if field_subsample != None and (field_subsample <= 0.0 or field_subsample > 1.0):
+		print('Error! The fraction of field_subsample has to be within (0;1].')
+		sys.exit()
+
+	# streamed batches have to fit into the ring buffer (with two frames to spare)
+	if ring != None:
+		if batch_size == None:
+			batch_size = ring.capacity()//2
+			print('Streaming requires batches: using batches of %d frames.' % batch_size)
+		elif batch_size+2 > ring.capacity():
+			print('Error! Streamed batches can hold at most %d frames (the stream buffer holds %d).' % (ring.capacity()-2,ring.capacity()))
+			sys.exit()
+
+	#---------------------------------------------------------[ Set Up Network ]
+
+	if extend and 'file' not in sys.argv:
+		print('Error! Option \'extend\' requires a trained network given via option \'file\'.')
+		sys.exit()
+
+	if 'file' in sys.argv:
+		# filename shortcut?
+		if tsn_file == '-':
+			for f in os.listdir( './current_experiment' ):
+				if '.tsn' in f: tsn_file = f
+		if tsn_file == '-':
+			print('Error! No .tsn file was found in folder \'./current_experiment\'.')
+		# open file
+		try:
+			print('Loading network from file \'%s\'' % tsn_file)
+			network = open( './current_experiment/'+tsn_file, 'rb' )
+		except:
+			print('Error opening SFA network file.')
+			sys.exit()
+		# extract network
+		network    = pickle.load( network )
+		stats_file = tsn_file[:len(tsn_file)-4]+'.stats'
+		if extend:
+			tsn_file  = tsn_file[:len(tsn_file)-4]
+			tsn_file += '_extended.tsn'
+		if add_ICA:
+			tsn_file  = tsn_file[:len(tsn_file)-4]
+			tsn_file += '_ICA.tsn'
+
+	# initialize new network
+	else:
+		arch = architecture.Architecture( use_wide_fov )
+		if arch_file != None:
+			try:
+				arch.load( './current_experiment/'+arch_file )
+			except (IOError, ValueError) as e:
+				print('Error! Architecture spec file could not be read: %s' % e)
+				sys.exit()
+			if (arch.raw_data_dim_x,arch.raw_data_dim_y) != (frame_dim_x,frame_dim_y):
+				print('Error! The architecture expects %dx%d px images, the data holds %dx%d px frames.' % \
+				      (arch.raw_data_dim_x,arch.raw_data_dim_y,frame_dim_x,frame_dim_y))
+				sys.exit()
+			print('Using the network architecture of spec file \'%s\'.' % arch_file)
+		try:
+			network = initNetwork( wide_fov = use_wide_fov,
+								   color    = use_color,
+								   noise    = noisy_nodes,
+								   pca_dim  = pca_dim,
+								   arch     = arch,
+								   pca_oversample = pca_oversample )
+		except mdp.hinet.SwitchboardException as e:
+			print('Error! The receptive fields of the architecture do not fit: %s' % e)
+			sys.exit()
+
+	# raw SFA statistics to continue training from, or to be recorded
+	stats = None
+	if extend:
+		try:
+			stats = sfa_statistics.load( './current_experiment/'+stats_file, network )
+		except:
+			print('Error! No statistics file \'%s\' found for the given network. Train the' % stats_file)
+			print('       network with option \'keep_stats\' to be able to extend it later.')
+			sys.exit()
+	elif keep_stats:
+		stats = sfa_statistics.Statistics( network )
+
+	# partially trained network from checkpoint
+	if state != None:
+		network = state['network']
+		stats   = state['stats']
+
+	if network[0].in_channel_dim != raw_data_dim:
+		print('Error! The network expects frames of %d color channels, the training data holds %d.' % (network[0].in_channel_dim,raw_data_dim))
+		sys.exit()
+
+	print('Network state before training:')
+	printNetworkState( network )
+
+	# cost estimate only: no training data is read
+	if 'estimate' in sys.argv:
+		nodes = list( network[0:4] if generic else network )
+		if add_ICA and len(nodes) == 5:
+			nodes.append( mdp.nodes.CuBICANode( input_dim=nodes[-1].output_dim, dtype='float32' ) )
+		printEstimate( nodes, frame_override if frame_override != None and frame_override < frames else frames, batch_size )
+		sys.exit()
+
+	#---------------------------------------------------------------[ Training ]
+
+	# per node instrumentation (see util/profiler.py)
+	prof = None
+	if 'profile' in sys.argv:
+		prof = profiler.Profiler()
+		prof.start()
+
+	try:
+		# first training phase online, while the simulator runs
+		if ring != None:
+			frames = stream.trainOnline( network, ring, './current_experiment/'+(data_files[0] if data_files != None else 'sequence_data'),
+			                             batch_size, stats, view )
+		trained = trainNetwork( network, batch_size, add_ICA, frame_override, generic, data_files, prefetch, workers, layer_wise, keep_cache, memory_budget, fold_fields,
+		                        checkpoint, (state['node'],state['batch']) if state != None else None, stats, extend, frames_sweep,
+		                        shards, remote_workers, field_subsample, view )
+	finally:
+		if prof != None:
+			prof.stop()
+
+	if prof != None:
+		print('\nProfile of all node calls (times and allocations include inner nodes):')
+		print( '\n'.join(prof.report(network,def_PROFILE)) )
+		print('Profile stored to files \'%s.json\' and \'%s.txt\'.' % (def_PROFILE,def_PROFILE))
+
+	print('\nNetwork state after training:')
+	printNetworkState( network )
+
+	#--------------------------------------------------------[ Save and Return ]
+
+	# frame sweep: one network per frame count
+	if frames_sweep != None:
+		results = sorted( trained.items() )
+	else:
+		results = [ (frame_override, network) ]
+
+	for (frame_count, network) in results:
+		filename = tsn_file
+
+		if filename == None:
+			filename = 'network_x' + ( str(frame_count) if frame_count != None else str(frames) )
+			if generic:       filename += '_generic'
+			if use_color:     filename += '_color'
+			else:             filename += '_greyscale'
+			if view != None and view not in ('L','RGB'): filename += '_' + view
+			if noisy_nodes:   filename += '_noise'
+			if add_ICA:       filename += '_ICA'
+			filename += '.tsn'
+		elif frames_sweep != None:
+			filename = filename[:len(filename)-4] + '_x' + str(frame_count) + '.tsn'
+
+		network.save( ('./current_experiment/'+filename) )
+		print('Trained SFA network stored to file \'./current_experiment/%s\'' % filename)
+
+	if stats != None and frames_sweep == None:
+		stats.save( './current_experiment/'+filename[:len(filename)-4]+'.stats' )
+		print('SFA statistics of %d frames stored to file \'./current_experiment/%s\'' % (stats.frames, filename[:len(filename)-4]+'.stats'))
+
+	# the training is complete: its checkpoint would only restart it
+	if (checkpoint != None or state != None) and os.path.exists( def_CHECKPOINT ):
+		os.remove( def_CHECKPOINT )
+		print('Removed checkpoint \'%s\' of the completed training.' % def_CHECKPOINT)
+
+#-----------------------------------------------------------------------[ Help ]
+
+def printHelp():
+	print('================================================================================')
+	print('RatLab training help                                                            ')
+	print('--------------------------------------------------------------------------------')
+	print('This program trains a SFA hierarchy network and stores the trained network as a')
+	print('.tsn file (Trained Sfa Network) to disk under the default name:')
+	print('  \'network_xSTEPS_MODE.tsn\'')
+	print('Where STEPS denotes the number of input samples the network was trained with,')
+	print('and MODE is either \'color\' or \'greyscale\' to indicate which kind of input')
+	print('data the network expects when used for sampling. These parameters are read ')
+	print('directly from the input data, which this program assumes to be found within an')
+	print('existing \'sequence_data\' file that was previously generated by convert.py.\n')
+	print('--------------------------------------------------------[ Command Line Options ]\n')
+	print('batch_size <count>')
+	print('          If specified, the network will be trained with batches of data instead')
+	print('          of using all available data at once. If <count> does not evenly divide')
+	print('          the number of frames, the last batch holds the remaining frames (a')
+	print('          single remaining frame is added to the preceding batch).\n')
+	print('memory_budget <MB>')
+	print('          Estimate the memory required per frame by every training stage of the')
+	print('          network (switchboard fan-out, quadratic expansions of all receptive')
+	print('          fields, covariance matrices, parallel workers, and prefetched batches)')
+	print('          and choose the largest batch size that keeps training within <MB>')
+	print('          megabytes. A given batch_size is only reduced to fit the budget.\n')
+	print('fold_fields')
+	print('          Train the shared node of each clone layer on all receptive fields of a')
+	print('          batch at once, i.e., with a few large matrix products instead of one')
+	print('          small update per field (see util/clone_layer.py). Time derivatives')
+	print('          are still taken within each field. Quadratic expansions are computed')
+	print('          and accumulated in small tiles, so their memory does not grow with')
+	print('          the batch size. Not used with parallel workers.\n')
+	print('field_subsample <fraction>')
+	print('          Train the shared node of the lower clone layer on a random subset of')
+	print('          its receptive fields only (e.g., 0.1 for 10%), drawn anew for every')
+	print('          batch from a fixed seed. Neighbouring fields overlap by half, so the')
+	print('          subset still covers most of the image. The training cost of the')
+	print('          lower layer drops in proportion; the slowness (delta values) of the')
+	print('          trained network is reported to judge the loss of quality (use 1.0')
+	print('          for a reference). Implies the folded training of fold_fields for')
+	print('          the lower layer. Not used with parallel workers.\n')
+	print('frames <n>')
+	print('          If specified, the network will be trained with <n> frames only, even if')
+	print('          the sequence data file contains additional frames. This can be used to')
+	print('          record <x> frames and train various networks with <x-y> frames to see')
+	print('          the difference made by the additional <y> frames.\n')
+	print('frames_sweep <n>,<n>,...')
+	print('          Train one network for each of the given frame counts (i.e., using the')
+	print('          first <n> frames) in a single run, storing one .tsn file each. The')
+	print('          first training phase is shared by all networks: it sees the data once')
+	print('          and the partially trained network is copied whenever a frame count is')
+	print('          reached. All later phases read every batch once and train it into all')
+	print('          networks whose frame count includes it (or use layerwise training per')
+	print('          network). Every network sees the same batches as a separate run with')
+	print('          option frames <n> (see tools/sweep_check.py).\n')
+	print('data <file>,<file>,...')
+	print('          Train with the given comma separated list of sequence data files found')
+	print('          in the \'./current_experiment\' folder instead of \'sequence_data\'. The')
+	print('          files are used as a single data set without being copied. Batches and')
+	print('          the temporal derivatives used by SFA never span two files.\n')
+	print('view <L|channels>')
+	print('          Train with a view of RGB sequence data computed batch by batch: \'L\'')
+	print('          for greyscale (luma as by PIL\'s convert(\'L\'), i.e., the same frames')
+	print('          as a greyscale recording), or a subset of the channels \'R\', \'G\',')
+	print('          and \'B\' (e.g., \'G\'). One RGB recording thus serves greyscale and')
+	print('          color networks alike, without a duplex recording. Networks are built')
+	print('          for the resulting color dimension (single channel views give')
+	print('          greyscale networks and the file name tag \'_greyscale_<channel>\').')
+	print('          Sample such networks with the same view (see sample.py).\n')
+	print('pca_dim <n>')
+	print('          Reduce every receptive field of the lower layer to <n> dimensions by')
+	print('          an incremental PCA (see util/ipca.py) ahead of its first SFA node.')
+	print('          The PCA is trained in a streaming first pass over the data without')
+	print('          accumulating a covariance matrix, and shrinks the covariance matrices')
+	print('          and whitening of the lowest SFA node (e.g., 240x240 for wide color')
+	print('          data). The variance kept by the <n> components is reported. Only')
+	print('          used for new networks.\n')
+	print('pca_oversample <k>')
+	print('          Keep only <k> times <n> components while training the incremental')
+	print('          PCA instead of all of them. This bounds its memory for large fields,')
+	print('          but makes the PCA an approximation whose error depends on the data')
+	print('          (see tools/ipca_check.py). [Default: all components, i.e., exact]\n')
+	print('arch <file>')
+	print('          Build the network from the architecture spec file <file> found in the')
+	print('          \'./current_experiment\' folder instead of the built-in wide or narrow')
+	print('          angle setup (see util/architecture.py and the example in the tools')
+	print('          folder). Every line sets one parameter (e.g., the receptive field size')
+	print('          of a layer or the output dimension of its nodes); parameters not')
+	print('          given keep their built-in values. Only used for new networks.\n')
+	print('estimate  Do not train, but print the estimated cost of every training phase of')
+	print('          the network: flops per frame for executing the layers below and for')
+	print('          training the node, size of its covariance matrices, and peak memory')
+	print('          per batch. The flop rate of each phase is measured by briefly')
+	print('          training a copy of its node on random data, which projects the')
+	print('          time of every phase and of the whole training. Use together with')
+	print('          the options of the intended training run (e.g., batch_size, frames,')
+	print('          arch, or pca_dim).\n')
+	print('profile   Record wall time, processed frames (and frames per second), memory')
+	print('          allocated, and peak resident memory of every train, stop_training,')
+	print('          and execute call of every node of the network, including the inner')
+	print('          nodes of its layers. A table per node is printed after training and')
+	print('          stored, together with a JSON report, as \'train_profile.txt/.json\'')
+	print('          in the \'./current_experiment\' folder. Calls in worker processes')
+	print('          (workers, shards) are not recorded. Without this option no node is')
+	print('          instrumented. See tools/profile_check.py for a coverage check.\n')
+	print('stream    Train while the simulator runs: the frames recorded by \'python')
+	print('          ratlab.py record stream\' are passed via a ring buffer in shared')
+	print('          memory (see util/stream.py), the first training phase is trained')
+	print('          from them as they arrive, and they are written to the data file')
+	print('          (\'sequence_data\', or the file given via data) on the way. The')
+	print('          remaining phases are trained from the file once the simulation has')
+	print('          finished. The simulation waits while the buffer is full. Batches')
+	print('          are required; the batch size defaults to half the buffer. Not')
+	print('          available for existing networks, frame limits, or generic data.\n')
+	print('ICA       This optional parameter tells the network to add an additional layer of')
+	print('          sparse coding (implemented via an ICA node) at the top of the network.\n')
+	print('noise     This optional parameter tells the network to inlude additional nodes')
+	print('          that add random noise to the processed data. This may help in case')
+	print('          the trainig phase crashes due to singular matrices. (Note: this may')
+	print('          also be helped by training with more data, i.e., moretime steps.) If')
+	print('          no custom file name is provided, the default filename is extended by')
+	print('          a \'_noise\' tag.\n')
+	print('---------------------------------------------------[ Advanced Training Options ]\n')
+	print('generic   Train the lower layers of the network with the generic training data')
+	print('          \'sequence_data_generic\' instead of the simulation data. The file is')
+	print('          either a converted image sequence or a crop set written by')
+	print('          tools/snip.py, whose frames are cut out of the source images (or')
+	print('          their decoded cache) batch by batch while training.\n')
+	print('add_ICA <file>')
+	print('          If this parameter is set, no new network is being trained. Instead')
+	print('          <file> is expected to be the name of a .tsn file that contains a')
+	print('          network which already has been trained beforehand but does not yet')
+	print('          include an additional ICA layer. The network will be extended by an')
+	print('          additional ICA node which is then trained as usual. The resulting')
+	print('          network will be stored in a new file using the original name plus an')
+	print('          additional \'_ICA\' suffix.')
+	print('          NOTE: The filename can be replaced by a simple \'-\' in which case the')
+	print('          first found .tsn file in the \'current_experiment\' folder will be used.\n')
+	print('prefetch <k>')
+	print('          Read and convert the next <k> batches in background threads while the')
+	print('          network trains on the current batch, overlapping disk access with the')
+	print('          training computations. Requires <k> additional batches of memory.')
+	print('          [Default: 0, i.e., no prefetching]\n')
+	print('workers <n>')
+	print('          Train the network in parallel using <n> worker processes. Every batch')
+	print('          is trained by a copy of the current node within one of the workers,')
+	print('          and the copies are merged before the node\'s training is finished.')
+	print('          The workers read their batches from the data file(s) themselves, so')
+	print('          use batch_size to provide enough batches for all workers. Option')
+	print('          prefetch is ignored in this mode. [Default: 1]\n')
+	print('layerwise Train the network node by node. Once a node is trained, the output of')
+	print('          all nodes so far is computed once for the whole data set and stored in')
+	print('          a memory-mapped cache file in \'./current_experiment/cache\'. The next')
+	print('          node is trained from this cache instead of executing all lower nodes')
+	print('          again for every training phase. Options prefetch and workers are')
+	print('          ignored in this mode.\n')
+	print('keep_cache')
+	print('          Keep the cache files of layer-wise training (including the output of')
+	print('          the complete network) for later runs. Cache files are only reused for')
+	print('          identical nodes and data, e.g., when adding an ICA layer to a trained')
+	print('          network via \'file <name> ICA layerwise\' only the ICA node is trained.\n')
+	print('checkpoint <n>')
+	print('          Store the partially trained network, including the statistics of the')
+	print('          node being trained and the number of batches it has seen, in the file')
+	print('          \'./current_experiment/train_checkpoint\' every <n> batches and after')
+	print('          every training phase (also right before a phase is closed, so a late')
+	print('          crash does not lose the phase). A checkpoint is also written when the')
+	print('          program is terminated by a SIGTERM signal (e.g., by a batch queue).')
+	print('          The checkpoint is removed once the trained network is stored. Not')
+	print('          available with options layerwise and workers.\n')
+	print('resume    Continue an interrupted training from its last checkpoint, starting')
+	print('          at the exact batch. All other options are taken from the checkpoint.\n')
+	print('keep_stats')
+	print('          Store the raw statistics accumulated by all SFA nodes (sums of the')
+	print('          covariance and derivative covariance matrices) in a \'.stats\' file')
+	print('          next to the trained network, so its training can be extended later.\n')
+	print('extend    Continue the training of the network given via \'file <name>\' with')
+	print('          the frames of the current data set only (e.g., \'data <new file>\'):')
+	print('          the final SFA node adds them to the statistics stored by keep_stats')
+	print('          and solves its eigenproblem again, exactly as if it was trained with')
+	print('          all frames at once. All lower nodes are kept, since the statistics of')
+	print('          the nodes above would no longer match their changed output. A top')
+	print('          ICA node is kept as well. The result (and its updated statistics) is')
+	print('          stored with an additional \'_extended\' suffix.\n')
+	print('shards <n>')
+	print('          Distributed training: the frames are divided into <n> shards, each')
+	print('          trained by its own worker process. For every training phase the')
+	print('          network is written to the shared folder \'./current_experiment/')
+	print('          distributed\', each worker trains the current node with its shard and')
+	print('          writes back its partial statistics, and these are summed up before')
+	print('          the phase is finished (a batch split by a shard boundary keeps its')
+	print('          time derivative across the boundary, so the result equals training')
+	print('          without shards). Nodes without mergeable statistics (ICA) are trained')
+	print('          by the main process. Options layerwise, workers, checkpoint, and')
+	print('          frames_sweep are ignored in this mode.\n')
+	print('remote_workers')
+	print('          Do not start the <n> workers of option shards as local processes; they')
+	print('          are started on machines sharing the ratlab folder via:')
+	print('            $ python train.py shard <i>    (for i = 0,...,n-1)')
+	print('          from within the ratlab folder, after the main process was started.\n')
+	print('--------------------------------------------------------------------[ Examples ]\n')
+	print('Train the network with an additional sparse coding step and store it as \'data.tsn\'')
+	print('     $ python train.py sparse file data.tsn')
+	print('================================================================================')
+
+if __name__ == '__main__':
+	main() # <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<   <<<[ main ]
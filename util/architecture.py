@@ -0,0 +1,101 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+
+#===============================================================[ Architecture ]
+
+class Architecture( Freezeable ):
+	"""
+	Parameters of the SFA hierarchy built by train.initNetwork: size of the
+	input images, receptive fields (size and spacing, in nodes of the layer
+	below) of the lower and the upper clone layer, and output dimensions of
+	the SFA nodes. The built-in setups are those for wide (320x40) and narrow
+	(55x35) images; any parameter can be changed via a spec file (see load).
+	"""
+
+	def __init__( self, wide_fov=True ):
+		"""
+		Constructor. Sets up one of the built-in architectures.
+		wide_fov: Wide (True) or narrow angle setup.
+		"""
+		# wide angle setup
+		if wide_fov:
+			self.raw_data_dim_x           = 320
+			self.raw_data_dim_y           =  40
+			self.sfa_dim_red_factor       =  32    # output dimension of sfa nodes used for dimensionality reduction
+			self.sfa_lower_layer_field_x  =  10    # 10x8x1=80 -> dimension of a single output channel of raw switchboard
+			self.sfa_lower_layer_field_y  =   8    # (63x9=567 output channels with the default spacing)
+			self.sfa_lower_layer_node_out =  32    # output dimension of a single node of sfa clone layer A
+			self.sfa_upper_layer_field_x  =  14    # 14x6x16=1344 -> dimensions of a single output channel of the sfa switchboard
+			self.sfa_upper_layer_field_y  =   6    # (8x2 output channels with the default spacing)
+			self.sfa_upper_layer_node_out =  32    # output dimension of a single node of sfa clone layer B
+			self.sfa_top_node_out         =  32    # output dimension of the single SFA node atop the hierarchy
+		# narrow angle setup
+		else:
+			self.raw_data_dim_x           =  55
+			self.raw_data_dim_y           =  35
+			self.sfa_dim_red_factor       =  32
+			self.sfa_lower_layer_field_x  =  10
+			self.sfa_lower_layer_field_y  =  10
+			self.sfa_lower_layer_node_out =  32
+			self.sfa_upper_layer_field_x  =   4
+			self.sfa_upper_layer_field_y  =   2
+			self.sfa_upper_layer_node_out =  32
+			self.sfa_top_node_out         =  32
+		# receptive fields overlap by half
+		self.sfa_lower_layer_spacing_x = self.sfa_lower_layer_field_x//2
+		self.sfa_lower_layer_spacing_y = self.sfa_lower_layer_field_y//2
+		self.sfa_upper_layer_spacing_x = self.sfa_upper_layer_field_x//2
+		self.sfa_upper_layer_spacing_y = self.sfa_upper_layer_field_y//2
+		self.freeze()
+
+	def load( self, filename ):
+		"""
+		Change parameters as given by a spec file. Every line holds a
+		parameter name (as the attributes of this class) and its value;
+		empty lines and lines starting with '#' are ignored. Receptive field
+		spacings not given are set to half the (possibly changed) field size.
+		filename: Name of the spec file.
+		"""
+		given = []
+		f = open( filename, 'r' )
+		for n, line in enumerate( f ):
+			par = line.split( '#' )[0].split()
+			if len(par) == 0:
+				continue
+			if len(par) != 2 or par[0] not in self.__dict__ or par[0].startswith( '_' ):
+				f.close()
+				raise ValueError( 'Line %d of spec file \'%s\' is no valid \'<parameter> <value>\' pair.' % (n+1,filename) )
+			setattr( self, par[0], int(par[1]) )
+			given.append( par[0] )
+		f.close()
+		for layer in [ 'lower', 'upper' ]:
+			for axis in [ 'x', 'y' ]:
+				if 'sfa_%s_layer_spacing_%s' % (layer,axis) not in given:
+					setattr( self, 'sfa_%s_layer_spacing_%s' % (layer,axis), getattr(self,'sfa_%s_layer_field_%s' % (layer,axis))//2 )
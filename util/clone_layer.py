@@ -0,0 +1,187 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# math
+import numpy
+import mdp
+
+#defines
+def_TILE_VALUES    = 2**21    # max. no. of expanded values processed at a time (8 MB in float32)
+def_SUBSAMPLE_SEED = 1        # seed of the receptive field subsets (see install)
+
+
+#================================================================[ Clone Layer ]
+
+class FoldedCloneLayer( mdp.hinet.CloneLayer ):
+	"""
+	CloneLayer training its shared node on all receptive fields at once.
+	Stock MDP trains the shared node field by field, i.e., a batch of T
+	frames results in one small update per field. Here the batch is folded
+	into a single (T*fields, field_dim) matrix instead: the trained nodes
+	below the current training node are executed once on the whole matrix,
+	and the covariance matrices of the SFA node being trained are updated
+	with one large matrix product each. Time derivatives are taken per field
+	(frame t+1 minus frame t of the same field), so the accumulated
+	statistics equal those of the stock implementation. Expansion nodes (and
+	anything between them and the SFA node) are executed in tiles of fields
+	and frames, each accumulated right away, so the expanded batch is never
+	stored as a whole and memory does not grow with the batch size. Training
+	phases of nodes other than SFA nodes fall back to the stock
+	implementation.
+	Optionally, the shared node is trained on a random subset of the
+	receptive fields only (the same fields for all frames of a batch, drawn
+	anew for every batch), reducing the training cost in proportion.
+	Layers are switched to this class by install() and return to the
+	original mdp class once their training is finished (or via uninstall()).
+	"""
+
+	def __flow__( self ):
+		# nodes of the shared node in order, current training node
+		flow = list( self.node._flow ) if isinstance( self.node, mdp.hinet.FlowNode ) else [ self.node ]
+		for k, node in enumerate( flow ):
+			if node.is_training():
+				return flow, k
+		return flow, None
+
+	def __subsample__( self, x ):
+		# keep a random subset of the receptive fields of the batch x
+		fraction, rng = self._subsample
+		fields = x.shape[1]//self.node.input_dim
+		n      = max( 1, int(round(fraction*fields)) )
+		keep   = numpy.sort( rng.choice(fields,n,replace=False) )
+		return x.reshape( x.shape[0], fields, self.node.input_dim )[:,keep].reshape( x.shape[0], n*self.node.input_dim )
+
+	def _train( self, x, *args, **kwargs ):
+		subsample = getattr( self, '_subsample', None ) != None
+		if subsample:
+			x = self.__subsample__( x )
+		flow, k = self.__flow__()
+		if k == None or args or [ a for a in kwargs if a != 'include_last_sample' ] or not isinstance( flow[k], mdp.nodes.SFANode ):
+			if not subsample:
+				return mdp.hinet.CloneLayer._train( self, x, *args, **kwargs )
+			d = self.node.input_dim
+			for f in range( x.shape[1]//d ):
+				self.node.train( x[:,f*d:(f+1)*d], *args, **kwargs )
+			return
+		sfa    = flow[k]
+		frames = x.shape[0]
+		fields = x.shape[1]//self.node.input_dim
+		last   = kwargs.get( 'include_last_sample', None )
+		last   = sfa._include_last_sample if last == None else last
+
+		# nodes from the first expansion (e.g., QuadraticExpansionNode) up to the
+		# training node are executed tile by tile
+		j = k
+		for i, node in enumerate( flow[:k] ):
+			if node.input_dim != None and node.output_dim != None and node.output_dim > node.input_dim:
+				j = i
+				break
+
+		# one row per frame and field: row t*fields+f holds field f of frame t
+		y = x.reshape( frames*fields, self.node.input_dim )
+		for node in flow[:j]:
+			y = node.execute( y )
+
+		if j == k:
+			sfa._check_input( y )
+			y = sfa._refcast( y ).reshape( frames, fields, sfa.input_dim )
+			self.__update__( sfa, y, None, frames, last )
+		else:
+			self.__trainTiled__( flow[j:k], sfa, y.reshape(frames,fields,y.shape[1]), last )
+
+		sfa._train_phase_started = True
+		self.node._train_phase_started = True
+
+	def __update__( self, sfa, y, prev, end, last ):
+		# covariance and per-field time derivative covariance of the frames
+		# (frames, fields, dim) in y; prev: preceding frame or None, end: no.
+		# of frames of y up to the end of the batch, last: include the last
+		# frame of the batch in the covariance
+		if last == False and end == y.shape[0]:
+			cov = y[:-1]
+		else:
+			cov = y
+		if cov.shape[0] > 0:
+			sfa._cov_mtx.update( cov.reshape(-1,sfa.input_dim) )
+		if prev is not None:
+			sfa._dcov_mtx.update( y[0]-prev )
+		if y.shape[0] > 1:
+			sfa._dcov_mtx.update( (y[1:]-y[:-1]).reshape(-1,sfa.input_dim) )
+
+	def __trainTiled__( self, nodes, sfa, y, last ):
+		# expand and accumulate the statistics of the SFA node in tiles of up to
+		# def_TILE_VALUES values: blocks of fields, and blocks of frames within.
+		# The last expanded frame of a block is carried over to the next one,
+		# so every row is expanded exactly once and no derivative is lost.
+		frames, fields = y.shape[0], y.shape[1]
+		rows   = max( 1, def_TILE_VALUES//sfa.input_dim )
+		step_f = max( 1, min(fields, rows//2) )
+		step_t = max( 2, rows//step_f )
+		for f in range( 0, fields, step_f ):
+			prev = None
+			for t in range( 0, frames, step_t ):
+				tile = y[t:t+step_t, f:f+step_f]
+				n, m = tile.shape[0], tile.shape[1]
+				tile = tile.reshape( n*m, tile.shape[2] )
+				for node in nodes:
+					tile = node.execute( tile )
+				sfa._check_input( tile )
+				tile = sfa._refcast( tile ).reshape( n, m, sfa.input_dim )
+				self.__update__( sfa, tile, prev, frames-t, last )
+				prev = tile[-1].copy()
+
+	def _stop_training( self, *args, **kwargs ):
+		mdp.hinet.CloneLayer._stop_training( self, *args, **kwargs )
+		if self.node.is_training() == False:
+			self.__class__ = mdp.hinet.CloneLayer
+			self.__dict__.pop( '_subsample', None )
+
+
+#==================================================================[ Utilities ]
+
+def install( nodes, fraction=None ):
+	"""
+	Switch all clone layers of a network that are still being trained to
+	folded training (see FoldedCloneLayer).
+	nodes   : List of nodes (e.g., the network or only its lower clone layer).
+	fraction: Fraction of the receptive fields to train on per batch, or None
+	          to train on all fields. Subsets are drawn from a fixed seed, so
+	          repeated runs use the same fields.
+	"""
+	for node in nodes:
+		if node.__class__ == mdp.hinet.CloneLayer and node.is_training():
+			node.__class__ = FoldedCloneLayer
+			if fraction != None:
+				node._subsample = ( fraction, numpy.random.RandomState(def_SUBSAMPLE_SEED) )
+
+def uninstall( nodes ):
+	"""
+	Restore the original clone layer class, e.g., before a network is stored
+	to file.
+	"""
+	for node in nodes:
+		if node.__class__ == FoldedCloneLayer:
+			node.__class__ = mdp.hinet.CloneLayer
+			node.__dict__.pop( '_subsample', None )
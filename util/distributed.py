@@ -0,0 +1,227 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import os
+import sys
+import time
+import glob
+import pickle
+import multiprocessing
+
+# math
+import mdp
+
+# utilities / own
+import sequence
+import layerwise
+
+#defines
+def_POLL = 0.5    # seconds between two looks at the shared folder
+
+
+#==================================================================[ Utilities ]
+
+def shardBatches( batch_ranges, frames, shards ):
+	"""
+	Divide the training batches among the shards, each shard holding an equal
+	part of the frames. A batch cut by a shard boundary is split, and its
+	first part is marked to be bridged, i.e., trained with the first frame of
+	the following part as well (see runWorker), such that the time
+	derivative across the boundary is not lost (in training phases of SFA
+	nodes; other nodes do not depend on the order of the frames).
+	batch_ranges: Iterable yielding (start, stop) frame ranges.
+	frames      : No. of frames of the data set.
+	shards      : No. of shards.
+	Returns one list of (start, stop, bridge) tuples per shard.
+	"""
+	bounds  = [ frames*i//shards for i in range(shards+1) ]
+	batches = [ [] for i in range(shards) ]
+	for (start, stop) in batch_ranges:
+		for i in range( shards ):
+			a, b = max( start, bounds[i] ), min( stop, bounds[i+1] )
+			if a < b:
+				batches[i].append( (a, b, b < stop) )
+	return batches
+
+def __write__( filename, obj ):
+	# pickle to the shared folder; the file only appears once it is complete
+	f = open( filename+'.tmp', 'wb' )
+	pickle.dump( obj, f, protocol=pickle.HIGHEST_PROTOCOL )
+	f.close()
+	os.replace( filename+'.tmp', filename )
+
+def __read__( filename ):
+	f = open( filename, 'rb' )
+	obj = pickle.load( f )
+	f.close()
+	return obj
+
+def __sfaPhase__( node ):
+	# is the node currently training (the inner node of) an SFA node?
+	while isinstance( node, (mdp.hinet.CloneLayer,mdp.hinet.FlowNode) ):
+		if isinstance( node, mdp.hinet.CloneLayer ):
+			node = node.node
+		else:
+			node = [ n for n in node._flow if n.is_training() ][0]
+	return isinstance( node, mdp.nodes.SFANode )
+
+def __forkable__( node ):
+	# nodes whose statistics can be joined (e.g., SFA nodes and containers
+	# thereof); everything else (e.g., ICA) is trained by the reducer itself
+	with mdp.extension( 'parallel' ):
+		try:
+			node.fork()
+		except mdp.parallel.NotForkableParallelException:
+			return False
+	return True
+
+
+#=====================================================================[ Worker ]
+
+def runWorker( folder, shard ):
+	"""
+	Train shards of the training data as broadcast by trainDistributed until
+	the training is complete. For every training phase the worker reads the
+	broadcast network, trains a fork of the current node (i.e., a copy
+	without statistics) on the batches of its shard, and writes the fork
+	(holding the partial statistics of its shard) back to the shared folder.
+	Statistics the node already holds (e.g., when its training is extended)
+	thus remain with the reducer's node and are counted once. Workers can
+	run on any machine sharing the folder and the sequence data files.
+	folder: Shared folder.
+	shard : Index of the worker's shard.
+	"""
+	stage = 0
+	data  = None
+	while True:
+		broadcast = os.path.join( folder, 'stage_%03d.net' % stage )
+		while not os.path.isfile( broadcast ):
+			if os.path.isfile( os.path.join(folder,'done') ):
+				return
+			time.sleep( def_POLL )
+		state = __read__( broadcast )
+		nodes = state['nodes']
+		if data == None:
+			data = sequence.SequenceSet( state['filenames'], state['view'] )
+			data.limit( state['frames'] )
+
+		with mdp.extension( 'parallel' ):
+			node = nodes[-1].fork()
+
+		# bridged batches: one more frame, which only enters the derivative
+		ping   = time.time()
+		bridge = __sfaPhase__( node )
+		for (start, stop, cut) in state['batches'][shard]:
+			if cut and bridge:
+				x = layerwise.execute( nodes[:-1], layerwise.readBatch(data,start,stop+1) )
+				node.train( x, include_last_sample=False )
+			else:
+				node.train( layerwise.execute(nodes[:-1],layerwise.readBatch(data,start,stop)) )
+		__write__( os.path.join(folder,'stage_%03d_shard_%03d.part' % (stage,shard)),
+		           node if len(state['batches'][shard]) > 0 else None )
+		print('Shard %d: trained network node %d (%s) with %d batches: %dsec' % \
+		      (shard, len(nodes)-1, node.__class__.__name__, len(state['batches'][shard]), time.time()-ping))
+		stage += 1
+
+
+#====================================================================[ Reducer ]
+
+def trainDistributed( nodes, data, batch_ranges, shards, folder, spawn=True, stats=None ):
+	"""
+	Train a network with its training data divided into shards, each trained
+	by a separate worker (see runWorker), exchanging nodes via files in a
+	shared folder. Each training phase works as map/reduce: the network is
+	broadcast, every worker trains the current node with its shard, and the
+	partial statistics of all shards are joined (summed) before the phase is
+	stopped and the next broadcast follows. Nodes whose statistics cannot be
+	joined are trained here on all batches.
+	nodes       : List of nodes (usually the whole network) to be trained.
+	data        : Sequence data set (see sequence.SequenceSet).
+	batch_ranges: Iterable yielding the (start, stop) frame ranges of the
+	              training batches.
+	shards      : No. of shards, i.e., workers.
+	folder      : Shared folder; it is cleared first.
+	spawn       : Start the workers as local processes. Otherwise they are
+	              started elsewhere, e.g., via 'train.py shard <i>'.
+	stats       : Statistics object recording the SFA statistics of every
+	              phase before it is closed (see util/sfa_statistics.py).
+	"""
+	if not os.path.isdir( folder ):
+		os.makedirs( folder )
+	for f in glob.glob( os.path.join(folder,'*') ):
+		os.remove( f )
+
+	batches = shardBatches( batch_ranges, data.frames, shards )
+	workers = []
+	if spawn:
+		for i in range( shards ):
+			workers.append( multiprocessing.Process(target=runWorker,args=(folder,i)) )
+			workers[-1].start()
+
+	stage = 0
+	try:
+		for k in range( len(nodes) ):
+			node = nodes[k]
+			while node.is_training():
+				ping = time.time()
+
+				# local training
+				local = not __forkable__( node )
+				if local:
+					for (start, stop) in batch_ranges:
+						node.train( layerwise.execute(nodes[:k],layerwise.readBatch(data,start,stop)) )
+
+				# map: broadcast network, reduce: join the statistics of all shards
+				else:
+					__write__( os.path.join(folder,'stage_%03d.net' % stage),
+					           { 'nodes'    : list(nodes[:k+1]),
+					             'filenames': [ os.path.abspath(f.filename) for f in data.files ],
+					             'view'     : data.view,
+					             'frames'   : data.frames,
+					             'batches'  : batches } )
+					for i in range( shards ):
+						part = os.path.join( folder, 'stage_%03d_shard_%03d.part' % (stage,i) )
+						while not os.path.isfile( part ):
+							if any( [w.exitcode not in (None,0) for w in workers] ):
+								print('Error! A worker process failed while training network node %d.' % k)
+								sys.exit()
+							time.sleep( def_POLL )
+						trained = __read__( part )
+						if trained != None:
+							with mdp.extension( 'parallel' ):
+								node.join( trained )
+						os.remove( part )
+					os.remove( os.path.join(folder,'stage_%03d.net' % stage) )
+					stage += 1
+
+				if stats != None: stats.collect( node )
+				node.stop_training()
+				print('Trained network node %d (%s) %s: %dsec' % \
+				      (k, node.__class__.__name__, 'locally' if local else 'with %d shards' % shards, time.time()-ping))
+	finally:
+		open( os.path.join(folder,'done'), 'w' ).close()
+		for w in workers:
+			w.join()
@@ -0,0 +1,231 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import copy
+import time
+
+# math
+import numpy
+import mdp
+
+#defines
+def_ITEMSIZE = 4     # bytes per value of the data passed through the network (float32)
+def_MB       = 1024*1024
+def_SOLVE    = 10    # flops per cubed input dimension to solve the eigenproblem of a trained node (rough)
+
+def_CALIBRATION_FRAMES = 20       # no. of random frames the training of each phase is timed with
+def_CALIBRATION_VALUES = 2**22    # max. no. of input values per timed phase
+
+
+#==========================================================[ Node Memory Usage ]
+
+def nodeMemory( node ):
+	"""
+	Estimate the memory used by a single node. The function returns a tuple
+	(execute, train, fixed): the bytes per frame needed while executing the
+	node, the bytes per frame needed while training it, and the bytes needed
+	independently of the batch size (e.g., covariance matrices). Estimates
+	include input and output arrays as well as major temporary arrays.
+	node: MDP node, possibly a hierarchical one (Layer, CloneLayer, FlowNode).
+	"""
+	f    = def_ITEMSIZE
+	din  = node.input_dim
+	dout = node.output_dim if node.output_dim != None else din
+
+	# clone layer: all fields are executed at once (input reshaped to one row
+	# per field), but trained one field slice after the other
+	if isinstance( node, mdp.hinet.CloneLayer ):
+		e, t, c = nodeMemory( node.node )
+		return ( len(node.nodes)*e, (din+dout)*f + t, c )
+
+	# layer: nodes are processed one after the other
+	if isinstance( node, mdp.hinet.Layer ):
+		usage = [ nodeMemory(n) for n in node.nodes ]
+		return ( (din+dout)*f + max([u[0] for u in usage]),
+		          din*f       + max([u[1] for u in usage]),
+		          sum([u[2] for u in usage]) )
+
+	# flow node: inner nodes are executed in sequence, only one is trained at a
+	# time; the input of the flow is held throughout
+	if isinstance( node, mdp.hinet.FlowNode ):
+		usage = [ nodeMemory(n) for n in node._flow ]
+		return ( din*f + max([u[0] for u in usage]),
+		         din*f + max([max(u[0],u[1]) for u in usage]),
+		         max([u[2] for u in usage]) )
+
+	# SFA: input plus its time derivative; covariance and derivative covariance
+	# matrices plus one temporary product in the node's precision
+	if isinstance( node, mdp.nodes.SFANode ):
+		size = numpy.dtype( node.dtype if node.dtype != None else numpy.float64 ).itemsize
+		return ( (din+dout)*f, 2*din*f, 3*din*din*size )
+
+	# quadratic expansion: preallocated (transposed) output plus temporary
+	# products of up to the output size
+	if isinstance( node, mdp.nodes.QuadraticExpansionNode ):
+		e = (din + 2*dout)*f
+		return ( e, e, 0 )
+
+	# noise: the noise is drawn in double precision and cast to the node's
+	# precision (both copies coexist) before it is added to the input
+	if isinstance( node, mdp.nodes.NoiseNode ):
+		e = (din + dout)*f + dout*numpy.dtype( numpy.float64 ).itemsize
+		return ( e, e, 0 )
+
+	# anything else (e.g., switchboards or ICA)
+	if node.is_trainable():
+		return ( (din+dout)*f, 2*din*f, din*din*f )
+	return ( (din+dout)*f, (din+dout)*f, 0 )
+
+
+#=======================================================[ Network Memory Usage ]
+
+def stageMemory( nodes, raw_itemsize=1 ):
+	"""
+	Estimate the memory used while training each node of a network via
+	mdp.Flow.train, i.e., with all preceding nodes being executed on every
+	batch. The function returns a list holding a tuple (index, per_frame,
+	fixed) for every node still to be trained.
+	nodes       : List of nodes (usually the whole network).
+	raw_itemsize: Bytes per value of the stored training data.
+	"""
+	raw    = nodes[0].input_dim*(raw_itemsize+def_ITEMSIZE)   # stored batch plus float32 copy
+	usage  = [ nodeMemory(n) for n in nodes ]
+	stages = []
+	for k, node in enumerate( nodes ):
+		if node.is_training():
+			per_frame = raw + max( [u[0] for u in usage[:k]] + [usage[k][1]] )
+			stages.append( (k, per_frame, usage[k][2]) )
+	return stages
+
+def batchSize( stages, budget, workers=1, prefetch=0, frame_dim=0 ):
+	"""
+	Retrieve the largest batch size for which all training stages stay within
+	the given memory budget. One frame is held in reserve, since a single
+	trailing frame of a data set is merged into the preceding batch.
+	stages   : Training stages as returned by stageMemory.
+	budget   : Memory budget in bytes.
+	workers  : No. of processes training in parallel, each holding its own
+	           batch and copy of the trained node.
+	prefetch : No. of prefetched batches held in addition.
+	frame_dim: Values per frame of the stored training data (prefetching).
+	"""
+	size = None
+	for (k, per_frame, fixed) in stages:
+		per_frame = per_frame*workers + prefetch*frame_dim*def_ITEMSIZE
+		fixed     = fixed*(workers+1 if workers > 1 else 1)
+		n = int( (budget-fixed)//per_frame ) - 1
+		size = n if size == None else min( size, n )
+	return size
+
+
+#=========================================================[ Network Cost (FLOPs) ]
+
+def leafNodes( node, rows=1 ):
+	"""
+	Retrieve the non-hierarchical nodes of a node in order of execution, each
+	with the no. of rows per frame it processes (e.g., the no. of receptive
+	fields for the shared node of a clone layer).
+	node: MDP node, possibly a hierarchical one (Layer, CloneLayer, FlowNode).
+	rows: Rows per frame the node itself processes.
+	"""
+	if isinstance( node, mdp.hinet.CloneLayer ):
+		return leafNodes( node.node, rows*len(node.nodes) )
+	if isinstance( node, mdp.hinet.Layer ):
+		return sum( [ leafNodes(n,rows) for n in node.nodes ], [] )
+	if isinstance( node, mdp.hinet.FlowNode ):
+		return sum( [ leafNodes(n,rows) for n in node._flow ], [] )
+	return [ (node, rows) ]
+
+def leafFlops( node ):
+	"""
+	Estimate the floating point operations of a single (non-hierarchical)
+	node. The function returns a tuple (execute, train, solve): the flops per
+	input row for executing and for training the node, and the flops needed
+	once to finish its training (e.g., solving the eigenproblem of SFA).
+	"""
+	din  = node.input_dim
+	dout = node.output_dim if node.output_dim != None else din
+
+	# SFA: covariance and derivative covariance updates, generalized eigenproblem
+	if isinstance( node, mdp.nodes.SFANode ):
+		return ( 2*din*dout, 4*din*din + din, def_SOLVE*din**3 )
+	# quadratic expansion: one product per output value
+	if isinstance( node, mdp.nodes.QuadraticExpansionNode ):
+		return ( dout, 0, 0 )
+	# noise: random number plus addition
+	if isinstance( node, mdp.nodes.NoiseNode ):
+		return ( 2*dout, 0, 0 )
+	# switchboards only copy
+	if isinstance( node, mdp.hinet.Switchboard ):
+		return ( 0, 0, 0 )
+	# anything else (e.g., PCA or ICA): linear projection, covariance update
+	if node.is_trainable():
+		return ( 2*din*dout, 2*din*din, def_SOLVE*din**3 )
+	return ( din, 0, 0 )
+
+def stageFlops( nodes ):
+	"""
+	Estimate the floating point operations of every training phase of a
+	network trained via mdp.Flow.train, i.e., with all preceding nodes being
+	executed on every batch. The function returns a list holding a tuple
+	(index, leaf, rows, execute, train, solve) for every phase still to be
+	trained: index of the trained network node, the (inner) node trained in
+	this phase and its rows per frame, the flops per frame for executing
+	everything below it and for training it, and the flops to finish it.
+	nodes: List of nodes (usually the whole network).
+	"""
+	stages = []
+	below  = 0
+	for k, node in enumerate( nodes ):
+		inner = 0
+		for (leaf, rows) in leafNodes( node ):
+			execute, train, solve = leafFlops( leaf )
+			if node.is_training() and leaf.is_trainable() and leaf.is_training():
+				for phase in leaf._get_train_seq():
+					stages.append( (k, leaf, rows, below+inner, rows*train, solve) )
+			inner += rows*execute
+		below += inner
+	return stages
+
+def calibrate( stages ):
+	"""
+	Measure the flop rate achieved by every training phase: a copy of the
+	trained (inner) node is trained with random input, and its estimated
+	flops are divided by the time taken. Only the nodes are copied, no
+	training data is needed.
+	stages: Training phases as returned by stageFlops.
+	Returns one rate (flops per second) per phase.
+	"""
+	rates = []
+	rng   = numpy.random.RandomState( 0 )
+	for (k, leaf, rows, execute, train, solve) in stages:
+		n = max( 2, min(rows*def_CALIBRATION_FRAMES, def_CALIBRATION_VALUES//leaf.input_dim) )
+		x = rng.uniform( 0.0, 255.0, (n,leaf.input_dim) ).astype( numpy.float32 )
+		node = copy.deepcopy( leaf )
+		ping = time.time()
+		node.train( x )
+		rates.append( n*leafFlops(leaf)[1] / max(time.time()-ping,1e-6) )
+	return rates
@@ -0,0 +1,151 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import copy
+import time
+
+# utilities / own
+import sequence
+import layerwise
+
+
+#==================================================================[ Utilities ]
+
+def prefixData( data, batch_ranges, n ):
+	"""
+	Retrieve the first n frames of a data set along with the batches a network
+	trained on n frames alone would see; the batches follow the rules of a
+	separate run (e.g., a single trailing frame is added to the preceding
+	batch), so they may differ from the batches of the full data set.
+	data        : Sequence data set (see sequence.SequenceSet).
+	batch_ranges: Function mapping a sequence data set to an iterable yielding
+	              its (start, stop) frame ranges.
+	n           : Frame count.
+	Returns the limited data set and the list of its frame ranges.
+	"""
+	prefix = copy.copy( data )
+	prefix.limit( n )
+	return prefix, list( batch_ranges(prefix) )
+
+def sharedRanges( ranges, prefix_ranges ):
+	"""
+	Retrieve the number of leading batches two lists of frame ranges have in
+	common.
+	ranges       : Frame ranges of the full data set.
+	prefix_ranges: Frame ranges of a prefix of the data set.
+	"""
+	k = 0
+	while k < min( len(ranges), len(prefix_ranges) ) and ranges[k] == prefix_ranges[k]:
+		k += 1
+	return k
+
+def readRange( data, nodes, x, start, stop, a, b ):
+	# output of the nodes for frames [a;b), taken from their output x for the
+	# frames [start;stop) if it holds them
+	if start <= a and b <= stop:
+		return x[a-start:b-start]
+	return layerwise.execute( nodes, layerwise.readBatch(data,a,b) )
+
+
+#===================================================================[ Training ]
+
+def trainSweep( network, count, data, batch_ranges, prefixes, layer_wise=False, folder=None, keep_cache=False ):
+	"""
+	Train one network per prefix (i.e., the first n frames) of the data set
+	in a single run. Up to the first training phase all networks are equal:
+	this phase is trained once, and a copy of the partially trained network
+	is taken wherever the batches of a prefix depart from the batches of the
+	full data set (usually the batch the prefix ends in); the copy is then
+	trained on the remaining batches of its prefix. From then on the networks
+	differ (lower nodes trained with different frames produce different input
+	for the nodes above), and every following phase reads each batch once and
+	trains all networks on it, again with the batches of their own prefix
+	where these differ. Every network sees exactly the batches of a separate
+	run on its frame count. Alternatively, the networks continue via
+	layer-wise training (see util/layerwise.py), whose caches are kept apart
+	by the hash of each network's lower nodes.
+	network     : Network to train; it becomes the network of the last prefix.
+	count       : No. of network nodes to train (e.g., 4 for generic data).
+	data        : Sequence data set (see sequence.SequenceSet), limited to the
+	              largest prefix.
+	batch_ranges: Function mapping a sequence data set to an iterable yielding
+	              its (start, stop) frame ranges.
+	prefixes    : Frame counts to train networks for.
+	layer_wise  : Continue with layer-wise training after the first phase.
+	folder      : Folder for the cache files of layer-wise training.
+	keep_cache  : Keep the cache files of layer-wise training.
+	Returns a dictionary mapping each frame count to its trained network.
+	"""
+	prefixes = sorted( set(prefixes) )
+	ranges   = list( batch_ranges(data) )
+	subsets  = dict( [ (n,prefixData(data,batch_ranges,n)) for n in prefixes ] )
+	shared   = dict( [ (n,sharedRanges(ranges,subsets[n][1])) for n in prefixes ] )
+	nodes    = network[0:count]
+	networks = {}
+
+	# first training phase: one pass, copies of the network where prefixes depart
+	first = min( [ k for k, n in enumerate(nodes) if n.is_training() ] + [count] )
+	if first == count:
+		return dict( [ (n, copy.deepcopy(network)) for n in prefixes ] )
+	ping = time.time()
+	for i, (start, stop) in enumerate( ranges ):
+		x = layerwise.execute( nodes[:first], layerwise.readBatch(data,start,stop) )
+		for n in prefixes[:-1]:
+			if shared[n] == i:
+				networks[n] = copy.deepcopy( network )
+				for (a, b) in subsets[n][1][i:]:
+					networks[n][first].train( readRange(data,nodes[:first],x,start,stop,a,b) )
+		nodes[first].train( x )
+	networks[prefixes[-1]] = network
+	for n in prefixes:
+		networks[n][first].stop_training()
+	print('Trained network node %d (%s) for all %d frame counts: %dsec' % \
+	      (first, nodes[first].__class__.__name__, len(prefixes), time.time()-ping))
+
+	# remaining phases, layer-wise: each network from its own prefix
+	if layer_wise:
+		for n in prefixes:
+			print('Layer-wise training of the network for %d frames:' % n)
+			layerwise.trainLayerwise( networks[n][0:count], subsets[n][0], subsets[n][1], folder, keep_cache )
+		return networks
+
+	# remaining phases: one pass per phase for all networks
+	for k in range( first, count ):
+		while networks[prefixes[-1]][k].is_training():
+			ping = time.time()
+			for i, (start, stop) in enumerate( ranges ):
+				x = layerwise.readBatch( data, start, stop )
+				for n in prefixes:
+					if i < shared[n]:
+						networks[n][k].train( layerwise.execute(networks[n][0:k],x) )
+					elif i == shared[n]:
+						for (a, b) in subsets[n][1][i:]:
+							networks[n][k].train( layerwise.execute(networks[n][0:k],readRange(data,[],x,start,stop,a,b)) )
+			for n in prefixes:
+				networks[n][k].stop_training()
+			print('Trained network node %d (%s) for all %d frame counts: %dsec' % \
+			      (k, nodes[k].__class__.__name__, len(prefixes), time.time()-ping))
+	return networks
@@ -0,0 +1,173 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+#=====================================================================[ Header ]
+
+# system
+import os
+import re
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+#defines
+def_SHARD_SIZE = 10000     # default number of frames stored per shard subfolder
+def_INDEX_FILE = 'index'   # name of the index file within a sequence folder
+
+
+#=============================================================[ Frame Sequence ]
+
+class FrameSequence( Freezeable ):
+	"""
+	Image sequence stored in numbered shard subfolders, i.e., frame <i> is
+	stored as '<folder>/<i/shard_size>/frame_<i>.png'. A small index file in
+	the sequence folder keeps track of the frame count and the shard size, so
+	every frame is located by its number alone and the (possibly huge) folder
+	never has to be listed. Flat folders written by earlier versions of ratlab
+	are still readable; their frames are ordered by their numeric file name.
+	"""
+
+	#----------------------------------------------------------[ Construction ]
+
+	def __init__( self, folder, write=False, shard_size=None ):
+		"""
+		Constructor. Opens an existing sequence, or starts a new one.
+		folder    : Folder holding the image sequence.
+		write     : If True, a new (empty) sequence is started in the given
+		            folder. Otherwise the sequence is read from the folder.
+		shard_size: Number of frames per shard subfolder (new sequences only).
+		"""
+		self.folder     = folder
+		self.frames     = 0
+		self.shard_size = def_SHARD_SIZE if shard_size == None else shard_size
+		self.legacy     = None
+		self.__shards__ = set()
+		self.freeze()
+
+		if write:
+			if os.path.isdir( folder ) == False:
+				os.makedirs( folder )
+			self.writeIndex()
+		elif os.path.isfile( os.path.join(folder,def_INDEX_FILE) ):
+			self.readIndex()
+			self.__recover__()
+		else:
+			self.legacy = self.__listLegacy__()
+			self.frames = len( self.legacy )
+
+	def __listLegacy__( self ):
+		# flat folder of earlier ratlab versions: order by frame number, not by name
+		def frameNumber( name ):
+			digits = re.findall( r'\d+', name )
+			return (int(digits[-1]) if digits else -1, name)
+		names = [ f for f in os.listdir(self.folder) if os.path.isfile(os.path.join(self.folder,f)) ]
+		names.sort( key=frameNumber )
+		return names
+
+	#------------------------------------------------------------------[ Index ]
+
+	def readIndex( self ):
+		"""
+		Read frame count and shard size from the index file of the sequence.
+		"""
+		f = open( os.path.join(self.folder,def_INDEX_FILE), 'r' )
+		for line in f:
+			s = line.split()
+			if len(s) != 2: continue
+			if s[0] == 'frames':     self.frames     = int(s[1])
+			if s[0] == 'shard_size': self.shard_size = int(s[1])
+		f.close()
+
+	def __recover__( self ):
+		# the index is updated when a shard is started and when the recording
+		# ends: pick up frames written after its last update (e.g., before a
+		# crash), but not frames older than the index (e.g., left beyond the
+		# end of a truncated sequence)
+		written = os.path.getmtime( os.path.join(self.folder,def_INDEX_FILE) )
+		indexed = self.frames
+		while os.path.isfile( self.framePath(self.frames) ) and os.path.getmtime( self.framePath(self.frames) ) >= written:
+			self.frames += 1
+		if self.frames > indexed:
+			print('Warning! Sequence \'%s\' holds %d frames not in its index (e.g., after a crash); they are included.' % (self.folder,self.frames-indexed))
+
+	def writeIndex( self ):
+		"""
+		Write frame count and shard size to the index file of the sequence.
+		The file is replaced atomically, so an interrupted recording always
+		leaves a valid index behind.
+		"""
+		filename = os.path.join( self.folder, def_INDEX_FILE )
+		f = open( filename+'.tmp', 'w' )
+		f.write( str('frames').ljust(20)     + str(self.frames)     + '\n' )
+		f.write( str('shard_size').ljust(20) + str(self.shard_size) + '\n' )
+		f.close()
+		os.replace( filename+'.tmp', filename )
+
+	#----------------------------------------------------------[ Frame Access ]
+
+	def framePath( self, i ):
+		"""
+		Retrieve the file name of frame <i>.
+		"""
+		if self.legacy != None:
+			return os.path.join( self.folder, self.legacy[i] )
+		shard = str( i//self.shard_size ).zfill(4)
+		return os.path.join( self.folder, shard, 'frame_'+str(i).zfill(8)+'.png' )
+
+	def __len__( self ):
+		return self.frames
+
+	def __iter__( self ):
+		for i in range( self.frames ):
+			yield self.framePath( i )
+
+	def save( self, image, i ):
+		"""
+		Store an image as frame <i> of the sequence.
+		image: PIL image to be stored.
+		i    : Frame number, usually the current simulation step.
+		"""
+		shard = i//self.shard_size
+		if shard not in self.__shards__:
+			shard_folder = os.path.dirname( self.framePath(i) )
+			if os.path.isdir( shard_folder ) == False:
+				os.makedirs( shard_folder )
+			self.__shards__.add( shard )
+			self.writeIndex()
+		image.save( self.framePath(i) )
+		self.frames = max( self.frames, i+1 )
+
+	def truncate( self, frames ):
+		"""
+		Cut the sequence down to its first <frames> frames, e.g., in order to
+		continue an interrupted recording from a checkpoint. Frames beyond the
+		new end are overwritten by subsequent calls to save().
+		"""
+		self.frames = frames
+		self.writeIndex()
+
+	def close( self ):
+		"""
+		Finish writing the sequence by updating its index file.
+		"""
+		self.writeIndex()
@@ -0,0 +1,122 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# math
+import numpy
+import mdp
+
+#defines
+def_BLOCK_ROWS = 1024    # max. no. of samples merged into the decomposition at a time
+def_OVERSAMPLE = None    # components kept during training, per output dimension (None: all)
+
+
+#============================================================[ Incremental PCA ]
+
+class IncrementalPCANode( mdp.nodes.PCANode ):
+	"""
+	PCA node trained by incremental SVD: the principal components are updated
+	block by block from the samples, so no covariance matrix is accumulated.
+	During training the node keeps the mean, the (unnormalized) total
+	variance, and the leading right singular vectors of the centered data
+	seen so far, scaled by their singular values; a block of new samples is
+	merged by a thin SVD of these vectors stacked on the centered block and a
+	correction row for the shift of the mean. Copies trained on different
+	data (e.g., by parallel workers) are merged the same way.
+	By default all components are kept, so the decomposition is exact up to
+	rounding (eigenvalues as of a batch PCANode to ~1e-12, merged copies
+	included) at about the cost of a truncated one, since the SVD of every
+	block dominates. Keeping only <oversample> times the output dimension
+	bounds the memory of the node for large fields, but variance discarded
+	by the truncation is lost for good: the result is an approximation whose
+	error depends on the spectrum of the data. For fields of uniform noise
+	(a flat spectrum) oversample 2 yields eigenvalues off by several percent,
+	and by up to ~30% once four copies are merged; for a decaying spectrum
+	the error is a few 1e-4. See tools/ipca_check.py.
+	Once trained, the node becomes a plain mdp PCANode (projection, mean,
+	eigenvalues, and explained variance), i.e., networks are stored with the
+	original mdp classes.
+	"""
+
+	def __init__( self, input_dim=None, output_dim=None, dtype=None, oversample=def_OVERSAMPLE ):
+		"""
+		Constructor.
+		input_dim : Input dimension.
+		output_dim: No. of principal components to keep.
+		dtype     : Data type of the output.
+		oversample: Components kept during training, per output dimension, or
+		            None to keep all of them (exact).
+		"""
+		mdp.nodes.PCANode.__init__( self, input_dim, output_dim, dtype )
+		self._oversample = oversample
+		self._samples    = 0
+		self._mean       = None
+		self._components = None    # right singular vectors scaled by the singular values
+		self._scatter    = 0.0     # sum of the squared deviations from the mean
+
+	def __merge__( self, n, mean, rows, scatter ):
+		# merge n samples with the given mean, centered rows (or scaled
+		# components), and scatter into the decomposition
+		if self._samples == 0:
+			stack = rows
+		else:
+			total = self._samples+n
+			shift = numpy.sqrt( self._samples*n/float(total) )*( self._mean-mean )
+			stack = numpy.vstack( [self._components, rows, shift[numpy.newaxis,:]] )
+			scatter += self._samples*n/float(total)*numpy.dot( self._mean-mean, self._mean-mean )
+			mean     = ( self._samples*self._mean + n*mean )/total
+		u, s, vt = numpy.linalg.svd( stack, full_matrices=False )
+		keep = self.input_dim if self._oversample == None else min( self.input_dim, self._oversample*self.output_dim )
+		self._components = s[:keep,numpy.newaxis]*vt[:keep]
+		self._mean       = mean
+		self._scatter   += scatter
+		self._samples   += n
+
+	def _train( self, x ):
+		for i in range( 0, x.shape[0], def_BLOCK_ROWS ):
+			block = numpy.asarray( x[i:i+def_BLOCK_ROWS], dtype=numpy.float64 )
+			mean  = block.mean( axis=0 )
+			rows  = block-mean
+			self.__merge__( block.shape[0], mean, rows, (rows*rows).sum() )
+
+	def _stop_training( self, debug=False ):
+		n = self.output_dim
+		d = ( self._components[:n]**2 ).sum( axis=1 )/( self._samples-1 )
+		self.tlen               = self._samples
+		self.avg                = self._mean.reshape( 1, self.input_dim ).astype( self.dtype )
+		self.d                  = d.astype( self.dtype )
+		self.v                  = ( self._components[:n]/numpy.sqrt(d*(self._samples-1))[:,numpy.newaxis] ).T.astype( self.dtype )
+		self.total_variance     = self._scatter/( self._samples-1 )
+		self.explained_variance = d.sum()/self.total_variance
+		del self._cov_mtx, self._oversample, self._samples, self._mean, self._components, self._scatter
+		self.__class__ = mdp.nodes.PCANode
+
+	# parallel training (mdp.parallel): copies are merged via __merge__
+
+	def _fork( self ):
+		return self.__class__( self.input_dim, self.output_dim, self.dtype, self._oversample )
+
+	def _join( self, forked_node ):
+		if forked_node._samples > 0:
+			self.__merge__( forked_node._samples, forked_node._mean, forked_node._components, forked_node._scatter )
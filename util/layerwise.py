@@ -0,0 +1,188 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import os
+import sys
+import time
+import pickle
+import hashlib
+
+# math
+import numpy
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+
+#==================================================================[ Layer Cache ]
+
+class LayerCache( Freezeable ):
+	"""
+	Output of the first nodes of a network for every frame of the training
+	data, stored as a memory-mapped float32 array (one row per frame). A
+	cache file is named after a hash of the trained nodes and the data set
+	it was computed from, i.e., it is reused as long as both are unchanged.
+	"""
+
+	def __init__( self, folder, key, frames, dim ):
+		"""
+		Constructor.
+		folder: Folder holding the cache files.
+		key   : Hash identifying nodes and data set.
+		frames: No. of frames of the data set.
+		dim   : Output dimension of the cached nodes.
+		"""
+		self.filename = os.path.join( folder, 'layer_'+key+'.dat' )
+		self.frames   = frames
+		self.dim      = dim
+		self.__data__ = None
+		self.freeze()
+
+	def exists( self ):
+		return os.path.isfile( self.filename )
+
+	def write( self, source, nodes, batch_ranges ):
+		"""
+		Execute the given nodes on all batches of the source and store the
+		results. The file only appears under its final name once complete.
+		source      : Data source providing read(start,stop).
+		nodes       : Nodes to execute, in order.
+		batch_ranges: Iterable yielding (start, stop) frame ranges.
+		"""
+		data = numpy.memmap( self.filename+'.tmp', dtype=numpy.float32, mode='w+', shape=(self.frames,self.dim) )
+		for (start, stop) in batch_ranges:
+			data[start:stop] = execute( nodes, readBatch(source,start,stop) )
+		data.flush()
+		del data
+		os.replace( self.filename+'.tmp', self.filename )
+
+	def read( self, start, stop ):
+		"""
+		Retrieve the cached output for frames [start;stop).
+		"""
+		if self.__data__ is None:
+			self.__data__ = numpy.memmap( self.filename, dtype=numpy.float32, mode='r', shape=(self.frames,self.dim) )
+		return self.__data__[start:stop]
+
+	def remove( self ):
+		self.__data__ = None
+		os.remove( self.filename )
+
+
+#==================================================================[ Utilities ]
+
+def readBatch( source, start, stop ):
+	# float32 copy of a batch from the data file(s) or a cache
+	return numpy.array( source.read(start,stop), dtype=numpy.float32 )
+
+def execute( nodes, x ):
+	for node in nodes:
+		x = node.execute( x )
+	return x
+
+def cacheKey( nodes, data ):
+	"""
+	Hash of the given (trained) nodes and the identity of the data set,
+	including the view of its colors.
+	nodes: Nodes whose output is to be cached.
+	data : Sequence data set (see sequence.SequenceSet).
+	"""
+	key = hashlib.sha1( pickle.dumps(list(nodes),protocol=2) )
+	for f in data.files:
+		key.update( repr((os.path.abspath(f.filename),os.path.getsize(f.filename),os.path.getmtime(f.filename))).encode('utf-8') )
+	key.update( repr(data.segments).encode('utf-8') )
+	key.update( repr(data.view).encode('utf-8') )
+	return key.hexdigest()[:16]
+
+
+#===================================================================[ Training ]
+
+def trainLayerwise( nodes, data, batch_ranges, folder, keep_cache=False ):
+	"""
+	Train a network node by node. Once a node is trained, the output of all
+	nodes so far is written to a memory-mapped cache, and the following nodes
+	are trained from that cache instead of executing the lower nodes over and
+	over again. Nodes without training (e.g., switchboards) are not cached
+	but executed on the fly. Already trained nodes (e.g., of a network loaded
+	from file) are skipped, starting from the longest cached part of the
+	network if available.
+	nodes       : List of nodes (usually the whole network) to be trained.
+	data        : Sequence data set (see sequence.SequenceSet).
+	batch_ranges: Reusable iterable yielding the (start, stop) frame ranges
+	              of the training batches.
+	folder      : Folder to store the cache files in.
+	keep_cache  : If True, cache files are kept for later runs, including
+	              the output of the complete network. Otherwise they are
+	              deleted as soon as they are no longer needed.
+	"""
+	if os.path.isdir( folder ) == False:
+		os.makedirs( folder )
+
+	# last node to be trained
+	last = max( [ i for i, n in enumerate(nodes) if n.is_training() ] + [-1] )
+	if last == -1: return
+
+	# start from the longest available cache of already trained nodes
+	source  = data
+	pending = []
+	first   = 0
+	caches  = []
+	for k in range( last, 0, -1 ):
+		if any( [n.is_training() for n in nodes[:k]] ): continue
+		cache = LayerCache( folder, cacheKey(nodes[:k],data), data.frames, nodes[k-1].output_dim )
+		if cache.exists():
+			print('Using cached output of the first %d network nodes.' % k)
+			source, first = cache, k
+			break
+
+	for k in range( first, len(nodes) ):
+		node = nodes[k]
+
+		# train node, one pass over the data per training phase
+		while node.is_training():
+			ping = time.time()
+			for (start, end) in batch_ranges:
+				node.train( execute(pending,readBatch(source,start,end)) )
+			node.stop_training()
+			print('Trained network node %d (%s): %dsec' % (k, node.__class__.__name__, time.time()-ping))
+		pending.append( node )
+		if k == last and keep_cache == False: break
+
+		# cache output of the nodes so far for the nodes still to be trained
+		if node.is_trainable() and (k < last or k == len(nodes)-1):
+			ping  = time.time()
+			cache = LayerCache( folder, cacheKey(nodes[:k+1],data), data.frames, node.output_dim )
+			if cache.exists() == False:
+				cache.write( source, pending, batch_ranges )
+				print('Cached output of the first %d network nodes: %dsec' % (k+1, time.time()-ping))
+			if keep_cache == False:
+				for c in caches: c.remove()
+				caches = [ cache ]
+			source, pending = cache, []
+
+	if keep_cache == False:
+		for c in caches: c.remove()
@@ -0,0 +1,103 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import sys
+import functools
+
+# math
+import numpy
+import mdp
+
+# utilities / own
+import sequence
+
+
+#===========================================================[ Training Callable ]
+
+class SequenceTrainCallable( mdp.parallel.FlowTrainCallable ):
+	"""
+	Training callable for parallel flows that is handed frame ranges instead
+	of data. Each worker process memory-maps the sequence data on its own, so
+	only the (start, stop) boundaries of a batch are sent to the workers while
+	the trained node copies are sent back and joined by the parallel flow.
+	"""
+
+	def __init__( self, flownode, purge_nodes=True, filenames=None, view=None ):
+		"""
+		Constructor.
+		flownode   : FlowNode containing the flow to be trained.
+		purge_nodes: Replace nodes not required for the join by dummy nodes.
+		filenames  : Sequence data files the frame ranges refer to.
+		view       : View of the sequence data (see sequence.SequenceSet).
+		"""
+		self.filenames = filenames
+		self.view      = view
+		self.__data__  = None
+		mdp.parallel.FlowTrainCallable.__init__( self, flownode, purge_nodes )
+
+	def __getstate__( self ):
+		# memory maps are opened anew by every process
+		state = self.__dict__.copy()
+		state['__data__'] = None
+		return state
+
+	def __call__( self, batch ):
+		"""
+		Train the flow with frames [start;stop) of the sequence data.
+		batch: Tuple (start, stop) of frame indices.
+		"""
+		if self.__data__ is None:
+			self.__data__ = sequence.SequenceSet( self.filenames, self.view )
+		x = numpy.array( self.__data__.read(batch[0],batch[1]), dtype=numpy.float32 )
+		return mdp.parallel.FlowTrainCallable.__call__( self, x )
+
+	def fork( self ):
+		return self.__class__( self._flownode.fork(), self._purge_nodes, self.filenames, self.view )
+
+
+#===================================================================[ Training ]
+
+def trainParallel( nodes, batch_ranges, filenames, workers, view=None ):
+	"""
+	Train a list of nodes as a parallel flow using a pool of worker processes.
+	Every batch is trained by a copy (fork) of the current node within one of
+	the workers; the copies and their training statistics (e.g., the SFA
+	covariance matrices) are joined before the node's training phase is
+	stopped. Nodes that cannot be forked are trained locally.
+	nodes       : List of nodes (usually the whole network) to be trained.
+	batch_ranges: List of reusable iterables, one per node, yielding the
+	              (start, stop) frame ranges of the training batches.
+	filenames   : Sequence data files the frame ranges refer to.
+	workers     : Number of worker processes.
+	view        : View of the sequence data (see sequence.SequenceSet).
+	"""
+	flow      = mdp.parallel.ParallelFlow( list(nodes) )
+	scheduler = mdp.parallel.ProcessScheduler( n_processes=workers, source_paths=sys.path )
+	try:
+		flow.train( batch_ranges, scheduler=scheduler,
+		            train_callable_class=functools.partial(SequenceTrainCallable,filenames=filenames,view=view) )
+	finally:
+		scheduler.shutdown()
@@ -0,0 +1,228 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import time
+import json
+import resource
+import tracemalloc
+
+# math
+import mdp
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+#defines
+def_EXTENSION = 'ratlab_profile'
+def_CALLS     = [ 'train', 'stop_training', 'execute' ]
+def_MB        = 1024*1024
+
+# profiler currently recording (see Profiler.start)
+active = None
+
+
+#==================================================================[ Extension ]
+
+class ProfileExtensionNode( mdp.ExtensionNode, mdp.Node ):
+	"""
+	MDP extension routing the train, stop_training, and execute calls of all
+	nodes through the active profiler. The methods are only replaced while
+	the extension is active, i.e., nodes run unchanged when not profiling.
+	"""
+	extension_name = def_EXTENSION
+
+	def train( self, x, *args, **kwargs ):
+		return active.record( self, 'train', len(x), self._non_extension_train, x, *args, **kwargs )
+
+	def stop_training( self, *args, **kwargs ):
+		return active.record( self, 'stop_training', 0, self._non_extension_stop_training, *args, **kwargs )
+
+	def execute( self, x, *args, **kwargs ):
+		return active.record( self, 'execute', len(x), self._non_extension_execute, x, *args, **kwargs )
+
+def nodeClasses( cls=mdp.Node ):
+	# all (indirect) subclasses of a node class
+	found = []
+	for sub in cls.__subclasses__():
+		found += [ sub ] + nodeClasses( sub )
+	return found
+
+def dispatch( call ):
+	# public method calling the current (possibly extended) method of mdp.Node
+	def method( self, *args, **kwargs ):
+		return getattr( mdp.Node, call )( self, *args, **kwargs )
+	method.__name__ = call
+	return method
+
+
+#===================================================================[ Profiler ]
+
+class Profiler( Freezeable ):
+	"""
+	Records wall time, processed frames, allocated memory, and peak resident
+	memory of every train, stop_training, and execute call of every node
+	(including the inner nodes of layers and flow nodes) while active. Times
+	and allocations of a hierarchical node include those of its inner nodes.
+	Allocations are traced via tracemalloc (numpy arrays included) as the
+	peak of memory allocated during a call on top of the memory at its start.
+	Calls made in other processes (e.g., parallel workers) are not recorded.
+	MDP equips every node class defining _train, _execute, etc. with its own
+	public method; below the first level of subclasses (e.g., CloneLayer)
+	these call the original methods of mdp.Node directly, bypassing the
+	extension. While recording, such methods are replaced by ones calling
+	the extended methods.
+	"""
+
+	def __init__( self ):
+		"""
+		Constructor.
+		"""
+		self.records = {}    # (id of node, call) -> record
+		self.stack   = []    # peak traced memory of every open call, as seen by its inner calls
+		self.patched = []    # (class, call, original method) of all replaced public methods
+		self.freeze()
+
+	def start( self ):
+		"""
+		Start recording all node calls.
+		"""
+		global active
+		active = self
+		for cls in nodeClasses():
+			for call in def_CALLS:
+				method = cls.__dict__.get( call )
+				if getattr( method, '_undecorated_', None ) is getattr( mdp.Node, call ):
+					self.patched.append( (cls,call,method) )
+					setattr( cls, call, dispatch(call) )
+		tracemalloc.start()
+		mdp.activate_extension( def_EXTENSION )
+
+	def stop( self ):
+		"""
+		Stop recording; nodes return to their unprofiled methods.
+		"""
+		global active
+		mdp.deactivate_extension( def_EXTENSION )
+		tracemalloc.stop()
+		for (cls, call, method) in self.patched:
+			setattr( cls, call, method )
+		self.patched = []
+		active = None
+
+	def record( self, node, call, rows, method, *args, **kwargs ):
+		"""
+		Run a single node method and record its cost.
+		node  : Called node.
+		call  : Name of the called method.
+		rows  : No. of input rows (samples) passed to the call.
+		method: Original (unprofiled) method of the node.
+		"""
+		current, peak = tracemalloc.get_traced_memory()
+		if len(self.stack) > 0:
+			self.stack[-1] = max( self.stack[-1], peak )
+		self.stack.append( current )
+		tracemalloc.reset_peak()
+		ping = time.time()
+		try:
+			return method( *args, **kwargs )
+		finally:
+			seconds = time.time()-ping
+			peak    = max( tracemalloc.get_traced_memory()[1], self.stack.pop() )
+			if len(self.stack) > 0:
+				self.stack[-1] = max( self.stack[-1], peak )
+			key = ( id(node), call )
+			if key not in self.records:
+				self.records[key] = { 'node': node, 'calls': 0, 'seconds': 0.0, 'rows': 0, 'allocated': 0, 'rss': 0 }
+			r = self.records[key]
+			r['calls']    += 1
+			r['seconds']  += seconds
+			r['rows']     += rows
+			r['allocated'] = max( r['allocated'], peak-current )
+			r['rss']       = max( r['rss'], resource.getrusage(resource.RUSAGE_SELF).ru_maxrss*1024 )
+
+	def __nodes__( self, node, label, depth, rows ):
+		# all nodes of a network in order, each with its label, depth within
+		# the hierarchy, and rows per frame (e.g., fields of a clone layer)
+		nodes = [ (node, label, depth, rows) ]
+		if isinstance( node, mdp.hinet.CloneLayer ):
+			nodes += self.__nodes__( node.node, label+'.0', depth+1, rows*len(node.nodes) )
+		elif isinstance( node, mdp.hinet.Layer ):
+			for i, n in enumerate( node.nodes ):
+				nodes += self.__nodes__( n, label+'.%d' % i, depth+1, rows )
+		elif isinstance( node, mdp.hinet.FlowNode ):
+			for i, n in enumerate( node._flow ):
+				nodes += self.__nodes__( n, label+'.%d' % i, depth+1, rows )
+		return nodes
+
+	def report( self, network, filename=None ):
+		"""
+		Summarize the recorded calls per node of the network. Nodes recorded
+		but not part of the network (e.g., copies) are listed as such.
+		network : Profiled network.
+		filename: Base name of the report files: a JSON report (.json) and
+		          a table (.txt) are written, if given.
+		Returns the lines of the table.
+		"""
+		nodes = []
+		for k, node in enumerate( network ):
+			nodes += self.__nodes__( node, str(k), 0, 1 )
+		known = set( [ id(n[0]) for n in nodes ] )
+		for (key, call) in self.records:
+			if key not in known:
+				nodes.append( (self.records[(key,call)]['node'], '(copy)', 0, 1) )
+				known.add( key )
+
+		entries = []
+		for (node, label, depth, rows) in nodes:
+			for call in def_CALLS:
+				if (id(node),call) not in self.records:
+					continue
+				r      = self.records[(id(node),call)]
+				frames = r['rows']//rows
+				entries.append( { 'node'         : label,
+				                  'depth'        : depth,
+				                  'class'        : node.__class__.__name__,
+				                  'call'         : call,
+				                  'calls'        : r['calls'],
+				                  'seconds'      : r['seconds'],
+				                  'frames'       : frames,
+				                  'frames_per_s' : frames/r['seconds'] if r['seconds'] > 0 else 0.0,
+				                  'allocated'    : r['allocated'],
+				                  'peak_rss'     : r['rss'] } )
+
+		lines = [ '%-34s %-13s %6s %9s %9s %10s %11s %9s' % ('node','call','calls','time [s]','frames','frames/s','alloc [MB]','RSS [MB]') ]
+		for e in entries:
+			lines.append( '%-34s %-13s %6d %9.2f %9d %10d %11.1f %9d' % ('  '*e['depth']+e['node']+' '+e['class'], e['call'], e['calls'],
+			              e['seconds'], e['frames'], e['frames_per_s'], e['allocated']/float(def_MB), e['peak_rss']//def_MB) )
+		if filename != None:
+			f = open( filename+'.json', 'w' )
+			json.dump( entries, f, indent=1 )
+			f.close()
+			f = open( filename+'.txt', 'w' )
+			f.write( '\n'.join(lines)+'\n' )
+			f.close()
+		return lines
@@ -43,6 +43,7 @@ Freezeable = freezeable.Freezeable
 
 def_RAD2DEG         = 180.0/math.pi
 def_DEG2RAD         = math.pi/180.0
+def_PATH_TAIL       = 1000     # no. of most recent path positions kept in a checkpoint
 
 #------------------------------------------------------------------[ Numpy Mod ]
 
@@ -146,6 +147,30 @@ class RatBot( Freezeable ):
 			#else:
 			#	noise *= 0.5
 
+	#-------------------------------------------------------------[ Checkpoint ]
+
+	def getState( self, tail=def_PATH_TAIL ):
+		"""
+		Retrieve the rat's movement state: the most recent part of its path
+		(the last two positions define the current velocity) and, when
+		following a given path, the index of the next path node. The state can
+		be handed to setState in order to continue the movement exactly.
+		tail: Number of most recent path positions to include.
+		"""
+		state = {}
+		state['path']       = [ np.array(p) for p in self.__path__[-tail:] ]
+		state['path_index'] = getattr( self, '__path_index__', None )
+		return state
+
+	def setState( self, state ):
+		"""
+		Restore a movement state retrieved via getState.
+		state: Movement state of the rat.
+		"""
+		self.__path__ = list( state['path'] )
+		if state['path_index'] != None:
+			self.__path_index__ = state['path_index']
+
 	def nextPathStep( self ):
 		"""
 		Generate the next step of the rat's movement.
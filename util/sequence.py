@@ -0,0 +1,424 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+#=====================================================================[ Header ]
+
+# system
+import os
+import json
+import struct
+
+# math
+import numpy
+
+# graphics
+from PIL import Image
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+#------------------------------------------------------------------[ Constants ]
+
+# sequence data file format, version 2 (all values little endian):
+#
+#   magic           8 bytes   'RATLABSQ'
+#   version         uint32    2
+#   header_size     uint32    size of this header in bytes
+#   frames          uint64    no. of frames in the sequence
+#   width           uint32    width (in px) of a single frame
+#   height          uint32    height (in px) of a single frame
+#   channels        uint32    color dimension (1: greyscale, 3: RGB)
+#   dtype           8 bytes   numpy type string of a single value, e.g. '|u1'
+#   channel_order   8 bytes   'L' or 'RGB'
+#   layout          8 bytes   pixel layout of a frame, 'HWC' (row by row, channels interleaved)
+#   frame_stride    uint64    no. of bytes between the starts of two frames
+#   payload_offset  uint64    start of the first frame; page aligned
+#
+# Version 1 files (written by earlier versions of convert.py) consist of four
+# native 'i' integers (frames, width, height, color dimension) followed by the
+# uint8 pixel data in the same layout.
+
+def_MAGIC       = b'RATLABSQ'
+def_VERSION     = 2
+def_HEADER      = struct.Struct( '<8sIIQIII8s8s8sQQ' )
+def_HEADER_V1   = struct.Struct( '=iiii' )
+def_PAGE_SIZE   = 4096
+def_LUMA        = ( 19595, 38470, 7471 )    # PIL's ITU-R 601-2 luma weights for convert('L'), 16 bit fixed point
+
+# crop set file format, version 1 (all values little endian):
+#
+#   magic           8 bytes   'RATLABCR'
+#   version         uint32    1
+#   header_size     uint32    size of this header in bytes
+#   frames          uint64    no. of crops, i.e., frames of the virtual sequence
+#   width           uint32    width (in px) of a single crop
+#   height          uint32    height (in px) of a single crop
+#   channels        uint32    color dimension (1: greyscale, 3: RGB)
+#   table_size      uint64    size in bytes of the source table following the header
+#   payload_offset  uint64    start of the crop records; page aligned
+#
+# The source table (UTF-8 JSON) lists the sources the crops are cut from,
+# either sequence data files ({"data": <file>}) or folders of images
+# ({"folder": <folder>, "images": [<file names>]}); relative paths are relative
+# to the folder of the crop set file. Every crop record (def_CROP_RECORD) holds
+# the index of its source, the index of the frame within the source, and the
+# upper left corner of the crop box.
+
+def_CROP_MAGIC   = b'RATLABCR'
+def_CROP_VERSION = 1
+def_CROP_HEADER  = struct.Struct( '<8sIIQIIIQQ' )
+def_CROP_RECORD  = numpy.dtype( [('source','<u4'), ('frame','<u4'), ('left','<u4'), ('top','<u4')] )
+
+
+#=================================================================[ File Access ]
+
+def writeHeader( datafile, frames, width, height, channels, dtype='|u1' ):
+	"""
+	Write a version 2 header to an (empty) sequence data file and pad the
+	file up to the start of the payload.
+	datafile: File opened for binary writing.
+	frames  : No. of frames in the sequence.
+	width   : Width (in px) of a single frame.
+	height  : Height (in px) of a single frame.
+	channels: Color dimension (1 for greyscale, 3 for RGB).
+	dtype   : Type of a single pixel value.
+	"""
+	dtype        = numpy.dtype( dtype )
+	frame_stride = width*height*channels*dtype.itemsize
+	header = def_HEADER.pack( def_MAGIC, def_VERSION, def_HEADER.size,
+	                          frames, width, height, channels,
+	                          dtype.str.encode('ascii'),
+	                          b'RGB' if channels==3 else b'L',
+	                          b'HWC',
+	                          frame_stride, def_PAGE_SIZE )
+	datafile.seek( 0 )
+	datafile.write( header )
+	datafile.write( b'\0'*(def_PAGE_SIZE-len(header)) )
+
+class SequenceData( Freezeable ):
+	"""
+	Read access to a sequence data file as generated by convert.py. Both the
+	current (version 2) and the legacy (version 1) file format are supported.
+	The pixel data is memory-mapped, i.e., it is never copied or decoded but
+	read from disk on demand.
+	"""
+
+	def __init__( self, filename ):
+		"""
+		Constructor. Reads the header of the given file.
+		filename: Name of the sequence data file.
+		"""
+		self.filename       = filename
+		self.version        = None
+		self.frames         = None
+		self.width          = None
+		self.height         = None
+		self.channels       = None
+		self.dtype          = None
+		self.channel_order  = None
+		self.layout         = 'HWC'
+		self.frame_stride   = None
+		self.payload_offset = None
+		self.__data__       = None
+		self.freeze()
+
+		f = open( filename, 'rb' )
+		head = f.read( def_HEADER.size )
+		f.close()
+
+		# current file format
+		if head[:len(def_MAGIC)] == def_MAGIC:
+			( magic, version, header_size, self.frames, self.width, self.height, self.channels,
+			  dtype, channel_order, layout, self.frame_stride, self.payload_offset ) = def_HEADER.unpack( head )
+			if version > def_VERSION:
+				raise IOError( 'Sequence data file \'%s\' has unsupported version %d.' % (filename,version) )
+			self.version       = version
+			self.dtype         = numpy.dtype( dtype.rstrip(b'\0').decode('ascii') )
+			self.channel_order = channel_order.rstrip(b'\0').decode('ascii')
+			self.layout        = layout.rstrip(b'\0').decode('ascii')
+
+		# legacy file format: four native integers and uint8 payload
+		else:
+			self.frames, self.width, self.height, self.channels = def_HEADER_V1.unpack( head[:def_HEADER_V1.size] )
+			self.version        = 1
+			self.dtype          = numpy.dtype( numpy.uint8 )
+			self.channel_order  = 'RGB' if self.channels==3 else 'L'
+			self.frame_stride   = self.width*self.height*self.channels
+			self.payload_offset = def_HEADER_V1.size
+
+	def frameDim( self ):
+		"""
+		Retrieve the number of values of a single (flattened) frame.
+		"""
+		return self.width*self.height*self.channels
+
+	def flat( self ):
+		"""
+		Memory-map the pixel data (read-only) as an array of shape
+		(frames, width*height*channels), one flattened frame per row.
+		"""
+		if self.frame_stride == self.frameDim()*self.dtype.itemsize:
+			return numpy.memmap( self.filename, dtype=self.dtype, mode='r',
+			                     offset=self.payload_offset, shape=(self.frames,self.frameDim()) )
+		# padded frames: map whole frames and cut off the padding
+		raw = numpy.memmap( self.filename, dtype=numpy.uint8, mode='r',
+		                    offset=self.payload_offset, shape=(self.frames,self.frame_stride) )
+		return raw[:, :self.frameDim()*self.dtype.itemsize].view( self.dtype )
+
+	def array( self ):
+		"""
+		Memory-map the pixel data (read-only) as an array of shape
+		(frames, height, width, channels).
+		"""
+		return self.flat().reshape( self.frames, self.height, self.width, self.channels )
+
+	def read( self, start, stop ):
+		"""
+		Retrieve frames [start;stop) as a memory-mapped array of flattened
+		frames, i.e., without copying.
+		"""
+		if self.__data__ is None:
+			self.__data__ = self.flat()
+		return self.__data__[start:stop]
+
+
+#==================================================================[ Crop Sets ]
+
+def writeCropSet( filename, sources, crops, width, height, channels ):
+	"""
+	Write a crop set file (see def_CROP_HEADER).
+	filename: Name of the crop set file.
+	sources : List of sources as described for the source table.
+	crops   : Array of crop records (def_CROP_RECORD).
+	width   : Width (in px) of a single crop.
+	height  : Height (in px) of a single crop.
+	channels: Color dimension (1 for greyscale, 3 for RGB).
+	"""
+	table   = json.dumps( sources ).encode( 'utf-8' )
+	payload = -( -(def_CROP_HEADER.size+len(table)) // def_PAGE_SIZE )*def_PAGE_SIZE
+	header  = def_CROP_HEADER.pack( def_CROP_MAGIC, def_CROP_VERSION, def_CROP_HEADER.size,
+	                                len(crops), width, height, channels, len(table), payload )
+	f = open( filename, 'wb' )
+	f.write( header )
+	f.write( table )
+	f.write( b'\0'*(payload-len(header)-len(table)) )
+	f.write( numpy.asarray(crops,dtype=def_CROP_RECORD).tobytes() )
+	f.close()
+
+class CropData( Freezeable ):
+	"""
+	Read access to a crop set file as written by tools/snip.py: a virtual
+	sequence whose frames are boxes cut out of the frames of sequence data
+	files or of image files. Only the crop definitions are stored; crops are
+	cut out (and images decoded) when frames are read.
+	"""
+
+	def __init__( self, filename ):
+		"""
+		Constructor. Reads the crop definitions and opens all sources.
+		filename: Name of the crop set file.
+		"""
+		self.filename = filename
+		self.version  = None
+		self.frames   = None
+		self.width    = None
+		self.height   = None
+		self.channels = None
+		self.sources  = []      # per source: SequenceData, or list of image file names
+		self.crops    = None    # memory-mapped crop records
+		self.freeze()
+
+		f = open( filename, 'rb' )
+		head = f.read( def_CROP_HEADER.size )
+		( magic, version, header_size, self.frames, self.width, self.height, self.channels,
+		  table_size, payload_offset ) = def_CROP_HEADER.unpack( head )
+		if version > def_CROP_VERSION:
+			f.close()
+			raise IOError( 'Crop set file \'%s\' has unsupported version %d.' % (filename,version) )
+		f.seek( header_size )
+		table = json.loads( f.read(table_size).decode('utf-8') )
+		f.close()
+		self.version = version
+		self.crops   = numpy.memmap( filename, dtype=def_CROP_RECORD, mode='r',
+		                             offset=payload_offset, shape=(self.frames,) )
+
+		folder = os.path.dirname( filename )
+		for source in table:
+			if 'data' in source:
+				data = SequenceData( os.path.join(folder,source['data']) )
+				if data.channels != self.channels or data.dtype != numpy.uint8:
+					raise IOError( 'Source \'%s\' of crop set file \'%s\' does not match its color mode.' % (data.filename,filename) )
+				self.sources.append( data )
+			else:
+				self.sources.append( [ os.path.join(folder,source['folder'],i) for i in source['images'] ] )
+
+	def frameDim( self ):
+		"""
+		Retrieve the number of values of a single (flattened) frame.
+		"""
+		return self.width*self.height*self.channels
+
+	def read( self, start, stop ):
+		"""
+		Cut out crops [start;stop) and return them as an array of flattened
+		frames.
+		"""
+		crops  = numpy.array( self.crops[start:stop] )
+		frames = numpy.empty( (len(crops),self.frameDim()), dtype=numpy.uint8 )
+		for i, c in enumerate( crops ):
+			source = self.sources[c['source']]
+			if isinstance( source, SequenceData ):
+				frame = source.read( c['frame'], c['frame']+1 ).reshape( source.height, source.width, self.channels )
+				frames[i] = frame[c['top']:c['top']+self.height, c['left']:c['left']+self.width].reshape( -1 )
+			else:
+				image = Image.open( source[c['frame']] ).convert( 'RGB' if self.channels == 3 else 'L' )
+				box   = ( int(c['left']), int(c['top']), int(c['left'])+self.width, int(c['top'])+self.height )
+				frames[i] = numpy.asarray( image.crop(box), dtype=numpy.uint8 ).reshape( -1 )
+		return frames
+
+def isCropSet( filename ):
+	"""
+	Check whether the given file is a crop set file (by its magic string).
+	"""
+	f = open( filename, 'rb' )
+	magic = f.read( len(def_CROP_MAGIC) )
+	f.close()
+	return magic == def_CROP_MAGIC
+
+def openSequence( filename ):
+	"""
+	Open a sequence data file or a crop set file, depending on the file's
+	magic string.
+	"""
+	return CropData( filename ) if isCropSet( filename ) else SequenceData( filename )
+
+
+#======================================================================[ Views ]
+
+def viewChannels( view ):
+	"""
+	Retrieve the color dimension of a view of RGB frames.
+	view: 'L' for greyscale (luma), or a subset of the channels 'R', 'G',
+	      and 'B' in any order (e.g., 'G' or 'BR').
+	"""
+	if view == 'L':
+		return 1
+	if len(view) == 0 or len(set(view)) != len(view) or not set(view) <= set('RGB'):
+		raise ValueError( 'Invalid view \'%s\': use \'L\' or a subset of the channels \'RGB\'.' % view )
+	return len(view)
+
+def applyView( frames, view ):
+	"""
+	Compute a view of RGB frames. Greyscale frames equal those of PIL's
+	convert('L'), i.e., a stored RGB sequence trained as greyscale matches a
+	greyscale recording of the same frames.
+	frames: uint8 array of flattened RGB frames (one frame per row, color
+	        channels interleaved).
+	view  : View as described by viewChannels.
+	Returns an uint8 array of flattened frames holding the view's channels.
+	"""
+	pixels = numpy.asarray( frames ).reshape( len(frames), -1, 3 )
+	if view == 'L':
+		luma = numpy.dot( pixels, numpy.array(def_LUMA,dtype=numpy.uint32) )
+		return ( (luma+0x8000) >> 16 ).astype( numpy.uint8 )
+	return pixels[:,:,[ 'RGB'.index(c) for c in view ]].reshape( len(frames), -1 )
+
+
+#===============================================================[ Sequence Set ]
+
+class SequenceSet( Freezeable ):
+	"""
+	Several sequence data files presented as a single (virtual) data set.
+	Nothing is copied: the frames of all files are numbered consecutively and
+	read from the respective file on demand. Each file forms a separate
+	segment of the data set, and consumers that depend on temporal order
+	(e.g., the time derivative of SFA) must not combine frames of different
+	segments.
+	RGB data can be presented as greyscale or as a subset of its channels
+	(see applyView); the view is computed batch by batch when read. Crop set
+	files (see CropData) can be part of the data set like any sequence data
+	file.
+	"""
+
+	def __init__( self, filenames, view=None ):
+		"""
+		Constructor. Opens all given sequence data files.
+		filenames: List of sequence data files; all frames need to share the
+		           same dimensions and color mode.
+		view     : View of RGB data (see viewChannels), or None.
+		"""
+		self.files    = [ openSequence(f) for f in filenames ]
+		self.frames   = sum( [f.frames for f in self.files] )
+		self.width    = self.files[0].width
+		self.height   = self.files[0].height
+		self.channels = self.files[0].channels
+		self.view     = None
+		self.segments = []
+		self.freeze()
+
+		start = 0
+		for f in self.files:
+			if (f.width,f.height,f.channels) != (self.width,self.height,self.channels):
+				raise IOError( 'Sequence data file \'%s\' does not match the frame format of \'%s\'.' % (f.filename,self.files[0].filename) )
+			self.segments.append( (start,start+f.frames) )
+			start += f.frames
+
+		# the stored data itself is not a view
+		if view != None and view != 'RGB':
+			if self.channels != 3:
+				raise IOError( 'Views (\'%s\') require RGB sequence data.' % view )
+			try:
+				self.channels = viewChannels( view )
+			except ValueError as e:
+				raise IOError( str(e) )
+			self.view = view
+
+	def frameDim( self ):
+		"""
+		Retrieve the number of values of a single (flattened) frame.
+		"""
+		return self.width*self.height*self.channels
+
+	def limit( self, frames ):
+		"""
+		Restrict the data set to its first <frames> frames. Segments beyond
+		the limit are cut off or dropped.
+		"""
+		self.frames   = min( frames, self.frames )
+		self.segments = [ (a,min(b,self.frames)) for (a,b) in self.segments if a < self.frames ]
+
+	def read( self, start, stop ):
+		"""
+		Retrieve frames [start;stop) as an array of flattened frames. Frames
+		from within a single segment of a sequence data file are returned as a
+		memory-mapped view, i.e., without copying (unless a view of the colors
+		is computed); crops are cut out on demand.
+		"""
+		parts = []
+		for (a,b), data in zip( self.segments, self.files ):
+			if start < b and stop > a:
+				parts.append( data.read(max(start,a)-a,min(stop,b)-a) )
+		frames = parts[0] if len(parts) == 1 else numpy.concatenate( parts )
+		if self.view != None:
+			return applyView( frames, self.view )
+		return frames
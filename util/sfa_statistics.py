@@ -0,0 +1,184 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import os
+import pickle
+
+# math
+import numpy
+import mdp
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+
+#=================================================================[ Statistics ]
+
+class Statistics( Freezeable ):
+	"""
+	Raw statistics (sums of the covariance and derivative covariance matrices,
+	sums of the samples, and sample counts) accumulated by the SFA nodes of a
+	network before their training was finished. MDP discards them once the
+	eigenproblems are solved; kept alongside a trained network, they allow to
+	continue its training with additional frames only (see reopen()).
+	Nodes are identified by their position in sfaNodes(network).
+	"""
+
+	def __init__( self, network ):
+		"""
+		Constructor.
+		network: Network whose SFA nodes are recorded.
+		"""
+		self.network  = network
+		self.frames   = 0
+		self.nodes    = {}
+		self.freeze()
+
+	def __position__( self, node ):
+		for i, n in enumerate( sfaNodes(self.network) ):
+			if n is node: return i
+		return None
+
+	#-------------------------------------------------------------[ Recording ]
+
+	def collect( self, node ):
+		"""
+		Record the statistics of all SFA nodes within the given network node
+		that are about to finish a training phase. Call before stop_training.
+		"""
+		for sfa in sfaNodes( [node] ):
+			if sfa.is_training() and hasattr( sfa, '_cov_mtx' ) and sfa._cov_mtx._tlen > 0:
+				self.nodes[ self.__position__(sfa) ] = [ snapshot(sfa._cov_mtx), snapshot(sfa._dcov_mtx) ]
+
+	def save( self, filename ):
+		"""
+		Store the recorded statistics (without the network itself).
+		"""
+		f = open( filename+'.tmp', 'wb' )
+		pickle.dump( {'frames':self.frames, 'nodes':self.nodes}, f, protocol=pickle.HIGHEST_PROTOCOL )
+		f.close()
+		os.replace( filename+'.tmp', filename )
+
+	#-------------------------------------------------------[ Extend Training ]
+
+	def reopen( self ):
+		"""
+		Put the final SFA node of the network back into training, holding its
+		recorded statistics, together with the layers and flow nodes containing
+		it. Training the network as usual then adds new frames to its
+		statistics and solves its eigenproblem again, i.e., the result equals
+		training this node with all frames at once. Lower SFA nodes are not
+		reopened: the statistics of every node were recorded from the output
+		of the nodes below it, which would no longer match once those change.
+		Returns the reopened node, or None if its statistics are missing.
+		"""
+		nodes = sfaNodes( self.network )
+		i     = len( nodes )-1
+		if i < 0 or i not in self.nodes: return None
+		sfa = nodes[i]
+		for node in self.network:
+			chain = containers( node, sfa )
+			for (n, phase) in chain:
+				n._training            = True
+				n._train_phase         = phase
+				n._train_phase_started = False
+			if len( chain ) > 0: break
+		sfa._training            = True
+		sfa._train_phase         = 0
+		sfa._train_phase_started = True
+		sfa._init_cov()
+		restore( sfa._cov_mtx,  self.nodes[i][0] )
+		restore( sfa._dcov_mtx, self.nodes[i][1] )
+		return sfa
+
+
+#==================================================================[ Utilities ]
+
+def sfaNodes( nodes ):
+	"""
+	Retrieve all SFA nodes contained in a list of (possibly hierarchical)
+	nodes, e.g., a network as created by train.initNetwork. Nodes shared by
+	a clone layer are listed only once.
+	"""
+	found = []
+	for node in nodes:
+		if isinstance( node, mdp.hinet.CloneLayer ):
+			inner = sfaNodes( [node.node] )
+		elif isinstance( node, mdp.hinet.Layer ):
+			inner = sfaNodes( node.nodes )
+		elif isinstance( node, mdp.hinet.FlowNode ):
+			inner = sfaNodes( node._flow )
+		elif isinstance( node, mdp.nodes.SFANode ):
+			inner = [ node ]
+		else:
+			inner = []
+		found += [ n for n in inner if not any([n is f for f in found]) ]
+	return found
+
+def snapshot( cov ):
+	# raw sums of a covariance matrix, in double precision
+	return { 'cov_mtx': numpy.array( cov._cov_mtx, dtype=numpy.float64 ),
+	         'avg'    : numpy.array( cov._avg, dtype=numpy.float64 ),
+	         'tlen'   : cov._tlen }
+
+def restore( cov, snap ):
+	# fill an empty covariance matrix with recorded sums
+	dtype = cov._dtype if cov._dtype != None else numpy.float64
+	cov._input_dim = snap['cov_mtx'].shape[0]
+	cov._cov_mtx   = numpy.array( snap['cov_mtx'], dtype=dtype )
+	cov._avg       = numpy.array( snap['avg'], dtype=dtype )
+	cov._tlen      = snap['tlen']
+
+def containers( node, target ):
+	# layers and flow nodes leading from the given node down to the target
+	# node, each with the index of the training phase training the target
+	if isinstance( node, mdp.hinet.CloneLayer ):
+		chain = containers( node.node, target )
+		return [ (node,chain[0][1]) ] + chain if len(chain) > 0 else []
+	if isinstance( node, mdp.hinet.FlowNode ):
+		phase = 0
+		for n in node._flow:
+			if n is target:
+				return [ (node,phase) ]
+			chain = containers( n, target )
+			if len( chain ) > 0:
+				return [ (node,phase+chain[0][1]) ] + chain
+			if n.is_trainable():
+				phase += len( n._get_train_seq() )
+	return []
+
+def load( filename, network ):
+	"""
+	Read statistics stored via Statistics.save for the given network.
+	"""
+	f = open( filename, 'rb' )
+	data = pickle.load( f )
+	f.close()
+	stats = Statistics( network )
+	stats.frames = data['frames']
+	stats.nodes  = data['nodes']
+	return stats
@@ -0,0 +1,268 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+
+#=====================================================================[ Header ]
+
+# system
+import sys
+import time
+from multiprocessing import shared_memory, resource_tracker
+
+# math
+import numpy
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+import sequence
+import layerwise
+
+#defines
+def_NAME     = 'ratlab_stream'    # name of the shared memory block
+def_CAPACITY = 2000               # default no. of frames held by the ring buffer
+def_POLL     = 0.002              # seconds between two looks at the ring buffer
+
+# ring buffer header: int64 values at the start of the shared memory block
+def_HEADER   = 8
+def_HEAD, def_TAIL, def_CLOSED, def_SIZE, def_WIDTH, def_HEIGHT, def_CHANNELS = range( 7 )
+
+
+#================================================================[ Ring Buffer ]
+
+class FrameRing( Freezeable ):
+	"""
+	Ring buffer of frames in shared memory, written by the simulator (a
+	single producer) and read by a concurrently running training (a single
+	consumer). Frames are stored as convert.py stores them in a sequence data
+	file, i.e., uint8 pixel data row by row with interleaved color channels.
+	The producer advances the head once a frame is written, the consumer
+	advances the tail once frames are no longer needed; a full buffer makes
+	the producer wait (backpressure), an empty one the consumer.
+	The ring offers save() and close() like frames.FrameSequence, i.e., the
+	simulator records into it as into an image sequence.
+	"""
+
+	def __init__( self, name=def_NAME, shape=None, capacity=def_CAPACITY ):
+		"""
+		Constructor. Creates the ring buffer (producer) or attaches to an
+		existing one (consumer).
+		name    : Name of the shared memory block.
+		shape   : (width, height, channels) of a frame to create the buffer,
+		          or None to attach to an existing buffer of the given name.
+		capacity: No. of frames held by a created buffer.
+		"""
+		self.name     = name
+		self.owner    = shape != None
+		self.memory   = None
+		self.header   = None
+		self.frames   = None
+		self.mode     = None
+		self.freeze()
+
+		if self.owner:
+			width, height, channels = shape
+			size = def_HEADER*8 + capacity*width*height*channels
+			try:
+				self.memory = shared_memory.SharedMemory( name, create=True, size=size )
+			except FileExistsError:
+				# left behind by an aborted run
+				print('Warning! Replacing stale stream buffer \'%s\'.' % name)
+				stale = shared_memory.SharedMemory( name )
+				stale.close()
+				stale.unlink()
+				self.memory = shared_memory.SharedMemory( name, create=True, size=size )
+			self.header = numpy.ndarray( (def_HEADER,), dtype=numpy.int64, buffer=self.memory.buf )
+			self.header[:] = 0
+			self.header[def_SIZE], self.header[def_WIDTH], self.header[def_HEIGHT], self.header[def_CHANNELS] = capacity, width, height, channels
+		else:
+			self.memory = shared_memory.SharedMemory( name )
+			# the producer owns (and removes) the block; keep Python from
+			# removing it when the consumer exits
+			resource_tracker.unregister( self.memory._name, 'shared_memory' )
+			self.header = numpy.ndarray( (def_HEADER,), dtype=numpy.int64, buffer=self.memory.buf )
+
+		self.frames = numpy.ndarray( (self.capacity(),self.frameDim()), dtype=numpy.uint8,
+		                             buffer=self.memory.buf, offset=def_HEADER*8 )
+		self.mode   = 'RGB' if self.header[def_CHANNELS] == 3 else 'L'
+
+	def capacity( self ):
+		"""
+		Retrieve the number of frames the buffer holds.
+		"""
+		return int( self.header[def_SIZE] )
+
+	def shape( self ):
+		"""
+		Retrieve (width, height, channels) of a single frame.
+		"""
+		return ( int(self.header[def_WIDTH]), int(self.header[def_HEIGHT]), int(self.header[def_CHANNELS]) )
+
+	def frameDim( self ):
+		"""
+		Retrieve the number of values of a single (flattened) frame.
+		"""
+		width, height, channels = self.shape()
+		return width*height*channels
+
+	#-------------------------------------------------------------[ Producer ]
+
+	def save( self, image, i=None ):
+		"""
+		Append a frame, waiting for the consumer while the buffer is full.
+		image: PIL image of the frame.
+		i    : Frame number (ignored; frames are appended in order).
+		"""
+		pixels = numpy.asarray( image.convert(self.mode), dtype=numpy.uint8 ).reshape( -1 )
+		head   = int( self.header[def_HEAD] )
+		while head-self.header[def_TAIL] >= self.capacity():
+			time.sleep( def_POLL )
+		self.frames[head % self.capacity()] = pixels
+		self.header[def_HEAD] = head+1
+
+	def close( self ):
+		"""
+		Mark the end of the stream, wait until the consumer has taken all
+		frames, and remove the buffer.
+		"""
+		self.header[def_CLOSED] = 1
+		if self.owner:
+			if self.header[def_TAIL] < self.header[def_HEAD]:
+				print('\nWaiting for the training to take the remaining %d streamed frames.' % (self.header[def_HEAD]-self.header[def_TAIL]))
+			while self.header[def_TAIL] < self.header[def_HEAD]:
+				time.sleep( def_POLL )
+		self.header = None
+		self.frames = None
+		self.memory.close()
+		if self.owner:
+			self.memory.unlink()
+
+	#-------------------------------------------------------------[ Consumer ]
+
+	def wait( self, n ):
+		"""
+		Wait until frame no. <n> exists or the stream is closed. Returns the
+		no. of frames written so far and whether the stream is closed.
+		"""
+		while self.header[def_HEAD] < n and self.header[def_CLOSED] == 0:
+			time.sleep( def_POLL )
+		# the stream is closed after its last frame: look at the flag first
+		closed = self.header[def_CLOSED] != 0
+		return int( self.header[def_HEAD] ), closed
+
+	def read( self, start, stop ):
+		"""
+		Copy frames [start;stop) out of the buffer.
+		"""
+		slots = numpy.arange( start, stop ) % self.capacity()
+		return self.frames[slots]
+
+	def release( self, n ):
+		"""
+		Free all frames before frame no. <n> for the producer.
+		"""
+		self.header[def_TAIL] = n
+
+	def detach( self ):
+		"""
+		Stop consuming the stream.
+		"""
+		self.header = None
+		self.frames = None
+		self.memory.close()
+
+
+#============================================================[ Online Training ]
+
+def attach( name=def_NAME ):
+	"""
+	Attach to the stream of a simulator, waiting for it to start.
+	"""
+	waiting = False
+	while True:
+		try:
+			ring = FrameRing( name )
+			if ring.capacity() > 0:
+				return ring
+			ring.detach()    # just created, header not yet written
+		except FileNotFoundError:
+			if not waiting:
+				print('Waiting for the simulator to start streaming (ratlab.py record stream).')
+				waiting = True
+			time.sleep( 10*def_POLL )
+
+def trainOnline( nodes, ring, data_file, batch_size, stats=None, view=None ):
+	"""
+	Train the first training phase of a network with the frames streamed by
+	the simulator while it runs, and store the frames as a sequence data file
+	on the way (as convert.py would). The batches are those of the training
+	from the data file (see train.getReusableDataSlicer), i.e., the remaining
+	training phases continue from the file as if the first phase had been
+	trained from it: a batch is trained once two more frames exist, or once
+	the stream is closed (a single trailing frame joins the last batch).
+	nodes     : List of nodes (usually the whole network).
+	ring      : FrameRing attached to the simulator's stream.
+	data_file : Sequence data file to be written.
+	batch_size: Frames per batch; at most the ring capacity minus two.
+	stats     : Statistics object recording the SFA statistics of the phase
+	            before it is closed (see util/sfa_statistics.py).
+	view      : View of the streamed RGB frames to train with (see
+	            sequence.applyView); the data file holds the frames as
+	            streamed.
+	Returns the no. of frames streamed.
+	"""
+	width, height, channels = ring.shape()
+	f = open( data_file, 'wb' )
+	sequence.writeHeader( f, 0, width, height, channels )
+
+	k     = min( [ i for i, n in enumerate(nodes) if n.is_training() ] )
+	start = 0
+	ping  = time.time()
+	while True:
+		head, closed = ring.wait( start+batch_size+2 )
+		if closed and head-start <= batch_size+1:
+			stop = head
+		elif head-start >= batch_size+2:
+			stop = start+batch_size
+		else:
+			continue
+		if stop > start:
+			batch = ring.read( start, stop )
+			ring.release( stop )
+			f.write( batch.tobytes() )
+			x = batch if view == None else sequence.applyView( batch, view )
+			nodes[k].train( layerwise.execute(nodes[:k],x.astype(numpy.float32)) )
+			sys.stdout.write( '\rStreamed frames: %d' % stop )
+			sys.stdout.flush()
+		start = stop
+		if closed and stop == head:
+			break
+
+	# final frame count
+	sequence.writeHeader( f, start, width, height, channels )
+	f.close()
+	ring.detach()
+
+	if stats != None: stats.collect( nodes[k] )
+	nodes[k].stop_training()
+	print('\nTrained network node %d (%s) online with %d streamed frames: %dsec' % (k, nodes[k].__class__.__name__, start, time.time()-ping))
+	return start
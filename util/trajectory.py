@@ -0,0 +1,158 @@
+#==============================================================================
+#
+#  Copyright (C) 2016 Fabian Schoenfeld
+#
+#  This file is part of the ratlab software. It is free software; you can
+#  redistribute it and/or modify it under the terms of the GNU General Public
+#  License as published by the Free Software Foundation; either version 3, or
+#  (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+#  FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+#  more details.
+#
+#  You should have received a copy of the GNU General Public License along with
+#  a special exception for linking and compiling against the pe library, the
+#  so-called "runtime exception"; see the file COPYING. If not, see:
+#  http://www.gnu.org/licenses/
+#
+#==============================================================================
+
+
+#=====================================================================[ Header ]
+
+# system
+import struct
+
+# math
+import numpy
+
+# utilities / own
+import freezeable
+Freezeable = freezeable.Freezeable
+
+#defines
+def_TRAJECTORY_DTYPE = numpy.dtype( [ ('step',  '<i8'),    # simulation step
+                                      ('x',     '<f8'),    # position
+                                      ('y',     '<f8'),
+                                      ('vx',    '<f8'),    # velocity
+                                      ('vy',    '<f8'),
+                                      ('angle', '<f8') ] ) # heading angle in degrees [0;360)
+def_HEADER_SIZE    = 256      # fixed size of the .npy header, allows growing the file in place
+def_CAPACITY       = 65536    # initially preallocated no. of trajectory entries
+def_FLUSH_INTERVAL = 1000     # entries between header updates (i.e., entries safe on a crash)
+
+
+#=============================================================[ Trajectory Log ]
+
+class TrajectoryLog( Freezeable ):
+	"""
+	Trajectory of the simulated rat, stored as a structured NumPy array in a
+	memory-mapped .npy file. Space is preallocated and grown geometrically,
+	and the .npy header always states the number of valid entries, so the
+	file may be loaded (or memory-mapped) via numpy.load at any time.
+	"""
+
+	#----------------------------------------------------------[ Construction ]
+
+	def __init__( self, filename, capacity=def_CAPACITY, count=None ):
+		"""
+		Constructor. Starts a new (empty) trajectory file, or continues an
+		existing one.
+		filename: Name of the .npy file to write.
+		capacity: Initially preallocated number of entries.
+		count   : If given, the existing file is continued after its first
+		          <count> entries; any later entries are discarded.
+		"""
+		self.filename = filename
+		self.count    = 0
+		self.capacity = 0
+		self.__file__ = open( filename, 'w+b' if count == None else 'r+b' )
+		self.__data__ = None
+		self.freeze()
+		if count != None:
+			self.__file__.seek( 0, 2 )
+			self.count = count
+			capacity   = max( (self.__file__.tell()-def_HEADER_SIZE)//def_TRAJECTORY_DTYPE.itemsize, count, capacity )
+		self.__writeHeader__()
+		self.__grow__( capacity )
+
+	def __writeHeader__( self ):
+		# .npy format 1.0 header, padded to a fixed size
+		header  = "{'descr': %s, 'fortran_order': False, 'shape': (%d,), }" % \
+		          ( repr(numpy.lib.format.dtype_to_descr(def_TRAJECTORY_DTYPE)), self.count )
+		header  = header.ljust( def_HEADER_SIZE-10-1 ) + '\n'
+		self.__file__.seek( 0 )
+		self.__file__.write( b'\x93NUMPY\x01\x00' + struct.pack('<H',len(header)) + header.encode('latin1') )
+		self.__file__.flush()
+
+	def __grow__( self, capacity ):
+		# enlarge the file and re-map the (larger) data section
+		if self.__data__ is not None:
+			self.__data__.flush()
+			self.__data__ = None
+		self.capacity = capacity
+		self.__file__.truncate( def_HEADER_SIZE + capacity*def_TRAJECTORY_DTYPE.itemsize )
+		self.__data__ = numpy.memmap( self.__file__, dtype=def_TRAJECTORY_DTYPE, mode='r+',
+		                              offset=def_HEADER_SIZE, shape=(capacity,) )
+
+	#----------------------------------------------------------------[ Logging ]
+
+	def append( self, step, pos, vel, angle ):
+		"""
+		Add a single step to the trajectory.
+		step : Simulation step.
+		pos  : 2D position of the rat.
+		vel  : 2D velocity of the rat.
+		angle: Heading angle of the rat (in degrees).
+		"""
+		if self.count == self.capacity:
+			self.__grow__( self.capacity*2 )
+		self.__data__[self.count] = ( step, pos[0], pos[1], vel[0], vel[1], angle )
+		self.count += 1
+		if self.count % def_FLUSH_INTERVAL == 0:
+			self.flush()
+
+	def flush( self ):
+		"""
+		Write all logged data to disk and update the number of valid entries.
+		"""
+		self.__data__.flush()
+		self.__writeHeader__()
+
+	def close( self ):
+		"""
+		Finish the trajectory file and release the unused preallocated space.
+		"""
+		self.flush()
+		self.__data__ = None
+		self.__file__.truncate( def_HEADER_SIZE + self.count*def_TRAJECTORY_DTYPE.itemsize )
+		self.__file__.close()
+
+
+#==================================================================[ Utilities ]
+
+def loadTrajectory( filename ):
+	"""
+	Memory-map a trajectory file (read-only). Fields are accessed by name,
+	e.g., loadTrajectory(f)['x'].
+	"""
+	return numpy.load( filename, mmap_mode='r' )
+
+def exportText( filename, text_file, chunk=100000 ):
+	"""
+	Write a trajectory file as text: one step per line, holding step, x, y,
+	vx, vy, and the heading angle (the first five columns match the text
+	format written by earlier versions of ratlab).
+	filename : Trajectory (.npy) file.
+	text_file: Name of the text file to write.
+	chunk    : No. of entries converted at a time.
+	"""
+	data = loadTrajectory( filename )
+	f = open( text_file, 'w' )
+	for i in range( 0, data.shape[0], chunk ):
+		block = data[i:i+chunk]
+		numpy.savetxt( f, numpy.column_stack([block[n] for n in def_TRAJECTORY_DTYPE.names]),
+		               fmt=['%d']+['%s']*5 )
+	f.close()